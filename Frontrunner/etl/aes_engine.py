@@ -0,0 +1,194 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from Crypto.Cipher import AES
+
+from tracing import span
+
+DEFAULT_BATCH_SIZE = int(os.getenv("DECRYPT_BATCH_SIZE", "5000"))  # rows per worker task
+
+Pose = Tuple[float, float, float, float, float, float]  # x, y, z, heading, inclination, status
+
+
+def mysql_aes_key(key: Union[str, bytes]) -> bytes:
+    """Fold a key the way MySQL's AES_ENCRYPT/AES_DECRYPT do for AES-128-ECB
+
+    MySQL XORs the key bytes cyclically into a zeroed 16-byte buffer, so any
+    length of key (here a UUID string) yields a 128-bit key.
+    """
+    if isinstance(key, str):
+        key = key.encode("utf-8")
+    folded = bytearray(16)
+    for i, byte in enumerate(key):
+        folded[i % 16] ^= byte
+    return bytes(folded)
+
+
+def _decrypt(cipher, ciphertext: Optional[bytes]) -> Optional[bytes]:
+    """AES_DECRYPT semantics: NULL for bad lengths or PKCS#7 padding"""
+    if not ciphertext or len(ciphertext) % 16:
+        return None
+    plaintext = cipher.decrypt(bytes(ciphertext))
+    pad = plaintext[-1]
+    if not 1 <= pad <= 16 or plaintext[-pad:] != bytes([pad]) * pad:
+        return None
+    return plaintext[:-pad]
+
+
+def mysql_aes_decrypt(ciphertext: Optional[bytes], key: Union[str, bytes]) -> Optional[bytes]:
+    """Python equivalent of ``AES_DECRYPT(ciphertext, key)`` with the default block_encryption_mode"""
+    return _decrypt(AES.new(mysql_aes_key(key), AES.MODE_ECB), ciphertext)
+
+
+def _pose_field(value: str, default: Optional[float]) -> Optional[float]:
+    value = value.strip()
+    if not value or value.lower() == "null":
+        return default
+    return float(value)
+
+
+def parse_pose(text: str, fixed_width: bool = False) -> Optional[Pose]:
+    """Parse the tab-separated ``x, y, z, heading, inclination, status`` pose
+
+    x, y and z are required; missing or 'null' trailing fields become 0.0.
+    With ``fixed_width`` all six fields must be present instead, and empty
+    ones, x, y and z included, read as 0.0. Returns None when a required
+    field is absent, raises ValueError when a field is not a number.
+    """
+    parts = text.split("\t")
+    if fixed_width and len(parts) < 6:
+        return None
+    parts += [""] * (6 - len(parts))
+    x, y, z = (_pose_field(part, 0.0 if fixed_width else None) for part in parts[:3])
+    if x is None or y is None or z is None:
+        return None
+    heading, inclination, status = (_pose_field(part, 0.0) for part in parts[3:6])
+    return x, y, z, heading, inclination, status
+
+
+def decrypt_pose_batch(rows: Sequence[Tuple[Any, Optional[bytes]]], cipher=None, fixed_width: bool = False
+                       ) -> Tuple[List[Tuple[Any, Pose]], List[Tuple[Any, str]]]:
+    """Decrypt and parse ``(oid, ciphertext)`` rows
+
+    Returns ``(poses, failures)``, where failures are ``(oid, reason)`` pairs
+    for rows that did not decrypt or parse.
+    """
+    cipher = cipher or _worker_cipher
+    poses, failures = [], []
+    for oid, ciphertext in rows:
+        plaintext = _decrypt(cipher, ciphertext)
+        if plaintext is None:
+            failures.append((oid, "decrypt failed"))
+            continue
+        try:
+            pose = parse_pose(plaintext.decode("utf-8", "replace"), fixed_width)
+        except ValueError as e:
+            failures.append((oid, f"parse failed: {e}"))
+            continue
+        if pose is None:
+            failures.append((oid, "empty coordinates"))
+        else:
+            poses.append((oid, pose))
+    return poses, failures
+
+
+_worker_cipher = None
+
+
+def _init_worker(folded_key: bytes):
+    global _worker_cipher
+    _worker_cipher = AES.new(folded_key, AES.MODE_ECB)
+
+
+def _ready() -> bool:
+    return True
+
+
+class PoseDecryptor:
+    """Decrypts encrypted pose columns in Python instead of in MySQL
+
+    Rows are ``(oid, ciphertext)`` pairs fetched raw from MySQL. They are
+    split into ``batch_size`` batches and decrypted and parsed across a
+    process pool, so the database only serves bytes. With ``processes`` <= 1
+    everything runs inline. ``fixed_width`` selects parse_pose()'s six-field
+    rules.
+
+    Workers are forked when start() is called, or on first use. Call start()
+    before spawning threads.
+
+        with PoseDecryptor(AES_KEY).start() as decryptor:
+            poses, failures = decryptor.decrypt(rows)
+    """
+
+    def __init__(self, key: Union[str, bytes], processes: Optional[int] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, fixed_width: bool = False):
+        self.key = key
+        self.fixed_width = fixed_width
+        self.folded_key = mysql_aes_key(key)
+        self.processes = (os.cpu_count() or 1) if processes is None else processes
+        self.batch_size = max(1, batch_size)
+        self._cipher = AES.new(self.folded_key, AES.MODE_ECB)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> "PoseDecryptor":
+        if self.processes > 1 and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                                 initargs=(self.folded_key,))
+            self._executor.submit(_ready).result()  # launches the workers now
+        return self
+
+    def __enter__(self) -> "PoseDecryptor":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def decrypt_bytes(self, ciphertext: Optional[bytes]) -> Optional[bytes]:
+        return _decrypt(self._cipher, ciphertext)
+
+    def decrypt(self, rows: Sequence[Tuple[Any, Optional[bytes]]]
+                ) -> Tuple[List[Tuple[Any, Pose]], List[Tuple[Any, str]]]:
+        """Decrypt and parse a chunk of rows, keeping their order"""
+        with span("aes_decrypt", category="decrypt", rows=len(rows), processes=self.processes):
+            if self.processes <= 1 or len(rows) <= self.batch_size:
+                return decrypt_pose_batch(rows, self._cipher, self.fixed_width)
+            self.start()
+            batches = [rows[i:i + self.batch_size] for i in range(0, len(rows), self.batch_size)]
+            poses, failures = [], []
+            work = partial(decrypt_pose_batch, fixed_width=self.fixed_width)
+            for batch_poses, batch_failures in self._executor.map(work, batches):
+                poses.extend(batch_poses)
+                failures.extend(batch_failures)
+            return poses, failures
+
+    def validate(self, mysql_conn, table_name: str, column: str, sample_size: int = 100,
+                 key_column: str = "_OID_") -> Tuple[int, List[Any]]:
+        """Check the Python decryption against ``AES_DECRYPT`` on a sample of rows
+
+        Returns ``(checked, mismatched_keys)``; any mismatch means the key or
+        block mode differs from MySQL's and the output must not be trusted.
+        """
+        cursor = mysql_conn.cursor()
+        try:
+            cursor.execute(
+                f"SELECT `{key_column}`, `{column}`, AES_DECRYPT(`{column}`, %s) FROM `{table_name}` "
+                f"WHERE `{column}` IS NOT NULL LIMIT %s",
+                (self.key, sample_size))
+            sample = cursor.fetchall()
+        finally:
+            cursor.close()
+        mismatched = []
+        for oid, ciphertext, expected in sample:
+            expected = bytes(expected) if expected is not None else None
+            if self.decrypt_bytes(ciphertext) != expected:
+                mismatched.append(oid)
+        return len(sample), mismatched
+
@@ -0,0 +1,112 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+
+CHECKPOINT_SYNC_ENV = "CHECKPOINT_SYNC"
+SYNC_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+class CheckpointStore:
+    """Crash-safe checkpoint entries in a SQLite database in WAL mode
+
+    The migrator's checkpoint is a flat dict whose keys are already scoped
+    per table, key range and encrypted column (``<table>_export_last_key``,
+    ``<table>_ranges``, ``<table>_<column>_last_oid``). Each key is stored as
+    its own row and save() writes only the entries that changed since the
+    last save, so parallel workers no longer rewrite each other's state.
+
+    Each save is one transaction, fsync'd with the default ``synchronous=FULL``
+    (override with CHECKPOINT_SYNC). Saves from concurrent threads are group
+    committed: a thread that arrives while another is writing queues its
+    changes, and the next writer commits all of them together. save() only
+    returns once its own changes are durable.
+    """
+
+    def __init__(self, path: str, legacy_json: Optional[str] = None, synchronous: Optional[str] = None):
+        self.path = path
+        self.legacy_json = legacy_json
+        synchronous = (synchronous or os.getenv(CHECKPOINT_SYNC_ENV, "FULL")).upper()
+        self.synchronous = synchronous if synchronous in SYNC_MODES else "FULL"
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()  # guards _known and _pending
+        self._flush_lock = threading.Lock()  # one writer at a time
+        self._known: Dict[str, str] = {}  # encoded entries as of the latest save()
+        self._pending: Dict[str, Optional[str]] = {}  # changes not yet committed, None deletes
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            conn.execute("CREATE TABLE IF NOT EXISTS checkpoint (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._conn = conn
+        return self._conn
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Return the stored checkpoint, or None if there is none
+
+        An empty store is seeded from the legacy JSON checkpoint file once.
+        """
+        with self._flush_lock:
+            rows = self._connect().execute("SELECT key, value FROM checkpoint").fetchall()
+        with self._lock:
+            self._known, self._pending = dict(rows), {}
+        if rows:
+            return {key: json.loads(value) for key, value in rows}
+
+        if self.legacy_json and os.path.exists(self.legacy_json):
+            try:
+                with open(self.legacy_json, "r") as f:
+                    legacy = json.load(f)
+            except (OSError, ValueError):
+                legacy = None
+            if isinstance(legacy, dict) and legacy:
+                self.save(legacy)
+                print(f"   Imported {len(legacy)} checkpoint entries from {self.legacy_json}", flush=True)
+                return legacy
+        return None
+
+    def save(self, checkpoint: Dict[str, Any]):
+        """Persist the entries of ``checkpoint`` that changed, dropping removed keys"""
+        entries = {key: json.dumps(value) for key, value in list(checkpoint.items())}
+        with self._lock:
+            for key, value in entries.items():
+                if self._known.get(key) != value:
+                    self._known[key] = value
+                    self._pending[key] = value
+            for key in [key for key in self._known if key not in entries]:
+                del self._known[key]
+                self._pending[key] = None
+        self._flush()
+
+    def _flush(self):
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany("INSERT OR REPLACE INTO checkpoint (key, value) VALUES (?, ?)",
+                                 [(key, value) for key, value in pending.items() if value is not None])
+                conn.executemany("DELETE FROM checkpoint WHERE key = ?",
+                                 [(key,) for key, value in pending.items() if value is None])
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                with self._lock:
+                    # Keep the changes for the next save, behind anything newer
+                    for key, value in pending.items():
+                        self._pending.setdefault(key, value)
+                raise
+
+    def close(self):
+        with self._flush_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -14,6 +14,8 @@ import os
 import math
 import time
 
+from progress import ProgressReporter
+
 MYSQL_CONFIG = {
     'host': os.getenv('MYSQL_HOST', 'mysql'),
     'port': int(os.getenv('MYSQL_PORT', '3306')),
@@ -177,6 +179,8 @@ def translate_table_coordinates(mysql_cursor, mysql_conn, table_name, coord_pref
     
     processed = 0
     batch_size = 1000
+    progress = ProgressReporter(f"🌍 Translate {table_name}", total=len(coords_to_translate),
+                                unit="coordinates", indent="      ")
     
     for i in range(0, len(coords_to_translate), batch_size):
         batch = coords_to_translate[i:i + batch_size]
@@ -201,14 +205,14 @@ def translate_table_coordinates(mysql_cursor, mysql_conn, table_name, coord_pref
                 """, (lat, lon, alt, oid))
                 
                 processed += 1
+                progress.update()
             except Exception as e:
+                progress.error(f"OID {record.get('_OID_')}: {e}")
                 continue
         
         mysql_conn.commit()
-        
-        if (i + batch_size) % 10000 == 0 or (i + batch_size) >= len(coords_to_translate):
-            print(f"      🌍 Translated {min(i + batch_size, len(coords_to_translate))}/{len(coords_to_translate)} coordinates...")
     
+    progress.finish()
     print(f"      ✅ Translated {processed} coordinates")
     return processed
 
@@ -9,6 +9,9 @@ import psycopg2
 import os
 import math
 
+from aes_engine import PoseDecryptor
+from progress import ProgressReporter
+
 MYSQL_CONFIG = {
     'host': os.getenv('MYSQL_HOST', 'mysql'),
     'port': int(os.getenv('MYSQL_PORT', '3306')),
@@ -103,73 +106,50 @@ def main():
             print("⚠️ No encrypted coordinates found!")
             return
         
-        # Step 3: Decrypt and translate in batches
+        # Step 3: Decrypt and translate in batches (AES in Python, fanned out over processes)
         batch_size = 1000
         processed = 0
         failed = 0
-        
-        for i in range(0, len(records), batch_size):
-            batch = records[i:i + batch_size]
-            
-            for record in batch:
-                try:
-                    oid = record['_OID_']
-                    encrypted_data = record['pose_aes']
-                    
-                    # Decrypt using MySQL AES_DECRYPT
-                    mysql_cursor.execute("""
-                        SELECT CAST(AES_DECRYPT(%s, %s) AS CHAR) AS decrypted
-                    """, (encrypted_data, AES_KEY))
-                    
-                    result = mysql_cursor.fetchone()
-                    if not result or not result['decrypted']:
-                        failed += 1
-                        continue
-                    
-                    decrypted = result['decrypted']
-                    parts = decrypted.split('\t')
-                    
-                    if len(parts) >= 6:
-                        x = float(parts[0]) if parts[0] else 0.0
-                        y = float(parts[1]) if parts[1] else 0.0
-                        z = float(parts[2]) if parts[2] else 0.0
-                        heading = float(parts[3]) if parts[3] else 0.0
-                        inclination = float(parts[4]) if parts[4] else 0.0
-                        status = float(parts[5]) if parts[5] else 0.0
-                        
-                        # Translate to WGS84
-                        lat, lon, alt = translate_mine_coords_to_wgs84(x, y, z)
-                        
-                        # Update coordinate table with decrypted and translated values
-                        mysql_cursor.execute("""
-                            UPDATE coordinate
-                            SET decrypted_x = %s,
-                                decrypted_y = %s,
-                                decrypted_z = %s,
-                                decrypted_heading = %s,
-                                decrypted_inclination = %s,
-                                decrypted_status = %s,
-                                latitude = %s,
-                                longitude = %s,
-                                altitude = %s
-                            WHERE _OID_ = %s
-                        """, (x, y, z, heading, inclination, status, lat, lon, alt, oid))
-                        
-                        processed += 1
-                    else:
-                        failed += 1
-                        
-                except Exception as e:
-                    failed += 1
-                    if failed <= 10:  # Show first 10 errors
-                        print(f"   ⚠️ Failed to decrypt record {record.get('_OID_', 'unknown')}: {e}")
-                    continue
+        # This script has always required all six fields and read empty ones as 0.0
+        with PoseDecryptor(AES_KEY, fixed_width=True) as decryptor:
+            checked, mismatched = decryptor.validate(mysql_conn, "coordinate", "pose_aes")
+            if mismatched:
+                print(f"❌ Python AES output differs from AES_DECRYPT for {len(mismatched)}/{checked} sampled records: {mismatched[:5]}")
+                return
+            print(f"🔐 Python decryption matches AES_DECRYPT on {checked} sampled records")
             
-            mysql_conn.commit()
+            progress = ProgressReporter("🔓 Decrypt coordinate", total=len(records), unit="records", indent="   ")
+            poses, failures = decryptor.decrypt([(record['_OID_'], record['pose_aes']) for record in records])
+            for oid, reason in failures:
+                failed += 1
+                progress.error(f"record {oid}: {reason}")
             
-            if (i + batch_size) % 10000 == 0 or (i + batch_size) >= len(records):
-                print(f"   🔓 Processed {min(i + batch_size, len(records))}/{len(records)} records... (✅ {processed}, ❌ {failed})")
+            for i in range(0, len(poses), batch_size):
+                update_batch = []
+                for oid, (x, y, z, heading, inclination, status) in poses[i:i + batch_size]:
+                    # Translate to WGS84
+                    lat, lon, alt = translate_mine_coords_to_wgs84(x, y, z)
+                    update_batch.append((x, y, z, heading, inclination, status, lat, lon, alt, oid))
+                
+                # Update coordinate table with decrypted and translated values
+                mysql_cursor.executemany("""
+                    UPDATE coordinate
+                    SET decrypted_x = %s,
+                        decrypted_y = %s,
+                        decrypted_z = %s,
+                        decrypted_heading = %s,
+                        decrypted_inclination = %s,
+                        decrypted_status = %s,
+                        latitude = %s,
+                        longitude = %s,
+                        altitude = %s
+                    WHERE _OID_ = %s
+                """, update_batch)
+                mysql_conn.commit()
+                processed += len(update_batch)
+                progress.update(len(update_batch))
         
+        progress.finish()
         print(f"\n✅ Decryption complete!")
         print(f"   ✅ Successfully decrypted: {processed}")
         print(f"   ❌ Failed: {failed}")
@@ -9,6 +9,8 @@ import logging
 import math
 from typing import Dict, List, Any
 
+from profiling import profiled
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -108,6 +110,7 @@ def calculate_polygon_area(points):
         area -= points[j][0] * points[i][1]
     return abs(area) / 2.0
 
+@profiled("extract_consolidated_locations")
 def main():
     logger.info("=== Extracting Consolidated Locations ===")
     
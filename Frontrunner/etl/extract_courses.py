@@ -10,6 +10,8 @@ import logging
 import json
 import math
 
+from profiling import memory_stage, profiled
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -128,6 +130,7 @@ def group_by_course(coordinates):
     
     return courses
 
+@profiled("extract_courses")
 def main():
     logger.info("=== Extracting Course/Road Data ===")
     logger.info("⚠️  WARNING: This process requires significant memory (2-4 GB)")
@@ -170,10 +173,12 @@ def main():
     # Extract coordinates
     logger.info("Extracting course coordinates...")
     logger.info("📊 Step 1/3: Querying MySQL database...")
-    coordinates = extract_courses(mysql_cursor)
+    with memory_stage("query coordinates"):
+        coordinates = extract_courses(mysql_cursor)
     
     logger.info("📊 Step 2/3: Grouping coordinates by course...")
-    courses = group_by_course(coordinates)
+    with memory_stage("group by course"):
+        courses = group_by_course(coordinates)
     logger.info(f"✅ Grouped into {len(courses)} courses")
     
     # Free up memory
@@ -11,6 +11,8 @@ import mysql.connector
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from profiling import profiled
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -365,6 +367,7 @@ def show_results():
     
     conn.close()
 
+@profiled("extract_crusher_bay_data")
 def main():
     """Main function"""
     logger.info("=== Extracting Crusher, Bay, Fuel, and Parking Locations ===")
@@ -13,6 +13,8 @@ import mysql.connector
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from profiling import profiled
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -479,6 +481,7 @@ def show_intersection_results():
     
     conn.close()
 
+@profiled("extract_intersections")
 def main():
     """Main function"""
     logger.info("=== Extracting Intersection Locations and Creating Polygons ===")
@@ -9,6 +9,8 @@ import psycopg2
 import logging
 import math
 
+from profiling import profiled
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -95,6 +97,7 @@ def calculate_polygon_area(points):
         area -= points[j][0] * points[i][1]
     return abs(area) / 2.0
 
+@profiled("extract_intersections_fixed")
 def main():
     logger.info("=== Extracting Intersection Locations ===")
     
@@ -12,6 +12,8 @@ import mysql.connector
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from profiling import profiled
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -349,6 +351,7 @@ def show_final_results():
     
     conn.close()
 
+@profiled("extract_specific_locations")
 def main():
     """Main function"""
     logger.info("=== Extracting Crusher, Parking, Fuel & Other Locations ===")
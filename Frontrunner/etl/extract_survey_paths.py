@@ -9,6 +9,8 @@ import psycopg2
 import logging
 import math
 
+from profiling import profiled
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -106,6 +108,7 @@ def group_by_path(coordinates):
     
     return paths
 
+@profiled("extract_survey_paths")
 def main():
     logger.info("=== Extracting Survey Paths ===")
     
@@ -12,6 +12,8 @@ import mysql.connector
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from profiling import profiled
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -452,6 +454,7 @@ def show_results():
     
     conn.close()
 
+@profiled("extract_ui_categories")
 def main():
     """Main function"""
     logger.info("=== Extracting Parking, Fuel & Service, and Crusher Operations ===")
@@ -0,0 +1,329 @@
+import bisect
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from profiling import memory_stage
+from tracing import span
+
+# Latency buckets in seconds, from sub-millisecond queries to multi-minute ETL stages
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0
+)
+
+METRICS_TEXTFILE_ENV = "METRICS_TEXTFILE"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str],
+                   extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """A metric family; labelled children are created on first use"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: Any, **labels: Any):
+        """Child for one label combination, e.g. ``.labels(stage="load_roads")``"""
+        if labels:
+            if values:
+                raise ValueError("Pass label values positionally or by name, not both")
+            try:
+                values = tuple(labels.pop(name) for name in self.labelnames)
+            except KeyError as e:
+                raise ValueError(f"Missing label {e} for metric {self.name}") from None
+            if labels:
+                raise ValueError(f"Unknown labels {sorted(labels)} for metric {self.name}")
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects labels {self.labelnames}")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _default(self):
+        if self.labelnames:
+            raise ValueError(f"Metric {self.name} has labels {self.labelnames}; use .labels()")
+        return self.labels()
+
+    def samples(self) -> List[Tuple[str, Tuple[str, ...], Any]]:
+        with self._lock:
+            return [(self.name, key, child) for key, child in sorted(self._children.items())]
+
+
+class _CounterChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = float(value)
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def snapshot(self) -> Tuple[List[int], int, float]:
+        with self._lock:
+            cumulative, running = [], 0
+            for count in self.counts:
+                running += count
+                cumulative.append(running)
+            return cumulative, self.count, self.sum
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._default().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default().dec(amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if bound != math.inf))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+
+class MetricsRegistry:
+    """Thread-safe collection of counters, gauges and fixed-bucket histograms
+
+    Metrics are registered by name; asking for an existing name returns the
+    same family, so modules can declare what they use at import time without
+    coordinating. Label values are free-form strings, by convention
+    ``stage``, ``table`` and ``road_batch`` for ETL work.
+
+    The registry is per process. Pool workers keep their own; only what the
+    parent records is exported.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered as a different "
+                                 f"{metric.kind} with labels {metric.labelnames}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def metrics(self) -> List[_Metric]:
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format (0.0.4)"""
+        lines = []
+        for metric in self.metrics():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, key, child in metric.samples():
+                if isinstance(child, _HistogramChild):
+                    cumulative, count, total = child.snapshot()
+                    for bound, value in zip(metric.buckets + (math.inf,), cumulative):
+                        labels = _format_labels(metric.labelnames, key, ("le", _format_value(bound)))
+                        lines.append(f"{name}_bucket{labels} {value}")
+                    labels = _format_labels(metric.labelnames, key)
+                    lines.append(f"{name}_sum{labels} {_format_value(total)}")
+                    lines.append(f"{name}_count{labels} {count}")
+                else:
+                    labels = _format_labels(metric.labelnames, key)
+                    lines.append(f"{name}{labels} {_format_value(child.value)}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly snapshot: one entry per metric with its labelled values"""
+        result = {}
+        for metric in self.metrics():
+            values = []
+            for _, key, child in metric.samples():
+                labels = dict(zip(metric.labelnames, key))
+                if isinstance(child, _HistogramChild):
+                    cumulative, count, total = child.snapshot()
+                    buckets = {_format_value(bound): value
+                               for bound, value in zip(metric.buckets + (math.inf,), cumulative)}
+                    values.append({'labels': labels, 'count': count, 'sum': total, 'buckets': buckets})
+                else:
+                    values.append({'labels': labels, 'value': child.value})
+            result[metric.name] = {'type': metric.kind, 'help': metric.documentation, 'values': values}
+        return result
+
+    def write_textfile(self, path: Optional[Union[str, Path]] = None) -> Optional[Path]:
+        """Atomically write the Prometheus text format to ``path``
+
+        Defaults to ``$METRICS_TEXTFILE`` and does nothing if neither is set.
+        The file suits node_exporter's textfile collector for batch jobs.
+        """
+        path = path or os.getenv(METRICS_TEXTFILE_ENV)
+        if not path:
+            return None
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return path
+
+
+registry = MetricsRegistry()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Shared ETL metrics
+etl_items = registry.counter(
+    "dispatch_etl_items_total", "Items processed by ETL stages", ("stage", "status"))
+etl_stage_seconds = registry.histogram(
+    "dispatch_etl_stage_duration_seconds", "Wall time of ETL stages", ("stage",))
+etl_batch_seconds = registry.histogram(
+    "dispatch_etl_batch_duration_seconds", "Wall time of ETL batches", ("stage", "table", "road_batch"))
+etl_rows = registry.counter(
+    "dispatch_etl_rows_total", "Rows written by ETL stages", ("stage", "table"))
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """Record the duration and outcome of an ETL stage
+
+    The stage is also traced as a span and, under DISPATCH_PROFILE=memory,
+    becomes a memory profiling stage.
+    """
+    start = time.perf_counter()
+    status = "error"
+    try:
+        with span(stage, category="stage"), memory_stage(stage):
+            yield
+        status = "success"
+    finally:
+        etl_stage_seconds.labels(stage=stage).observe(time.perf_counter() - start)
+        registry.counter("dispatch_etl_stage_runs_total", "ETL stage runs by outcome",
+                         ("stage", "status")).labels(stage=stage, status=status).inc()
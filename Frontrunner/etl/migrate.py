@@ -16,6 +16,15 @@ Performance Tuning Environment Variables:
 - MYSQL_POOL_SIZE: MySQL connection pool size (default: 10)
 - POSTGRES_POOL_SIZE: PostgreSQL connection pool size (default: 10)
 - CHUNK_SIZE: Records per chunk for large datasets (default: 20000)
+- EXPORT_PAGE_SIZE: Rows per keyset page when exporting (default: 10 x CHUNK_SIZE)
+- TRANSFER_MODE: "csv" (export to CSV, then INSERT) or "stream" (MySQL cursor piped into COPY) (default: csv)
+- STREAM_SPOOL: In stream mode, also spool rows to disk so a failed table resumes (default: false)
+- RANGE_WORKERS: Key ranges migrated concurrently within one large table (default: 4, 1 disables)
+- RANGE_MIN_ROWS: Tables with at least this many records are split into key ranges (default: 1000000)
+- DECRYPT_ENGINE: "python" (fetch ciphertext, decrypt in a process pool) or "mysql" (AES_DECRYPT in SQL) (default: python)
+- DECRYPT_PROCESSES: Worker processes for the python decrypt engine (default: CPU count)
+- DECRYPT_VALIDATE_SAMPLE: Rows checked against AES_DECRYPT before trusting the python engine (default: 100)
+- CHECKPOINT_SYNC: SQLite synchronous mode for the checkpoint store, FULL fsyncs every save (default: FULL)
 
 Example for high-performance server:
   MAX_WORKERS=8 DECRYPTION_WORKERS=6 MYSQL_POOL_SIZE=15 POSTGRES_POOL_SIZE=15 CHUNK_SIZE=50000
@@ -29,13 +38,22 @@ from psycopg2.extras import execute_batch
 import os
 import csv
 import time
-import json
 import math
 from contextlib import contextmanager
 from typing import Optional, Dict, List, Tuple, Any
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from queue import Queue
+from queue import Queue, Empty, Full
+
+from aes_engine import PoseDecryptor
+from checkpoint_store import CheckpointStore
+from metrics import etl_rows, registry
+from profiling import memory_stage, profiled
+from progress import ProgressReporter
+from tracing import span, traced, write_trace
+
+table_seconds = registry.histogram(
+    "dispatch_migration_table_duration_seconds", "Wall time per table and migration step", ("stage", "table"))
 
 # Configuration
 MYSQL_CONFIG = {
@@ -60,7 +78,8 @@ POSTGRES_CONFIG = {
 AES_KEY = os.getenv("AES_UUID_KEY", "a8ba99bd-6871-4344-a227-4c2807ef5fbc")
 CSV_DIR = "/app/csv_export"
 CHECKPOINT_DIR = "/app/checkpoints"
-CHECKPOINT_FILE = f"{CHECKPOINT_DIR}/migration_checkpoint.json"
+CHECKPOINT_FILE = f"{CHECKPOINT_DIR}/migration_checkpoint.json"  # Legacy, imported into CHECKPOINT_DB once
+CHECKPOINT_DB = f"{CHECKPOINT_DIR}/migration_checkpoint.db"
 
 # WGS84 constants
 WGS_ORIGIN_X = 1422754634
@@ -74,15 +93,29 @@ MINE_LON = 119.25262554
 MYSQL_POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", "10"))  # Increased for parallelization
 POSTGRES_POOL_SIZE = int(os.getenv("POSTGRES_POOL_SIZE", "10"))  # Increased for parallelization
 CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "20000"))  # Larger chunks for better performance
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", str(CHUNK_SIZE * 10)))  # Rows per keyset query
+TRANSFER_MODE = os.getenv("TRANSFER_MODE", "csv").lower()  # "csv" or "stream"
+STREAM_SPOOL = os.getenv("STREAM_SPOOL", "false").lower() == "true"  # Spool streamed rows for resume
+STREAM_QUEUE_DEPTH = 4  # Encoded chunks buffered between the MySQL reader and COPY
+RANGE_WORKERS = int(os.getenv("RANGE_WORKERS", "4"))  # Concurrent key ranges per large table
+RANGE_MIN_ROWS = int(os.getenv("RANGE_MIN_ROWS", "1000000"))  # Split tables at least this large
 MAX_RETRIES = 5
 RETRY_BACKOFF_BASE = 2  # Exponential backoff: 2^retry seconds
 MAX_WORKERS = int(os.getenv("MAX_WORKERS", "4"))  # Parallel table processing
 DECRYPTION_WORKERS = int(os.getenv("DECRYPTION_WORKERS", "3"))  # Parallel decryption within tables
+DECRYPT_ENGINE = os.getenv("DECRYPT_ENGINE", "python").lower()  # "python" or "mysql"
+DECRYPT_PROCESSES = int(os.getenv("DECRYPT_PROCESSES", str(os.cpu_count() or 1)))  # Python AES worker processes
+DECRYPT_VALIDATE_SAMPLE = int(os.getenv("DECRYPT_VALIDATE_SAMPLE", "100"))  # Rows compared with AES_DECRYPT
 
 # Global connection pools
 mysql_pool = None
 pg_pool = None
-_checkpoint_lock = threading.Lock()
+_checkpoint_store = CheckpointStore(CHECKPOINT_DB, legacy_json=CHECKPOINT_FILE)
+# Range workers take pooled connections on top of the one each table worker holds;
+# sharing these slots across tables keeps the total within the pool sizes
+_range_slots = threading.BoundedSemaphore(max(1, min(MYSQL_POOL_SIZE, POSTGRES_POOL_SIZE) - MAX_WORKERS))
+_pose_decryptor = None
+_pose_decryptor_lock = threading.Lock()
 
 
 def print_performance_config():
@@ -95,6 +128,9 @@ def print_performance_config():
     print(f"     MySQL Connection Pool: {MYSQL_POOL_SIZE}", flush=True)
     print(f"     PostgreSQL Connection Pool: {POSTGRES_POOL_SIZE}", flush=True)
     print(f"    Chunk Size: {CHUNK_SIZE:,} records", flush=True)
+    print(f"    Transfer Mode: {TRANSFER_MODE}" + (" (spooled)" if TRANSFER_MODE == "stream" and STREAM_SPOOL else ""), flush=True)
+    print(f"    Range Workers per Table: {RANGE_WORKERS} (tables >= {RANGE_MIN_ROWS:,} records)", flush=True)
+    print(f"    Decrypt Engine: {DECRYPT_ENGINE}" + (f" ({DECRYPT_PROCESSES} processes)" if DECRYPT_ENGINE == "python" else ""), flush=True)
     print(f"    Max Retries per Table: {MAX_RETRIES}", flush=True)
     print("=" * 80, flush=True)
     print(f"  Tip: Adjust these values via environment variables for better performance", flush=True)
@@ -619,12 +655,12 @@ def import_sql_files_to_mysql(force=False):
 
 def load_checkpoint() -> Dict[str, Any]:
     """Load migration checkpoint"""
-    if os.path.exists(CHECKPOINT_FILE):
-        try:
-            with open(CHECKPOINT_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            pass
+    try:
+        checkpoint = _checkpoint_store.load()
+        if checkpoint is not None:
+            return checkpoint
+    except Exception as e:
+        print(f"   Could not read checkpoint store: {e}", flush=True)
     return {
         "current_table": None,
         "current_table_index": 0,
@@ -636,11 +672,8 @@ def load_checkpoint() -> Dict[str, Any]:
 
 
 def save_checkpoint(checkpoint: Dict[str, Any]):
-    """Save migration checkpoint"""
-    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
-    with _checkpoint_lock:
-        with open(CHECKPOINT_FILE, 'w') as f:
-            json.dump(checkpoint, f, indent=2)
+    """Save migration checkpoint (only the entries that changed, atomically)"""
+    _checkpoint_store.save(checkpoint)
 
 
 def get_table_count(mysql_conn, table_name: str) -> int:
@@ -653,8 +686,128 @@ def get_table_count(mysql_conn, table_name: str) -> int:
         cursor.close()
 
 
-def export_table_chunked(mysql_conn, table_name: str, checkpoint: Dict) -> Tuple[str, List[str], int]:
-    """Export table in chunks to prevent timeout"""
+def get_key_columns(mysql_conn, table_name: str, columns: List[str],
+                    column_types: Dict[str, str]) -> List[str]:
+    """Columns of the primary key, or the narrowest NOT NULL unique key, for keyset paging
+
+    Returns [] when no usable key exists: prefix indexes, nullable or binary
+    columns and keys on excluded (encrypted) columns are skipped.
+    """
+    cursor = mysql_conn.cursor()
+    try:
+        cursor.execute(f"SHOW KEYS FROM `{table_name}`")
+        names = [d[0] for d in cursor.description]
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    
+    keys: Dict[str, List[Tuple[int, str]]] = {}
+    unusable = set()
+    for row in rows:
+        info = {name: (val.decode() if isinstance(val, bytes) else val) for name, val in zip(names, row)}
+        key_name = info["Key_name"]
+        if int(info["Non_unique"]):
+            continue
+        col = info["Column_name"]
+        col_type = column_types.get(col, "").lower()
+        if (col not in columns or info.get("Sub_part") is not None or info.get("Null") == "YES"
+                or "blob" in col_type or "binary" in col_type):
+            unusable.add(key_name)
+        keys.setdefault(key_name, []).append((int(info["Seq_in_index"]), col))
+    
+    candidates = [name for name in keys if name not in unusable]
+    if not candidates:
+        return []
+    best = "PRIMARY" if "PRIMARY" in candidates else min(candidates, key=lambda name: len(keys[name]))
+    return [col for _, col in sorted(keys[best])]
+
+
+def _checkpoint_key(values) -> List[Any]:
+    """JSON-safe copy of a key; dates and decimals become strings MySQL compares correctly"""
+    return [val if isinstance(val, (int, float, str)) else str(val) for val in values]
+
+
+def _close_cursor(cursor):
+    try:
+        cursor.close()
+    except MySQLError:
+        pass  # an unbuffered cursor abandoned mid-result; the pool resets the session
+
+
+def _key_condition(key_columns: List[str], op: str) -> str:
+    if len(key_columns) == 1:
+        return f"`{key_columns[0]}` {op} %s"
+    key_list = ", ".join(f"`{col}`" for col in key_columns)
+    return f"({key_list}) {op} ({', '.join(['%s'] * len(key_columns))})"
+
+
+def iter_export_batches(mysql_conn, table_name: str, columns: List[str], key_columns: List[str],
+                        last_key: Optional[List[Any]] = None, skip_rows: int = 0,
+                        upper_key: Optional[List[Any]] = None):
+    """Yield (rows, last_key) batches of CHUNK_SIZE rows on unbuffered cursors
+    
+    With a key, pages of EXPORT_PAGE_SIZE rows are read in key order with
+    ``WHERE key > last``, so each query is an index range scan no matter how
+    far into the table it is; ``upper_key`` (inclusive) bounds a key range.
+    Without one the table is streamed in a single unordered pass and
+    ``skip_rows`` rows are discarded client-side on resume.
+    """
+    col_list = ", ".join(f"`{col}`" for col in columns)
+    
+    if not key_columns:
+        cursor = mysql_conn.cursor(buffered=False)
+        try:
+            cursor.execute(f"SELECT {col_list} FROM `{table_name}`")
+            while True:
+                with span("mysql_fetch", category="export", table=table_name, streaming=True):
+                    rows = cursor.fetchmany(CHUNK_SIZE)
+                if not rows:
+                    return
+                if skip_rows:
+                    if len(rows) <= skip_rows:
+                        skip_rows -= len(rows)
+                        continue
+                    rows, skip_rows = rows[skip_rows:], 0
+                yield rows, None
+        finally:
+            _close_cursor(cursor)
+    
+    key_index = [columns.index(col) for col in key_columns]
+    key_list = ", ".join(f"`{col}`" for col in key_columns)
+    
+    while True:
+        conditions, params = [], []
+        if last_key is not None:
+            conditions.append(_key_condition(key_columns, ">"))
+            params.extend(last_key)
+        if upper_key is not None:
+            conditions.append(_key_condition(key_columns, "<="))
+            params.extend(upper_key)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"SELECT {col_list} FROM `{table_name}`{where} ORDER BY {key_list} LIMIT {EXPORT_PAGE_SIZE}"
+        page_rows = 0
+        cursor = mysql_conn.cursor(buffered=False)
+        try:
+            cursor.execute(query, tuple(params))
+            while True:
+                with span("mysql_fetch", category="export", table=table_name, after=last_key):
+                    rows = cursor.fetchmany(CHUNK_SIZE)
+                if not rows:
+                    break
+                page_rows += len(rows)
+                last_key = [rows[-1][i] for i in key_index]
+                yield rows, last_key
+        finally:
+            _close_cursor(cursor)
+        
+        if page_rows < EXPORT_PAGE_SIZE:
+            return
+        # Between pages the connection is idle, so keep it alive
+        mysql_conn.ping(reconnect=True)
+
+
+def get_export_columns(mysql_conn, table_name: str) -> Tuple[List[str], Dict[str, str]]:
+    """Columns to copy (encrypted ones are decrypted separately) and the MySQL type of every column"""
     cursor = mysql_conn.cursor(buffered=True)
     
     try:
@@ -678,56 +831,75 @@ def export_table_chunked(mysql_conn, table_name: str, checkpoint: Dict) -> Tuple
                 "encrypted" in col_lower or
                 ("aes" in col_lower and ("pose" in col_lower or "coord" in col_lower))):
                 encrypted_cols.append(col)
+    finally:
+        cursor.close()
+    
+    # Only include non-encrypted columns in export
+    columns = [col for col, _ in all_columns if col not in encrypted_cols]
+    
+    # Detailed column logging
+    print(f"       Column breakdown:", flush=True)
+    print(f"         Total columns in MySQL: {len(all_columns)}", flush=True)
+    print(f"         Encrypted columns (excluded): {len(encrypted_cols)} {encrypted_cols if encrypted_cols else ''}", flush=True)
+    print(f"         Non-encrypted columns (exported): {len(columns)}", flush=True)
+    if encrypted_cols:
+        print(f"       Excluding {len(encrypted_cols)} encrypted column(s): {encrypted_cols}", flush=True)
+    
+    return columns, dict(all_columns)
+
+
+@traced(category="export", args=("table_name",))
+def export_table_chunked(mysql_conn, table_name: str, checkpoint: Dict) -> Tuple[str, List[str], int]:
+    """Export table to CSV with keyset pagination on streaming cursors, resumable by last key"""
+    columns, column_types = get_export_columns(mysql_conn, table_name)
+    
+    # Primary (or unique) key for keyset paging; without one the table is streamed
+    key_columns = get_key_columns(mysql_conn, table_name, columns, column_types)
+    if key_columns:
+        print(f"       Paging by key: {key_columns}", flush=True)
+    else:
+        print("       No usable unique key, streaming in one pass", flush=True)
+    
+    csv_file = f"{CSV_DIR}/{table_name}.csv"
+    os.makedirs(CSV_DIR, exist_ok=True)
+    
+    # Get total count
+    total_count = get_table_count(mysql_conn, table_name)
+    print(f"       Total records: {total_count}", flush=True)
+    
+    # Resume from checkpoint if exists: the last exported key, or a row count when streaming
+    key_checkpoint = f"{table_name}_export_last_key"
+    rows_checkpoint = f"{table_name}_export_rows"
+    bytes_checkpoint = f"{table_name}_export_bytes"
+    last_key = checkpoint.get(key_checkpoint) if key_columns else None
+    exported = checkpoint.get(rows_checkpoint, 0)
+    resuming = os.path.exists(csv_file) and exported > 0 and (last_key is not None or not key_columns)
+    if resuming:
+        print(f"       Resuming after {exported:,} records" + (f" (key {last_key})" if last_key else ""), flush=True)
+        # Drop rows written after the last checkpoint so they are not exported twice
+        if checkpoint.get(bytes_checkpoint) is not None:
+            with open(csv_file, "r+b") as partial:
+                partial.truncate(checkpoint[bytes_checkpoint])
+    else:
+        last_key, exported = None, 0
+    
+    # Open CSV file for append or write
+    file_mode = "a" if resuming else "w"
+    with open(csv_file, file_mode, newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL, escapechar="\\")
         
-        # Only include non-encrypted columns in export
-        columns = [col for col, _ in all_columns if col not in encrypted_cols]
-        
-        # Detailed column logging
-        print(f"       Column breakdown:", flush=True)
-        print(f"         Total columns in MySQL: {len(all_columns)}", flush=True)
-        print(f"         Encrypted columns (excluded): {len(encrypted_cols)} {encrypted_cols if encrypted_cols else ''}", flush=True)
-        print(f"         Non-encrypted columns (exported): {len(columns)}", flush=True)
-        if encrypted_cols:
-            print(f"       Excluding {len(encrypted_cols)} encrypted column(s): {encrypted_cols}", flush=True)
-        
-        # Get primary key or _OID_ for chunking
-        pk_column = "_OID_" if "_OID_" in columns else (columns[0] if columns else None)
-        
-        csv_file = f"{CSV_DIR}/{table_name}.csv"
-        os.makedirs(CSV_DIR, exist_ok=True)
-        
-        # Get total count
-        total_count = get_table_count(mysql_conn, table_name)
-        print(f"       Total records: {total_count}", flush=True)
+        if not resuming:
+            writer.writerow(columns)
         
-        # Resume from checkpoint if exists
-        last_id = checkpoint.get("last_record_id", 0)
-        if last_id:
-            print(f"       Resuming from record ID: {last_id}", flush=True)
+        processed = 0
+        progress = ProgressReporter(f"Export {table_name}", total=max(total_count - exported, 0),
+                                    unit="records", indent="      ", stage="export")
         
-        # Open CSV file for append or write
-        file_mode = "a" if last_id else "w"
-        with open(csv_file, file_mode, newline="", encoding="utf-8") as f:
-            writer = csv.writer(f, quoting=csv.QUOTE_ALL, escapechar="\\")
-            
-            if not last_id:
-                writer.writerow(columns)
-            
-            processed = 0
-            chunk_offset = last_id if last_id else 0
-            
-            # Process in chunks
-            while chunk_offset < total_count:
-                try:
-                    # Fetch chunk using LIMIT/OFFSET - SELECT only non-encrypted columns
-                    col_list = ", ".join([f"`{col}`" for col in columns])
-                    query = f"SELECT {col_list} FROM `{table_name}` ORDER BY `{pk_column}` LIMIT {CHUNK_SIZE} OFFSET {chunk_offset}"
-                    cursor.execute(query)
-                    
-                    chunk_data = cursor.fetchall()
-                    if not chunk_data:
-                        break
-                    
+        try:
+            batches = iter_export_batches(mysql_conn, table_name, columns, key_columns,
+                                          last_key=last_key, skip_rows=0 if key_columns else exported)
+            for chunk_data, last_key in batches:
+                with span("csv_write", category="export", table=table_name, rows=len(chunk_data)):
                     for row in chunk_data:
                         clean_row = []
                         for val in row:
@@ -738,49 +910,61 @@ def export_table_chunked(mysql_conn, table_name: str, checkpoint: Dict) -> Tuple
                             else:
                                 clean_row.append(str(val))
                         writer.writerow(clean_row)
-                    
-                    processed += len(chunk_data)
-                    chunk_offset += len(chunk_data)
-                    
-                    # Update checkpoint
-                    checkpoint["last_record_id"] = chunk_offset
-                    checkpoint["total_processed"] += len(chunk_data)
-                    save_checkpoint(checkpoint)
-                    
-                    if processed % (CHUNK_SIZE * 5) == 0:
-                        print(f"      Processed {processed:,}/{total_count:,} records... ({processed/total_count*100:.1f}%)", flush=True)
-                    
-                    # Reset connection periodically to prevent timeout
-                    if processed % (CHUNK_SIZE * 10) == 0:
-                        mysql_conn.ping(reconnect=True)
-                        print(f"       Connection refreshed", flush=True)
-                    
-                except MySQLError as e:
-                    if "Lost connection" in str(e) or "timeout" in str(e).lower():
-                        print(f"       Connection lost at {chunk_offset}, will resume...", flush=True)
-                        # Connection will be retried by caller
-                        raise
-                    else:
-                        print(f"       Error processing chunk: {e}", flush=True)
-                        chunk_offset += CHUNK_SIZE  # Skip problematic chunk
-                        continue
-        
-        cursor.close()
-        
-        # Verify we exported all records
-        if processed != total_count:
-            print(f"       WARNING: Exported {processed:,} but MySQL has {total_count:,} records!", flush=True)
-        else:
-            print(f"       Exported ALL {processed:,} records to CSV ({len(columns)} columns)", flush=True)
-        
-        return csv_file, columns, processed
-        
-    except Exception as e:
-        cursor.close()
-        raise
+                
+                processed += len(chunk_data)
+                
+                # Update checkpoint once the rows are on disk
+                f.flush()
+                os.fsync(f.fileno())
+                if last_key is not None:
+                    checkpoint[key_checkpoint] = _checkpoint_key(last_key)
+                checkpoint[rows_checkpoint] = exported + processed
+                checkpoint[bytes_checkpoint] = f.tell()
+                checkpoint["total_processed"] += len(chunk_data)
+                save_checkpoint(checkpoint)
+                progress.update(len(chunk_data))
+            
+        except MySQLError as e:
+            if "Lost connection" in str(e) or "timeout" in str(e).lower():
+                print(f"       Connection lost after {exported + processed:,} records, will resume...", flush=True)
+            else:
+                progress.error(f"after {exported + processed:,} records: {e}", advance=False)
+            # Connection will be retried by caller
+            raise
+        finally:
+            progress.finish()
+    
+    etl_rows.labels(stage="export", table=table_name).inc(processed)
+    
+    # Verify we exported all records
+    processed += exported
+    if processed != total_count:
+        print(f"       WARNING: Exported {processed:,} but MySQL has {total_count:,} records!", flush=True)
+    else:
+        print(f"       Exported ALL {processed:,} records to CSV ({len(columns)} columns)", flush=True)
+    
+    return csv_file, columns, processed
+
+
+def forget_decrypt_positions(checkpoint: Dict, table_name: str, columns: List[str],
+                             recreated: bool = False):
+    """Drop the per-column decryption checkpoint entries of a table
+    
+    Called when the table is finished and when its PostgreSQL copy is
+    recreated. Only a recreated table (its decrypted columns are gone) also
+    loses the ``<table>_<column>_decrypted`` markers that let the
+    post-migration pass skip columns already decrypted.
+    """
+    for col in columns:
+        checkpoint.pop(f"{table_name}_{col}_last_oid", None)
+        checkpoint.pop(f"{table_name}_{col}_staged", None)
+        if recreated:
+            checkpoint.pop(f"{table_name}_{col}_decrypted", None)
 
 
-def create_postgres_table(pg_conn, table_name: str, columns: List[str], mysql_conn):
+@traced(category="import", args=("table_name",))
+def create_postgres_table(pg_conn, table_name: str, columns: List[str], mysql_conn,
+                          checkpoint: Optional[Dict] = None):
     """Create PostgreSQL table from MySQL schema"""
     cursor = pg_conn.cursor()
     mysql_cursor = mysql_conn.cursor()
@@ -821,6 +1005,9 @@ def create_postgres_table(pg_conn, table_name: str, columns: List[str], mysql_co
         create_sql = f'CREATE TABLE "{table_name}" ({", ".join(pg_columns)})'
         cursor.execute(create_sql)
         pg_conn.commit()
+        if checkpoint is not None:
+            forget_decrypt_positions(checkpoint, table_name, list(col_info), recreated=True)
+            save_checkpoint(checkpoint)
         
         print(f"       Created PostgreSQL table", flush=True)
         
@@ -829,6 +1016,7 @@ def create_postgres_table(pg_conn, table_name: str, columns: List[str], mysql_co
         mysql_cursor.close()
 
 
+@traced(category="import", args=("table_name",))
 def import_csv_to_postgres_chunked(pg_conn, table_name: str, csv_file: str, columns: List[str]):
     """Import CSV to PostgreSQL in chunks"""
     cursor = pg_conn.cursor()
@@ -840,6 +1028,7 @@ def import_csv_to_postgres_chunked(pg_conn, table_name: str, csv_file: str, colu
         
         batch = []
         total_imported = 0
+        progress = ProgressReporter(f"Import {table_name}", unit="records", indent="      ", stage="import")
         
         with open(csv_file, "r", encoding="utf-8") as f:
             reader = csv.reader(f)
@@ -850,18 +1039,22 @@ def import_csv_to_postgres_chunked(pg_conn, table_name: str, csv_file: str, colu
                 batch.append(clean_row)
                 
                 if len(batch) >= 5000:
-                    execute_batch(cursor, insert_sql, batch, page_size=5000)
-                    pg_conn.commit()
+                    with span("pg_insert", category="import", table=table_name, rows=len(batch)):
+                        execute_batch(cursor, insert_sql, batch, page_size=5000)
+                        pg_conn.commit()
                     total_imported += len(batch)
+                    progress.update(len(batch))
                     batch = []
-                    
-                    if total_imported % 50000 == 0:
-                        print(f"      Imported {total_imported:,} records...", flush=True)
             
             if batch:
-                execute_batch(cursor, insert_sql, batch, page_size=len(batch))
-                pg_conn.commit()
+                with span("pg_insert", category="import", table=table_name, rows=len(batch)):
+                    execute_batch(cursor, insert_sql, batch, page_size=len(batch))
+                    pg_conn.commit()
                 total_imported += len(batch)
+                progress.update(len(batch))
+        
+        progress.finish()
+        etl_rows.labels(stage="import", table=table_name).inc(total_imported)
         
         # Verify import completed successfully
         cursor.execute(f'SELECT COUNT(*) FROM "{table_name}"')
@@ -877,6 +1070,563 @@ def import_csv_to_postgres_chunked(pg_conn, table_name: str, csv_file: str, colu
         cursor.close()
 
 
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
+
+def encode_copy_rows(rows) -> bytes:
+    """Encode MySQL rows as PostgreSQL COPY text
+    
+    Matches the CSV path: NULLs, binary values and empty strings all load as NULL.
+    """
+    lines = []
+    for row in rows:
+        fields = []
+        for val in row:
+            if val is None or isinstance(val, bytes):
+                fields.append("\\N")
+            else:
+                text = str(val)
+                fields.append(text.translate(_COPY_ESCAPES) if text else "\\N")
+        lines.append("\t".join(fields))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class CopyPipe:
+    """File-like object fed by a producer thread and read by ``copy_expert``
+    
+    The queue is bounded, so MySQL fetching runs at most STREAM_QUEUE_DEPTH
+    chunks ahead of the COPY. An exception put by the producer is raised from
+    read(), which aborts the COPY.
+    """
+    
+    def __init__(self, depth: int = STREAM_QUEUE_DEPTH):
+        self.queue = Queue(maxsize=depth)
+        self.aborted = threading.Event()
+        self._chunk = b""
+        self._pos = 0
+        self._eof = False
+        self.error = None
+    
+    def put(self, item) -> bool:
+        """Queue bytes, an exception, or None for end of data; False once the reader gave up"""
+        while not self.aborted.is_set():
+            try:
+                self.queue.put(item, timeout=1)
+                return True
+            except Full:
+                continue
+        return False
+    
+    def read(self, size: int = -1) -> bytes:
+        while self._pos >= len(self._chunk):
+            if self._eof:
+                return b""
+            item = self.queue.get()
+            if item is None:
+                self._eof = True
+                return b""
+            if isinstance(item, BaseException):
+                self.error = item
+                raise item
+            self._chunk, self._pos = item, 0
+        end = len(self._chunk) if size is None or size < 0 else self._pos + size
+        data = self._chunk[self._pos:end]
+        self._pos += len(data)
+        return data
+    
+    def abort(self):
+        """Stop the producer and drop anything it queued"""
+        self.aborted.set()
+        while True:
+            try:
+                self.queue.get_nowait()
+            except Empty:
+                return
+
+
+def copy_into_postgres(pg_conn, table_name: str, columns: List[str], chunks):
+    """COPY an iterable of encoded chunks into ``table_name`` and commit
+    
+    ``chunks`` (COPY text bytes, usually a generator reading MySQL) is
+    consumed on a reader thread while this thread runs the COPY, so the fetch
+    and the write overlap. A failure on either side rolls the COPY back and
+    is raised here; reader errors keep their original type.
+    """
+    pipe = CopyPipe()
+    
+    def produce():
+        try:
+            for data in chunks:
+                if not pipe.put(data):
+                    return
+            pipe.put(None)
+        except BaseException as e:
+            pipe.put(e)
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+    
+    reader = threading.Thread(target=produce, name=f"mysql-reader-{table_name}", daemon=True)
+    col_names = ",".join([f'"{col}"' for col in columns])
+    cursor = pg_conn.cursor()
+    try:
+        reader.start()
+        with span("pg_copy", category="transfer", table=table_name):
+            cursor.copy_expert(f'COPY "{table_name}" ({col_names}) FROM STDIN', pipe, size=1 << 20)
+        pg_conn.commit()
+    except BaseException as e:
+        pipe.abort()
+        pg_conn.rollback()
+        if pipe.error is not None and pipe.error is not e:
+            raise pipe.error from e
+        raise
+    finally:
+        reader.join()
+        cursor.close()
+
+
+@traced(category="transfer", args=("table_name",))
+def stream_table_to_postgres(mysql_conn, pg_conn, table_name: str, columns: List[str],
+                             column_types: Dict[str, str], checkpoint: Dict) -> int:
+    """Copy a table straight from a MySQL cursor into ``COPY ... FROM STDIN``
+    
+    A reader thread fetches keyset pages (see iter_export_batches), encodes
+    them as COPY text and queues them; this thread feeds the queue to the
+    COPY, so the MySQL fetch and the PostgreSQL write overlap. The COPY is
+    one transaction per table.
+    
+    With STREAM_SPOOL the encoded data is also appended to
+    ``CSV_DIR/<table>.copy`` and the last key saved to the checkpoint. A
+    retry replays the spool into the (recreated) table and continues from
+    that key; the spool is deleted once the table has loaded.
+    """
+    key_columns = get_key_columns(mysql_conn, table_name, columns, column_types)
+    if key_columns:
+        print(f"       Streaming by key: {key_columns}", flush=True)
+    else:
+        print("       No usable unique key, streaming in one pass", flush=True)
+    
+    total_count = get_table_count(mysql_conn, table_name)
+    
+    spool_file = f"{CSV_DIR}/{table_name}.copy"
+    key_checkpoint = f"{table_name}_stream_last_key"
+    rows_checkpoint = f"{table_name}_stream_rows"
+    bytes_checkpoint = f"{table_name}_stream_bytes"
+    last_key, spooled_rows, spooled_bytes = None, 0, 0
+    if STREAM_SPOOL:
+        os.makedirs(CSV_DIR, exist_ok=True)
+        spooled_rows = checkpoint.get(rows_checkpoint, 0)
+        spooled_bytes = checkpoint.get(bytes_checkpoint, 0)
+        last_key = checkpoint.get(key_checkpoint) if key_columns else None
+        if (spooled_rows and os.path.exists(spool_file) and os.path.getsize(spool_file) >= spooled_bytes
+                and (last_key is not None or not key_columns)):
+            print(f"       Resuming after {spooled_rows:,} spooled records", flush=True)
+        else:
+            last_key, spooled_rows, spooled_bytes = None, 0, 0
+    
+    progress = ProgressReporter(f"Transfer {table_name}", total=total_count,
+                                unit="records", indent="      ", stage="transfer")
+    streamed = 0
+    
+    def encoded():
+        nonlocal streamed
+        spool = None
+        try:
+            if STREAM_SPOOL:
+                spool = open(spool_file, "r+b" if spooled_rows else "wb")
+                # Replay what an earlier attempt spooled, dropping any partly written tail
+                spool.truncate(spooled_bytes)
+                while spool.tell() < spooled_bytes:
+                    yield spool.read(min(1 << 20, spooled_bytes - spool.tell()))
+                progress.update(spooled_rows)
+            
+            batches = iter_export_batches(mysql_conn, table_name, columns, key_columns,
+                                          last_key=last_key, skip_rows=0 if key_columns else spooled_rows)
+            for rows, batch_key in batches:
+                with span("copy_encode", category="transfer", table=table_name, rows=len(rows)):
+                    data = encode_copy_rows(rows)
+                if spool is not None:
+                    spool.write(data)
+                    spool.flush()
+                    os.fsync(spool.fileno())  # The checkpoint must not point past durable bytes
+                    if batch_key is not None:
+                        checkpoint[key_checkpoint] = _checkpoint_key(batch_key)
+                    checkpoint[rows_checkpoint] = spooled_rows + streamed + len(rows)
+                    checkpoint[bytes_checkpoint] = spool.tell()
+                    save_checkpoint(checkpoint)
+                yield data
+                streamed += len(rows)
+                progress.update(len(rows))
+        finally:
+            if spool is not None:
+                spool.close()
+    
+    try:
+        copy_into_postgres(pg_conn, table_name, columns, encoded())
+    finally:
+        progress.finish()
+    
+    loaded = spooled_rows + streamed
+    etl_rows.labels(stage="transfer", table=table_name).inc(streamed)
+    
+    for key in (key_checkpoint, rows_checkpoint, bytes_checkpoint):
+        checkpoint.pop(key, None)
+    if STREAM_SPOOL:
+        save_checkpoint(checkpoint)
+        try:
+            os.unlink(spool_file)
+        except OSError:
+            pass
+    
+    if loaded != total_count:
+        print(f"       WARNING: Streamed {loaded:,} but MySQL has {total_count:,} records!", flush=True)
+    else:
+        print(f"       Streamed ALL {loaded:,} records to PostgreSQL ({len(columns)} columns)", flush=True)
+    return loaded
+
+
+def sample_key_boundaries(mysql_conn, table_name: str, key_columns: List[str],
+                          total_count: int, parts: int) -> List[List[Any]]:
+    """Keys that split the table into ``parts`` ranges of roughly equal row counts
+    
+    Each probe starts at the previous boundary and skips ``total_count / parts``
+    index entries, so sampling walks the key index once in total.
+    """
+    step = max(1, math.ceil(total_count / parts))
+    key_list = ", ".join(f"`{col}`" for col in key_columns)
+    boundaries = []
+    cursor = mysql_conn.cursor()
+    try:
+        for _ in range(parts - 1):
+            where, params = "", ()
+            if boundaries:
+                where = f" WHERE {_key_condition(key_columns, '>')}"
+                params = tuple(boundaries[-1])
+            with span("sample_boundary", category="transfer", table=table_name):
+                cursor.execute(f"SELECT {key_list} FROM `{table_name}`{where} "
+                               f"ORDER BY {key_list} LIMIT 1 OFFSET {step - 1}", params)
+                row = cursor.fetchone()
+            if row is None:
+                break
+            boundaries.append(_checkpoint_key(row))
+    finally:
+        cursor.close()
+    return boundaries
+
+
+def _range_staging_ok(pg_conn, staging_table: str, expected_rows: int) -> bool:
+    cursor = pg_conn.cursor()
+    try:
+        cursor.execute(f'SELECT COUNT(*) FROM "{staging_table}"')
+        return cursor.fetchone()[0] == expected_rows
+    except psycopg2.Error:
+        return False
+    finally:
+        pg_conn.rollback()
+        cursor.close()
+
+
+@traced(category="transfer", args=("table_name",))
+def migrate_table_ranges(mysql_conn, pg_conn, table_name: str, columns: List[str],
+                         column_types: Dict[str, str], total_count: int, checkpoint: Dict) -> int:
+    """Migrate a large table as RANGE_WORKERS key ranges in parallel
+    
+    Range boundaries are sampled from the key index. Each range is read with
+    keyset pages on its own pooled MySQL connection and COPYed into an
+    unlogged staging table ``<table>__range<i>`` on its own PostgreSQL
+    connection. The ranges and their finished row counts are kept in the
+    checkpoint, so a retry only redoes unfinished ranges. Once all ranges
+    are in, a single transaction moves the staging tables into the real
+    table and drops them, so the table is never seen partly assembled.
+    
+    Tables without a usable unique key fall back to a single-stream COPY.
+    """
+    key_columns = get_key_columns(mysql_conn, table_name, columns, column_types)
+    if not key_columns:
+        return stream_table_to_postgres(mysql_conn, pg_conn, table_name, columns, column_types, checkpoint)
+    
+    ranges_checkpoint = f"{table_name}_ranges"
+    ranges = checkpoint.get(ranges_checkpoint)
+    if ranges:
+        print(f"       Resuming key ranges: {sum(r['done'] for r in ranges)}/{len(ranges)} finished", flush=True)
+    else:
+        boundaries = sample_key_boundaries(mysql_conn, table_name, key_columns, total_count, RANGE_WORKERS)
+        bounds = [None] + boundaries + [None]
+        ranges = [{"lower": bounds[i], "upper": bounds[i + 1], "rows": 0, "done": False}
+                  for i in range(len(bounds) - 1)]
+        checkpoint[ranges_checkpoint] = ranges
+        save_checkpoint(checkpoint)
+    print(f"       Split into {len(ranges)} key range(s) on {key_columns}", flush=True)
+    
+    staging = [f"{table_name}__range{i}" for i in range(len(ranges))]
+    # Unlogged staging tables are emptied by crash recovery, so re-check finished ranges
+    for staging_table, key_range in zip(staging, ranges):
+        if key_range["done"] and not _range_staging_ok(pg_conn, staging_table, key_range["rows"]):
+            key_range["done"], key_range["rows"] = False, 0
+    pending = [i for i, key_range in enumerate(ranges) if not key_range["done"]]
+    
+    progress = ProgressReporter(f"Transfer {table_name}",
+                                total=max(total_count - sum(r["rows"] for r in ranges), 0),
+                                unit="records", indent="      ", stage="transfer")
+    
+    def run_range(index: int) -> int:
+        key_range, staging_table = ranges[index], staging[index]
+        copied = 0
+        
+        def encoded():
+            nonlocal copied
+            batches = iter_export_batches(range_mysql, table_name, columns, key_columns,
+                                          last_key=key_range["lower"], upper_key=key_range["upper"])
+            for rows, _ in batches:
+                with span("copy_encode", category="transfer", table=table_name, rows=len(rows)):
+                    data = encode_copy_rows(rows)
+                yield data
+                copied += len(rows)
+                progress.update(len(rows))
+        
+        with _range_slots:
+            range_mysql = mysql_pool.get_connection()
+            range_pg = None
+            try:
+                range_pg = pg_pool.getconn()
+                cursor = range_pg.cursor()
+                try:
+                    cursor.execute(f'DROP TABLE IF EXISTS "{staging_table}"')
+                    cursor.execute(f'CREATE UNLOGGED TABLE "{staging_table}" (LIKE "{table_name}")')
+                    range_pg.commit()
+                finally:
+                    cursor.close()
+                with span("key_range", category="transfer", table=table_name, index=index):
+                    copy_into_postgres(range_pg, staging_table, columns, encoded())
+            except Exception:
+                if range_pg is not None:
+                    pg_pool.putconn(range_pg, close=True)
+                    range_pg = None
+                raise
+            finally:
+                if range_pg is not None:
+                    pg_pool.putconn(range_pg)
+                try:
+                    range_mysql.close()
+                except Exception:
+                    pass
+        
+        key_range["rows"], key_range["done"] = copied, True
+        save_checkpoint(checkpoint)
+        etl_rows.labels(stage="transfer", table=table_name).inc(copied)
+        return copied
+    
+    errors = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(RANGE_WORKERS, len(pending))),
+                                thread_name_prefix=f"range-{table_name}") as executor:
+            futures = {executor.submit(run_range, i): i for i in pending}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    progress.error(f"range {futures[future]}: {e}", advance=False)
+                    errors.append(e)
+    finally:
+        progress.finish()
+    if errors:
+        # Finished ranges stay checkpointed; the retry picks up the rest
+        raise errors[0]
+    
+    # Reassemble in one transaction
+    col_names = ",".join([f'"{col}"' for col in columns])
+    cursor = pg_conn.cursor()
+    try:
+        with span("reassemble", category="transfer", table=table_name, ranges=len(staging)):
+            for staging_table in staging:
+                cursor.execute(f'INSERT INTO "{table_name}" ({col_names}) SELECT {col_names} FROM "{staging_table}"')
+            for staging_table in staging:
+                cursor.execute(f'DROP TABLE "{staging_table}"')
+            pg_conn.commit()
+    except BaseException:
+        pg_conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    
+    loaded = sum(key_range["rows"] for key_range in ranges)
+    checkpoint.pop(ranges_checkpoint, None)
+    save_checkpoint(checkpoint)
+    
+    if loaded != total_count:
+        print(f"       WARNING: Migrated {loaded:,} but MySQL has {total_count:,} records!", flush=True)
+    else:
+        print(f"       Migrated ALL {loaded:,} records in {len(ranges)} key range(s) ({len(columns)} columns)", flush=True)
+    return loaded
+
+
+# Decoded values in update order: the row key comes last
+DECODED_COLUMNS = ["decrypted_x", "decrypted_y", "decrypted_z", "decrypted_heading", "decrypted_inclination",
+                   "decrypted_status", "latitude", "longitude", "altitude", "_OID_"]
+
+
+def open_decoded_staging(pg_conn, table_name: str, encrypted_col: str, checkpoint: Dict) -> str:
+    """Create the unlogged staging table that decoded values are COPYed into
+    
+    Rows staged by an earlier attempt are kept when the table still holds at
+    least the checkpointed count. Unlogged tables are emptied by crash
+    recovery, so if rows are missing the column restarts from the beginning.
+    """
+    staging_table = f"{table_name}__{encrypted_col}_decoded"
+    prefix = f"{table_name}_{encrypted_col}"
+    staged = checkpoint.get(f"{prefix}_staged")
+    cursor = pg_conn.cursor()
+    try:
+        if staged is not None:
+            try:
+                cursor.execute(f'SELECT COUNT(*) FROM "{staging_table}"')
+                if cursor.fetchone()[0] >= staged:
+                    print(f"          Resuming with {staged:,} decoded records already staged", flush=True)
+                    return staging_table
+            except psycopg2.Error:
+                pass
+            pg_conn.rollback()
+            print(f"          Staged decoded records were lost, restarting {prefix}", flush=True)
+        # A position without staged rows points into a finished or recreated table, so start over
+        checkpoint.pop(f"{prefix}_last_oid", None)
+        cursor.execute(f'DROP TABLE IF EXISTS "{staging_table}"')
+        col_list = ", ".join(f'"{col}"' for col in DECODED_COLUMNS)
+        cursor.execute(f'CREATE UNLOGGED TABLE "{staging_table}" AS SELECT {col_list} FROM "{table_name}" WITH NO DATA')
+        pg_conn.commit()
+    except BaseException:
+        pg_conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    checkpoint[f"{prefix}_staged"] = 0
+    save_checkpoint(checkpoint)
+    return staging_table
+
+
+def stage_decoded_rows(pg_conn, table_name: str, encrypted_col: str, rows: List[Tuple], checkpoint: Dict,
+                       last_oid: Any = None):
+    """COPY decoded rows (ordered as DECODED_COLUMNS) into the staging table and checkpoint them"""
+    prefix = f"{table_name}_{encrypted_col}"
+    if rows:
+        with span("pg_stage", category="decrypt", table=table_name, rows=len(rows)):
+            copy_into_postgres(pg_conn, f"{table_name}__{encrypted_col}_decoded", DECODED_COLUMNS,
+                               [encode_copy_rows(rows)])
+    checkpoint[f"{prefix}_staged"] = checkpoint.get(f"{prefix}_staged", 0) + len(rows)
+    if last_oid is not None:
+        checkpoint[f"{prefix}_last_oid"] = last_oid
+    save_checkpoint(checkpoint)
+
+
+def apply_decoded_rows(pg_conn, table_name: str, encrypted_col: str, checkpoint: Dict) -> int:
+    """Apply all staged decoded values with one UPDATE ... FROM join, then drop the staging table
+    
+    _OID_ is not indexed in PostgreSQL, so per-row updates each scan the
+    table; the join hashes the staging table and scans the base table once.
+    """
+    staging_table = f"{table_name}__{encrypted_col}_decoded"
+    set_list = ", ".join(f'"{col}" = s."{col}"' for col in DECODED_COLUMNS[:-1])
+    cursor = pg_conn.cursor()
+    try:
+        with span("pg_backfill", category="decrypt", table=table_name):
+            cursor.execute(f'ANALYZE "{staging_table}"')
+            cursor.execute(f'UPDATE "{table_name}" AS t SET {set_list} '
+                           f'FROM "{staging_table}" AS s WHERE t."_OID_" = s."_OID_"')
+            applied = cursor.rowcount
+            cursor.execute(f'DROP TABLE "{staging_table}"')
+            pg_conn.commit()
+    except BaseException:
+        pg_conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    checkpoint.pop(f"{table_name}_{encrypted_col}_staged", None)
+    checkpoint.pop(f"{table_name}_{encrypted_col}_last_oid", None)
+    checkpoint[f"{table_name}_{encrypted_col}_decrypted"] = True
+    save_checkpoint(checkpoint)
+    return applied
+
+
+def get_pose_decryptor() -> PoseDecryptor:
+    """Shared PoseDecryptor; main() starts it before any threads so workers fork cleanly"""
+    global _pose_decryptor
+    with _pose_decryptor_lock:
+        if _pose_decryptor is None:
+            _pose_decryptor = PoseDecryptor(AES_KEY, processes=DECRYPT_PROCESSES, batch_size=CHUNK_SIZE // 4).start()
+        return _pose_decryptor
+
+
+def mine_to_wgs84(x: float, y: float, z: float) -> Tuple[float, float, float]:
+    """Translate mine coordinates to (latitude, longitude, altitude)"""
+    wgs_x = WGS_ORIGIN_X + x * MINE_SCALE
+    wgs_y = WGS_ORIGIN_Y + y * MINE_SCALE
+    wgs_z = WGS_ORIGIN_Z + z * MINE_SCALE
+    lat = MINE_LAT + (wgs_y / 111320000)
+    lon = MINE_LON + (wgs_x / (111320000 * math.cos(math.radians(MINE_LAT))))
+    return lat, lon, wgs_z / 1000.0
+
+
+def decrypt_in_python(mysql_conn, pg_conn, table_name: str, encrypted_col: str, checkpoint: Dict,
+                      total_count: int) -> Optional[int]:
+    """Decrypt an encrypted pose column with the python AES engine
+    
+    Raw ciphertext is fetched in CHUNK_SIZE keyset pages on _OID_ and decrypted
+    and parsed across the PoseDecryptor process pool, so MySQL only serves
+    bytes. The engine is first checked against AES_DECRYPT on a sample; on any
+    mismatch nothing is staged and None is returned so the caller can fall
+    back to decrypting in MySQL. Decoded rows go to the staging table opened
+    by open_decoded_staging().
+    """
+    decryptor = get_pose_decryptor()
+    with span("validate_decrypt", category="decrypt", table=table_name):
+        checked, mismatched = decryptor.validate(mysql_conn, table_name, encrypted_col, DECRYPT_VALIDATE_SAMPLE)
+    if mismatched:
+        print(f"          Python AES differs from AES_DECRYPT on {len(mismatched)}/{checked} sampled records "
+              f"(e.g. OID {mismatched[0]}), falling back to MySQL decryption", flush=True)
+        return None
+    
+    oid_checkpoint = f"{table_name}_{encrypted_col}_last_oid"
+    last_oid = checkpoint.get(oid_checkpoint, None)
+    processed = 0
+    print(f"          Decrypting in Python ({decryptor.processes} processes), chunks of {CHUNK_SIZE:,}...", flush=True)
+    progress = ProgressReporter(f"Decrypt {table_name}.{encrypted_col}", total=total_count,
+                                unit="records", indent="          ", stage="decrypt")
+    mysql_cursor = mysql_conn.cursor()
+    try:
+        while True:
+            oid_filter = "AND `_OID_` > %s" if last_oid else ""
+            params = (last_oid, CHUNK_SIZE) if last_oid else (CHUNK_SIZE,)
+            with span("mysql_ciphertext_fetch", category="decrypt", table=table_name, after_oid=last_oid):
+                mysql_cursor.execute(
+                    f"SELECT `_OID_`, `{encrypted_col}` FROM `{table_name}` "
+                    f"WHERE `{encrypted_col}` IS NOT NULL {oid_filter} ORDER BY `_OID_` LIMIT %s",
+                    params
+                )
+                rows = mysql_cursor.fetchall()
+            if not rows:
+                break
+            
+            poses, failures = decryptor.decrypt(rows)
+            for oid, reason in failures:
+                progress.error(f"OID {oid}: {reason}")
+            
+            update_batch = [(x, y, z, heading, inclination, status, *mine_to_wgs84(x, y, z), oid)
+                            for oid, (x, y, z, heading, inclination, status) in poses]
+            # Advance past the whole page, including rows that failed to decrypt
+            last_oid = rows[-1][0]
+            stage_decoded_rows(pg_conn, table_name, encrypted_col, update_batch, checkpoint, last_oid)
+            processed += len(update_batch)
+            progress.update(len(update_batch))
+            
+            if processed % (CHUNK_SIZE * 5) == 0:
+                mysql_conn.ping(reconnect=True)
+    finally:
+        progress.finish()
+        mysql_cursor.close()
+    return processed
+
+
+@traced(category="decrypt", args=("table_name", "encrypted_col"))
 def decrypt_and_transform_chunked(mysql_conn, pg_conn, table_name: str, encrypted_col: str, checkpoint: Dict):
     """Decrypt and transform coordinates in chunks"""
     print(f"       Decrypting {table_name}.{encrypted_col}...", flush=True)
@@ -909,12 +1659,20 @@ def decrypt_and_transform_chunked(mysql_conn, pg_conn, table_name: str, encrypte
         total_count = mysql_cursor.fetchone()["cnt"]
         print(f"          Found {total_count:,} encrypted records", flush=True)
         
+        # Decoded values are COPYed to a staging table and applied in one UPDATE at the end
+        open_decoded_staging(pg_conn, table_name, encrypted_col, checkpoint)
+        
         # Process in chunks - use MySQL SUBSTRING_INDEX for reliable parsing (like SQL example)
         last_oid = checkpoint.get(f"{table_name}_{encrypted_col}_last_oid", None)
         processed = 0
+        python_processed = None
+        if DECRYPT_ENGINE == "python" and total_count:
+            python_processed = decrypt_in_python(mysql_conn, pg_conn, table_name, encrypted_col, checkpoint, total_count)
         
+        if python_processed is not None:
+            processed = python_processed
         # For small datasets, process all at once
-        if total_count <= CHUNK_SIZE:
+        elif total_count <= CHUNK_SIZE:
             print(f"          Small dataset ({total_count:,} records), processing all at once...", flush=True)
             
             # Use MySQL SUBSTRING_INDEX to parse coordinates (format: x\t\tz\theading\tinclination\tstatus from Java encodeString)
@@ -982,51 +1740,46 @@ def decrypt_and_transform_chunked(mysql_conn, pg_conn, table_name: str, encrypte
                     continue
             
             if update_batch:
-                update_sql = f"""
-                    UPDATE "{table_name}"
-                    SET decrypted_x = %s, decrypted_y = %s, decrypted_z = %s,
-                        decrypted_heading = %s, decrypted_inclination = %s, decrypted_status = %s,
-                        latitude = %s, longitude = %s, altitude = %s
-                    WHERE "_OID_" = %s
-                """
-                execute_batch(pg_cursor, update_sql, update_batch, page_size=len(update_batch))
-                pg_conn.commit()
+                stage_decoded_rows(pg_conn, table_name, encrypted_col, update_batch, checkpoint)
                 processed = len(update_batch)
-                print(f"          Decrypted and updated {processed:,} records", flush=True)
+                print(f"          Decrypted and staged {processed:,} records", flush=True)
         else:
             # Large dataset - process in chunks
             print(f"          Large dataset ({total_count:,} records), processing in chunks of {CHUNK_SIZE:,}...", flush=True)
+            progress = ProgressReporter(f"Decrypt {table_name}.{encrypted_col}", total=total_count,
+                                        unit="records", indent="          ", stage="decrypt")
             while True:
                 try:
                     # Use MySQL SUBSTRING_INDEX to parse coordinates
                     oid_filter = f"AND _OID_ > '{last_oid}'" if last_oid else ""
                     
-                    mysql_cursor.execute(
-                        f"""
-                        SELECT 
-                            _OID_,
-                            SUBSTRING_INDEX(SUBSTRING_INDEX(coords, '\t', 1), '\t', -1) AS x,
-                            SUBSTRING_INDEX(SUBSTRING_INDEX(coords, '\t', 2), '\t', -1) AS y,
-                            SUBSTRING_INDEX(SUBSTRING_INDEX(coords, '\t', 3), '\t', -1) AS z,
-                            SUBSTRING_INDEX(SUBSTRING_INDEX(coords, '\t', 4), '\t', -1) AS heading,
-                            SUBSTRING_INDEX(SUBSTRING_INDEX(coords, '\t', 5), '\t', -1) AS inclination,
-                            SUBSTRING_INDEX(SUBSTRING_INDEX(coords, '\t', 6), '\t', -1) AS status
-                        FROM (
+                    with span("mysql_decrypt_fetch", category="decrypt", table=table_name, after_oid=last_oid):
+                        mysql_cursor.execute(
+                            f"""
                             SELECT 
                                 _OID_,
-                                CAST(AES_DECRYPT(`{encrypted_col}`, %s) AS CHAR) AS coords
-                            FROM `{table_name}`
-                            WHERE `{encrypted_col}` IS NOT NULL
-                            {oid_filter}
-                            ORDER BY _OID_
-                            LIMIT %s
-                        ) AS t
-                        WHERE coords IS NOT NULL AND coords != ''
-                        """,
-                        (AES_KEY, CHUNK_SIZE)
-                    )
+                                SUBSTRING_INDEX(SUBSTRING_INDEX(coords, '\t', 1), '\t', -1) AS x,
+                                SUBSTRING_INDEX(SUBSTRING_INDEX(coords, '\t', 2), '\t', -1) AS y,
+                                SUBSTRING_INDEX(SUBSTRING_INDEX(coords, '\t', 3), '\t', -1) AS z,
+                                SUBSTRING_INDEX(SUBSTRING_INDEX(coords, '\t', 4), '\t', -1) AS heading,
+                                SUBSTRING_INDEX(SUBSTRING_INDEX(coords, '\t', 5), '\t', -1) AS inclination,
+                                SUBSTRING_INDEX(SUBSTRING_INDEX(coords, '\t', 6), '\t', -1) AS status
+                            FROM (
+                                SELECT 
+                                    _OID_,
+                                    CAST(AES_DECRYPT(`{encrypted_col}`, %s) AS CHAR) AS coords
+                                FROM `{table_name}`
+                                WHERE `{encrypted_col}` IS NOT NULL
+                                {oid_filter}
+                                ORDER BY _OID_
+                                LIMIT %s
+                            ) AS t
+                            WHERE coords IS NOT NULL AND coords != ''
+                            """,
+                            (AES_KEY, CHUNK_SIZE)
+                        )
                     
-                    rows = mysql_cursor.fetchall()
+                        rows = mysql_cursor.fetchall()
                     if not rows:
                         break
                     
@@ -1067,27 +1820,13 @@ def decrypt_and_transform_chunked(mysql_conn, pg_conn, table_name: str, encrypte
                             update_batch.append((x, y, z, heading, inclination, status, lat, lon, alt, row["_OID_"]))
                             last_oid = row["_OID_"]
                         except (ValueError, TypeError, KeyError) as e:
-                            print(f"          Failed to parse coordinates for OID {row.get('_OID_', 'unknown')}: {e}", flush=True)
+                            progress.error(f"OID {row.get('_OID_', 'unknown')}: {e}")
                             continue
                 
                     if update_batch:
-                        update_sql = f"""
-                            UPDATE "{table_name}"
-                            SET decrypted_x = %s, decrypted_y = %s, decrypted_z = %s,
-                                decrypted_heading = %s, decrypted_inclination = %s, decrypted_status = %s,
-                                latitude = %s, longitude = %s, altitude = %s
-                            WHERE "_OID_" = %s
-                        """
-                        execute_batch(pg_cursor, update_sql, update_batch, page_size=len(update_batch))
-                        pg_conn.commit()
-                        
+                        stage_decoded_rows(pg_conn, table_name, encrypted_col, update_batch, checkpoint, last_oid)
                         processed += len(update_batch)
-                        checkpoint[f"{table_name}_{encrypted_col}_last_oid"] = last_oid
-                        save_checkpoint(checkpoint)
-                        
-                        # Show progress every 10,000 records or at batch completion
-                        if processed % 10000 == 0 or (processed > 0 and processed < 10000):
-                            print(f"          Processed {processed:,}/{total_count:,} records... ({processed/total_count*100:.1f}%)", flush=True)
+                        progress.update(len(update_batch))
                         
                         # Reset connection periodically
                         if processed % (CHUNK_SIZE * 5) == 0:
@@ -1103,7 +1842,11 @@ def decrypt_and_transform_chunked(mysql_conn, pg_conn, table_name: str, encrypte
                 except Exception as e:
                     print(f"          Unexpected error: {e}", flush=True)
                     raise
+            progress.finish()
         
+        applied = apply_decoded_rows(pg_conn, table_name, encrypted_col, checkpoint)
+        print(f"          Applied {applied:,} staged records with one UPDATE", flush=True)
+        etl_rows.labels(stage="decrypt", table=f"{table_name}.{encrypted_col}").inc(processed)
         print(f"       Decrypted {processed:,} records", flush=True)
         
     finally:
@@ -1178,6 +1921,10 @@ def decrypt_table_columns(table_name: str, columns: List[str], checkpoint: Dict)
             # Decrypt each column
             with get_postgres_connection() as pg_conn:
                 for col in columns:
+                    if checkpoint.get(f"{table_name}_{col}_decrypted"):
+                        print(f"       {table_name}.{col} already decrypted, skipping", flush=True)
+                        continue
+                    
                     # Check if column has encrypted data
                     check_cursor = mysql_conn.cursor()
                     check_cursor.execute(f"SELECT COUNT(*) FROM `{table_name}` WHERE `{col}` IS NOT NULL")
@@ -1187,7 +1934,8 @@ def decrypt_table_columns(table_name: str, columns: List[str], checkpoint: Dict)
                     if encrypted_count > 0:
                         print(f"       Decrypting {table_name}.{col} ({encrypted_count:,} records)...", flush=True)
                         try:
-                            decrypt_and_transform_chunked(mysql_conn, pg_conn, table_name, col, checkpoint)
+                            with memory_stage(f"decrypt {table_name}.{col}"):
+                                decrypt_and_transform_chunked(mysql_conn, pg_conn, table_name, col, checkpoint)
                             
                             # Drop encrypted column
                             try:
@@ -1207,6 +1955,7 @@ def decrypt_table_columns(table_name: str, columns: List[str], checkpoint: Dict)
         return False
 
 
+@traced(category="table", args=("table_name",))
 def process_table(table_name: str, table_index: int, total_tables: int, checkpoint: Dict):
     """Process a single table with retry logic"""
     print(f"\n  [{table_index}/{total_tables}] Processing {table_name}...", flush=True)
@@ -1226,10 +1975,8 @@ def process_table(table_name: str, table_index: int, total_tables: int, checkpoi
                 raise Exception("Failed to get PostgreSQL connection")
             
             try:
-                # Reset checkpoint for this table
-                checkpoint["current_table"] = table_name
-                checkpoint["current_table_index"] = table_index
-                checkpoint["last_record_id"] = 0
+                # Table workers run in parallel, so only ever move the index forward
+                checkpoint["current_table_index"] = max(checkpoint.get("current_table_index", 0), table_index)
                 save_checkpoint(checkpoint)
                     
                 # Check if table has data first
@@ -1246,17 +1993,40 @@ def process_table(table_name: str, table_index: int, total_tables: int, checkpoi
                         col = row[0].decode() if isinstance(row[0], bytes) else row[0]
                         columns.append(col)
                     mysql_cursor.close()
-                    create_postgres_table(pg_conn, table_name, columns, mysql_conn)
+                    create_postgres_table(pg_conn, table_name, columns, mysql_conn, checkpoint)
+                elif RANGE_WORKERS > 1 and table_count >= RANGE_MIN_ROWS:
+                    print(f"       Table has {table_count:,} records, migrating by key range...", flush=True)
+                    columns, column_types = get_export_columns(mysql_conn, table_name)
+                    create_postgres_table(pg_conn, table_name, columns, mysql_conn, checkpoint)
+                    
+                    with table_seconds.labels(stage="transfer", table=table_name).time(), \
+                            memory_stage(f"transfer {table_name}"):
+                        record_count = migrate_table_ranges(mysql_conn, pg_conn, table_name, columns,
+                                                            column_types, table_count, checkpoint)
+                elif TRANSFER_MODE == "stream":
+                    print(f"       Table has {table_count:,} records, streaming...", flush=True)
+                    columns, column_types = get_export_columns(mysql_conn, table_name)
+                    create_postgres_table(pg_conn, table_name, columns, mysql_conn, checkpoint)
+                    
+                    # Pipe MySQL rows straight into COPY
+                    with table_seconds.labels(stage="transfer", table=table_name).time(), \
+                            memory_stage(f"transfer {table_name}"):
+                        record_count = stream_table_to_postgres(mysql_conn, pg_conn, table_name, columns,
+                                                                column_types, checkpoint)
                 else:
                     print(f"       Table has {table_count:,} records, exporting...", flush=True)
                     # Export to CSV (chunked)
-                    csv_file, columns, record_count = export_table_chunked(mysql_conn, table_name, checkpoint)
+                    with table_seconds.labels(stage="export", table=table_name).time(), \
+                            memory_stage(f"export {table_name}"):
+                        csv_file, columns, record_count = export_table_chunked(mysql_conn, table_name, checkpoint)
                     
                     # Create PostgreSQL table
-                    create_postgres_table(pg_conn, table_name, columns, mysql_conn)
+                    create_postgres_table(pg_conn, table_name, columns, mysql_conn, checkpoint)
                     
                     # Import CSV
-                    import_csv_to_postgres_chunked(pg_conn, table_name, csv_file, columns)
+                    with table_seconds.labels(stage="import", table=table_name).time(), \
+                            memory_stage(f"import {table_name}"):
+                        import_csv_to_postgres_chunked(pg_conn, table_name, csv_file, columns)
                 
                 # Find and decrypt encrypted columns
                 mysql_cursor = mysql_conn.cursor()
@@ -1296,7 +2066,8 @@ def process_table(table_name: str, table_index: int, total_tables: int, checkpoi
                             
                             if encrypted_count > 0:
                                 print(f"       Column {col} has {encrypted_count:,} encrypted records", flush=True)
-                                decrypt_and_transform_chunked(mysql_conn, pg_conn, table_name, col, checkpoint)
+                                with memory_stage(f"decrypt {table_name}.{col}"):
+                                    decrypt_and_transform_chunked(mysql_conn, pg_conn, table_name, col, checkpoint)
                             else:
                                 print(f"       Column {col} exists but has no encrypted data", flush=True)
                     else:
@@ -1318,7 +2089,8 @@ def process_table(table_name: str, table_index: int, total_tables: int, checkpoi
                                     if encrypted_count > 0:
                                         print(f"       Attempting to decrypt {col_name} ({encrypted_count:,} records)...", flush=True)
                                         try:
-                                            decrypt_and_transform_chunked(mysql_conn, pg_conn, table_name, col_name, checkpoint)
+                                            with memory_stage(f"decrypt {table_name}.{col_name}"):
+                                                decrypt_and_transform_chunked(mysql_conn, pg_conn, table_name, col_name, checkpoint)
                                             
                                             # After successful decryption, drop the encrypted column from PostgreSQL
                                             try:
@@ -1382,9 +2154,13 @@ def process_table(table_name: str, table_index: int, total_tables: int, checkpoi
                 
                 # Mark table as processed
                 checkpoint["processed_tables"].append(table_name)
-                checkpoint["current_table"] = None
-                checkpoint["last_record_id"] = 0
+                checkpoint.pop(f"{table_name}_export_last_key", None)
+                checkpoint.pop(f"{table_name}_export_rows", None)
+                checkpoint.pop(f"{table_name}_export_bytes", None)
+                checkpoint.pop(f"{table_name}_ranges", None)
+                forget_decrypt_positions(checkpoint, table_name, [col for col, _ in all_columns])
                 save_checkpoint(checkpoint)
+                registry.write_textfile()  # keep the textfile current during long runs
                 
                 if table_count == 0:
                     print(f"   Completed {table_name} (0 records - empty table)", flush=True)
@@ -1438,6 +2214,7 @@ def process_table(table_name: str, table_index: int, total_tables: int, checkpoi
     return False
 
 
+@profiled("migrate")
 def main():
     """Main migration function with checkpoint resume"""
     import time as time_module
@@ -1452,6 +2229,10 @@ def main():
     # Show performance configuration
     print_performance_config()
     
+    # Fork the AES workers while this is still the only thread
+    if DECRYPT_ENGINE == "python":
+        get_pose_decryptor()
+    
     # Wait for databases and initialize connection pools
     try:
         init_connection_pools()
@@ -1745,7 +2526,8 @@ def main():
                         
                         if encrypted_count > 0:
                             try:
-                                decrypt_and_transform_chunked(mysql_conn, pg_conn, table_name, col, checkpoint)
+                                with memory_stage(f"decrypt {table_name}.{col}"):
+                                    decrypt_and_transform_chunked(mysql_conn, pg_conn, table_name, col, checkpoint)
                                 
                                 # Verify decrypted columns were added
                                 pg_cursor = pg_conn.cursor()
@@ -1873,7 +2655,17 @@ def main():
     print(f"     Connection Pools: MySQL={MYSQL_POOL_SIZE}, PostgreSQL={POSTGRES_POOL_SIZE}", flush=True)
     print("=" * 80, flush=True)
     
+    metrics_file = registry.write_textfile()
+    if metrics_file:
+        print(f"    Metrics written to {metrics_file}", flush=True)
+    trace_file = write_trace()
+    if trace_file:
+        print(f"    Trace written to {trace_file}", flush=True)
+    
     # Cleanup
+    if _pose_decryptor is not None:
+        _pose_decryptor.close()
+    _checkpoint_store.close()
     if mysql_pool:
         try:
             mysql_pool._remove_connections()
@@ -9,6 +9,8 @@ from psycopg2.extras import RealDictCursor
 import os
 import math
 
+from progress import ProgressReporter
+
 MYSQL_CONFIG = {
     'host': os.getenv('MYSQL_HOST', 'mysql'),
     'port': int(os.getenv('MYSQL_PORT', '3306')),
@@ -172,9 +174,12 @@ def populate_consolidated_locations():
         # Insert into PostgreSQL
         inserted = 0
         skipped = 0
+        progress = ProgressReporter("Consolidated locations", total=len(location_map),
+                                    unit="locations", indent="   ")
         for loc_name, loc_data in location_map.items():
             if len(loc_data['coordinates']) < 3:
                 skipped += 1
+                progress.update(skipped=1)
                 continue
             
             try:
@@ -214,21 +219,17 @@ def populate_consolidated_locations():
                     ))
                     
                     inserted += 1
-                    if inserted % 10 == 0:
-                        print(f"   ✅ Inserted {inserted}/{len(location_map)} locations...")
+                    progress.update()
                         
                 except Exception as e:
-                    print(f"   ⚠️ Failed to insert {loc_name}: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    progress.error(f"insert {loc_name}: {e}")
                     continue
                     
             except Exception as e:
-                print(f"   ⚠️ Failed to process {loc_name}: {e}")
-                import traceback
-                traceback.print_exc()
+                progress.error(f"process {loc_name}: {e}")
                 continue
         
+        progress.finish()
         print(f"✅ Inserted {inserted} consolidated locations")
         print(f"⚠️ Skipped {skipped} locations (need >= 3 points)")
         
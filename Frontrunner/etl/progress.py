@@ -0,0 +1,133 @@
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, TextIO
+
+from metrics import etl_items
+
+DEFAULT_INTERVAL = float(os.getenv("PROGRESS_INTERVAL", "5"))  # seconds between lines
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m{seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m"
+
+
+class ProgressReporter:
+    """Aggregates loop progress and prints at most one line per interval
+
+    Replaces per-item print() calls in ETL loops. update() and error() only
+    bump counters; a status line with rate, ETA, extra counters and the error
+    count is written when ``interval`` seconds have passed, and finish()
+    (or leaving the ``with`` block) writes a final summary with the first few
+    error messages. With ``stage`` set, items and errors are also counted in
+    the metrics registry under that stage label.
+
+        with ProgressReporter("roads", total=len(roads)) as progress:
+            for road in roads:
+                ...
+                progress.update(segments=len(segments))
+    """
+
+    def __init__(self, label: str, total: Optional[int] = None, unit: str = "items",
+                 interval: Optional[float] = None, stream: Optional[TextIO] = None,
+                 indent: str = "", max_error_samples: int = 5, stage: Optional[str] = None):
+        self.label = label
+        self.total = total
+        self.unit = unit
+        self.interval = DEFAULT_INTERVAL if interval is None else interval
+        self.stream = stream or sys.stdout
+        self.indent = indent
+        self.max_error_samples = max_error_samples
+        self._ok_metric = etl_items.labels(stage=stage, status="success") if stage else None
+        self._error_metric = etl_items.labels(stage=stage, status="error") if stage else None
+        self.count = 0
+        self.errors = 0
+        self.counters: Dict[str, int] = {}
+        self.error_samples: List[str] = []
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._next_emit = self._started + self.interval
+        self._finished = False
+
+    def __enter__(self) -> "ProgressReporter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish()
+        return False
+
+    def update(self, n: int = 1, **counters: int):
+        """Record ``n`` completed items plus any named counters"""
+        with self._lock:
+            self.count += n
+            if self._ok_metric is not None:
+                self._ok_metric.inc(n)
+            for name, value in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            self._maybe_emit()
+
+    def error(self, message: Optional[str] = None, n: int = 1, advance: bool = True):
+        """Record ``n`` failed items, keeping the first few messages
+
+        Pass ``advance=False`` for failures inside an item (e.g. one bad
+        segment of a road) that should not move the item count.
+        """
+        with self._lock:
+            if advance:
+                self.count += n
+            self.errors += n
+            if self._error_metric is not None:
+                self._error_metric.inc(n)
+            if message is not None and len(self.error_samples) < self.max_error_samples:
+                self.error_samples.append(message)
+            self._maybe_emit()
+
+    def _maybe_emit(self):
+        now = time.monotonic()
+        if now >= self._next_emit:
+            self._next_emit = now + self.interval
+            self._write(self._status_line(now))
+
+    def _status_line(self, now: float) -> str:
+        elapsed = max(now - self._started, 1e-9)
+        rate = self.count / elapsed
+        parts = [f"{self.label}: {self.count:,}"]
+        if self.total:
+            parts[0] += f"/{self.total:,} {self.unit} ({self.count / self.total * 100:.1f}%)"
+        else:
+            parts[0] += f" {self.unit}"
+        parts.append(f"{rate:,.1f}/s")
+        if self.total and rate > 0 and self.count < self.total:
+            parts.append(f"ETA {_format_duration((self.total - self.count) / rate)}")
+        for name, value in self.counters.items():
+            parts.append(f"{name}={value:,}")
+        if self.errors:
+            parts.append(f"errors={self.errors:,}")
+        return " | ".join(parts)
+
+    def _write(self, line: str):
+        self.stream.write(f"{self.indent}{line}\n")
+        self.stream.flush()
+
+    def finish(self):
+        """Write the summary line once"""
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+            now = time.monotonic()
+            line = " | ".join(part for part in self._status_line(now).split(" | ")
+                              if not part.startswith("ETA "))
+            self._write(f"{line} | done in {_format_duration(now - self._started)}")
+            for message in self.error_samples:
+                self._write(f"  error: {message}")
+            if self.errors > len(self.error_samples):
+                self._write(f"  ... {self.errors - len(self.error_samples):,} more errors")
@@ -0,0 +1,223 @@
+import atexit
+import functools
+import glob
+import inspect
+import json
+import multiprocessing.util
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+TRACE_ENV = "DISPATCH_TRACE"
+
+
+class _NullSpan:
+    """Shared no-op returned by span() while tracing is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args: Any):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.add_complete(self.name, self.category, self.start, end, self.args)
+        return False
+
+    def set(self, **args: Any):
+        """Attach values known only once the span is running (e.g. row counts)"""
+        self.args.update(args)
+
+
+class Tracer:
+    """Collects Chrome trace events for one process
+
+    Spans become complete ("X") events with pid/tid, so nested spans on a
+    thread stack up in chrome://tracing or Perfetto as a flame chart.
+    Timestamps are wall-clock microseconds taken from perf_counter, which
+    lines up spans from different processes.
+
+    Forked workers (multiprocessing pools) start with an empty buffer and
+    write ``<path>.<pid>.part`` when they exit; the parent merges those
+    parts into ``path`` on write().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.events: List[Dict[str, Any]] = []
+        self._thread_names: Dict[int, str] = {}
+        self._pid = os.getpid()
+        self._offset_ns = time.time_ns() - time.perf_counter_ns()
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def add_complete(self, name: str, category: str, start_ns: int, end_ns: int,
+                     args: Optional[Dict[str, Any]] = None):
+        tid = threading.get_ident()
+        if tid not in self._thread_names:
+            self._thread_names[tid] = threading.current_thread().name
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start_ns + self._offset_ns) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self._pid,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)  # list.append is atomic under the GIL
+
+    def _metadata(self) -> List[Dict[str, Any]]:
+        events = [{"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0,
+                   "args": {"name": f"{os.path.basename(sys.argv[0]) or 'python'} ({self._pid})"}}]
+        for tid, thread_name in list(self._thread_names.items()):
+            events.append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+                           "args": {"name": thread_name}})
+        return events
+
+    def _after_fork(self):
+        self.events = []
+        self._thread_names = {}
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def write_part(self):
+        """Dump this worker's events next to the main trace for the parent to merge"""
+        if not self.events:
+            return
+        with open(f"{self.path}.{self._pid}.part", "w", encoding="utf-8") as f:
+            json.dump(self._metadata() + self.events, f, default=str)
+
+    def write(self, path: Optional[str] = None) -> str:
+        """Write everything recorded so far, plus finished worker parts, as trace JSON"""
+        path = path or self.path
+        with self._lock:
+            events = self._metadata() + list(self.events)
+            for part in glob.glob(f"{glob.escape(self.path)}.*.part"):
+                try:
+                    with open(part, encoding="utf-8") as f:
+                        events.extend(json.load(f))
+                    os.unlink(part)
+                except (OSError, ValueError):
+                    continue
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+            os.replace(tmp_path, path)
+        return path
+
+
+_tracer: Optional[Tracer] = None
+_root_pid: Optional[int] = None
+
+
+def enable(path: str) -> Tracer:
+    """Start recording spans to ``path``; written at exit or on write_trace()"""
+    global _tracer, _root_pid
+    if _tracer is None:
+        _tracer = Tracer(path)
+        _root_pid = os.getpid()
+        atexit.register(_write_at_exit)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_after_fork)
+        # multiprocessing children leave via os._exit(), which skips atexit
+        multiprocessing.util.register_after_fork(_tracer, _register_part_flush)
+    else:
+        _tracer.path = path
+    return _tracer
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+def _after_fork():
+    if _tracer is not None:
+        _tracer._after_fork()
+
+
+def _register_part_flush(tracer: Tracer):
+    multiprocessing.util.Finalize(tracer, tracer.write_part, exitpriority=0)
+
+
+def _write_at_exit():
+    if _tracer is None:
+        return
+    if os.getpid() == _root_pid and multiprocessing.parent_process() is None:
+        _tracer.write()
+    else:
+        _tracer.write_part()
+
+
+def write_trace(path: Optional[str] = None) -> Optional[str]:
+    """Write the trace now; returns the path, or None when tracing is off"""
+    return _tracer.write(path) if _tracer is not None else None
+
+
+def span(name: str, category: str = "dispatch", **args: Any):
+    """Time a block as a trace span; a shared no-op when tracing is off
+
+        with span("pg_insert", table=table_name, rows=len(batch)):
+            ...
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _Span(_tracer, name, category, args)
+
+
+def traced(name: Optional[str] = None, category: str = "dispatch",
+           args: Sequence[str] = ()) -> Callable:
+    """Decorator form of span(); defaults to the function's qualified name
+
+    ``args`` names parameters to record on the span, e.g.
+    ``@traced(args=("table_name",))``.
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+        signature = inspect.signature(func) if args else None
+
+        @functools.wraps(func)
+        def wrapper(*call_args, **call_kwargs):
+            if _tracer is None:
+                return func(*call_args, **call_kwargs)
+            span_args = {}
+            if signature is not None:
+                bound = signature.bind_partial(*call_args, **call_kwargs).arguments
+                span_args = {arg: bound[arg] for arg in args if arg in bound}
+            with _Span(_tracer, span_name, category, span_args):
+                return func(*call_args, **call_kwargs)
+        return wrapper
+    return decorator
+
+
+if os.getenv(TRACE_ENV):
+    enable(os.environ[TRACE_ENV])
@@ -17,6 +17,11 @@ class DatabaseConfig:
     max_overflow: int = 20
     pool_timeout: int = 30
     pool_recycle: int = 3600
+    statement_cache_size: int = 64
+    query_cache_size: int = 256
+    query_cache_ttl: float = 30.0
+    slow_query_threshold: float = 0.5
+    slow_query_explain: bool = True
 
 @dataclass
 class SpatialConfig:
@@ -41,6 +46,7 @@ class Config:
         self.base_dir = Path(__file__).parent.parent
         self.data_dir = self.base_dir / "Dataset"
         self.logs_dir = self.base_dir / "logs"
+        self.cache_dir = Path(os.getenv("DISPATCH_CACHE_DIR", self.base_dir / ".cache"))
         try:
             self.logs_dir.mkdir(parents=True, exist_ok=True)
         except (FileExistsError, OSError):
@@ -57,7 +63,12 @@ class Config:
             pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
             max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
             pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
-            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "3600"))
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "3600")),
+            statement_cache_size=int(os.getenv("DB_STATEMENT_CACHE_SIZE", "64")),
+            query_cache_size=int(os.getenv("DB_QUERY_CACHE_SIZE", "256")),
+            query_cache_ttl=float(os.getenv("DB_QUERY_CACHE_TTL", "30")),
+            slow_query_threshold=float(os.getenv("DB_SLOW_QUERY_SECONDS", "0.5")),
+            slow_query_explain=os.getenv("DB_SLOW_QUERY_EXPLAIN", "true").lower() == "true"
         )
         
         self.spatial = SpatialConfig(
@@ -12,7 +12,9 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.core.profiling import profiled
 from src.models import DatabaseManager
+from src.models.table_stats import TableStatistics
 
 
 def suppress_logging():
@@ -40,6 +42,35 @@ def suppress_logging():
     return NullWriter()
 
 
+class StreamedRows:
+    """Table rows pulled lazily from a server-side cursor as the view scrolls"""
+
+    def __init__(self, batches, prefetch: int):
+        self._batches = batches
+        self._rows = []
+        self.columns: List[str] = []
+        self.exhausted = False
+        self.fetch_until(prefetch)
+
+    def fetch_until(self, count: int):
+        while not self.exhausted and len(self._rows) < count:
+            batch = next(self._batches, None)
+            if batch is None:
+                self.exhausted = True
+                break
+            self.columns = list(batch.keys())
+            self._rows.extend(zip(*batch.values()))
+
+    def close(self):
+        self._batches.close()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        return self._rows[index]
+
+
 suppress_logging()
 
 
@@ -138,9 +169,24 @@ class Panel:
 
 
 class DatabaseCommander:
+    VIEW_BATCH_SIZE = 500
+    STATS_REFRESH_INTERVAL = 30.0
+    REDRAW_INTERVAL_MS = 500
+    DASHBOARD_TABLES = [
+        "infrastructure",
+        "roads",
+        "lane_segments",
+        "lane_conditions",
+        "lane_connectors",
+    ]
+
     def __init__(self, stdscr):
         self.stdscr = stdscr
         self.db_manager = DatabaseManager()
+        self.table_stats = TableStatistics(
+            self.db_manager, self.DASHBOARD_TABLES, self.STATS_REFRESH_INTERVAL
+        )
+        self._stats_version = -1
 
         curses.start_color()
         curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLUE)  # Normal
@@ -179,62 +225,53 @@ class DatabaseCommander:
         self.right_panel.set_items(operations)
 
         self.refresh_statistics()
+        self.table_stats.start()
 
     def refresh_statistics(self):
-        stats = []
-
-        try:
-            key_tables = [
-                "infrastructure",
-                "roads",
-                "lane_segments",
-            ]
-            total_records = 0
-
-            for table in key_tables:
-                try:
-                    with self.db_manager.get_cursor() as conn:
-                        with conn.cursor() as cursor:
-                            cursor.execute(f"SELECT COUNT(*) as count FROM {table}")
-                            result = cursor.fetchone()
-                            count = result["count"] if result else 0
-                            total_records += count
-                            stats.append(f"{table:<20} {count:>8,}")
-                except Exception:
-                    stats.append(f"{table:<20} {'ERROR':>8}")
-
-            stats.insert(0, "=== KEY TABLES ===")
-            stats.append("")
-            stats.append(f"{'TOTAL RECORDS':<20} {total_records:>8,}")
-            stats.append("")
-
-            try:
-                with self.db_manager.get_cursor() as conn:
-                    with conn.cursor() as cursor:
-                        cursor.execute("SELECT COUNT(*) as count FROM lane_conditions")
-                        lane_cond = cursor.fetchone()["count"]
+        """Redraw the statistics panel from the latest background snapshot"""
+        snapshot = self.table_stats.snapshot()
+        self._stats_version = snapshot["version"]
+        counts = snapshot["counts"]
+
+        if snapshot["updated_at"] is None:
+            if snapshot["error"]:
+                stats = ["ERROR getting statistics", snapshot["error"]]
+            else:
+                stats = ["Loading statistics..."]
+            self.left_panel.set_items(stats)
+            return
 
-                stats.append("=== GPS SYSTEM ===")
-                stats.append(f"{'lane_conditions':<20} {lane_cond:>8,}")
-                stats.append("")
+        stats = []
+        total_records = 0
 
-            except Exception:
-                pass
+        for table in ["infrastructure", "roads", "lane_segments"]:
+            count = counts.get(table)
+            if count is None:
+                stats.append(f"{table:<20} {'ERROR':>8}")
+            else:
+                total_records += count
+                stats.append(f"{table:<20} {count:>8,}")
 
-            try:
-                with self.db_manager.get_cursor() as conn:
-                    with conn.cursor() as cursor:
-                        cursor.execute("SELECT COUNT(*) as count FROM lane_connectors")
-                        connectors = cursor.fetchone()["count"]
+        stats.insert(0, "=== KEY TABLES ===")
+        stats.append("")
+        stats.append(f"{'TOTAL RECORDS':<20} {total_records:>8,}")
+        stats.append("")
 
-                stats.append("=== CONNECTIONS ===")
-                stats.append(f"{'lane_connectors':<20} {connectors:>8,}")
+        if counts.get("lane_conditions") is not None:
+            stats.append("=== GPS SYSTEM ===")
+            stats.append(f"{'lane_conditions':<20} {counts['lane_conditions']:>8,}")
+            stats.append("")
 
-            except Exception:
-                pass
+        if counts.get("lane_connectors") is not None:
+            stats.append("=== CONNECTIONS ===")
+            stats.append(f"{'lane_connectors':<20} {counts['lane_connectors']:>8,}")
+            stats.append("")
 
-        except Exception as e:
-            stats = ["ERROR getting statistics", str(e)]
+        age = int(time.time() - snapshot["updated_at"])
+        kind = "exact" if snapshot["exact"] else "estimated"
+        stats.append(f"({kind}, {age}s ago)")
+        if snapshot["error"]:
+            stats.append(f"Refresh failed: {snapshot['error']}")
 
         self.left_panel.set_items(stats)
 
@@ -259,7 +296,7 @@ class DatabaseCommander:
 
     def draw_footer(self):
         footer_y = self.height - 1
-        nav_text = "Tab: Switch Panel | Enter: Select | Q: Exit"
+        nav_text = "Tab: Switch Panel | Enter: Select | R: Exact Counts | Q: Exit"
         try:
             self.stdscr.addstr(
                 footer_y,
@@ -332,17 +369,18 @@ class DatabaseCommander:
             "lane_conditions",
         ]
 
+        try:
+            counts = self.table_stats.estimate_counts(tables)
+        except Exception:
+            counts = {}
+
         table_list = []
         for table in tables:
-            try:
-                with self.db_manager.get_cursor() as conn:
-                    with conn.cursor() as cursor:
-                        cursor.execute(f"SELECT COUNT(*) as count FROM {table}")
-                        result = cursor.fetchone()
-                        count = result["count"] if result else 0
-                        table_list.append(f"{table:<25} {count:>10,}")
-            except Exception:
+            count = counts.get(table)
+            if count is None:
                 table_list.append(f"{table:<25} {'ERROR':>10}")
+            else:
+                table_list.append(f"{table:<25} {'~' + format(count, ','):>10}")
 
         return table_list
 
@@ -350,93 +388,91 @@ class DatabaseCommander:
         table_name = table_info.split()[0]
 
         try:
-            with self.db_manager.get_cursor() as conn:
-                with conn.cursor() as cursor:
-                    if table_name == "infrastructure":
-                        cursor.execute(
-                            """
-                            SELECT location_id, location_name, pit_id, region_id, unit_id, 
-                                   sign_id, signpost, shoptype, gpstype, radius_m, elevation_m,
-                                   ST_AsText(center_point) as center_point,
-                                   ST_AsText(geometry) as geometry
-                            FROM infrastructure
-                        """
-                        )
-                    elif table_name == "lane_segments":
-                        cursor.execute(
-                            """
-                            SELECT lane_id, road_id, lane_name, lane_width_m, 
-                                   weight_limit_tonnes, length_m,
-                                   time_empty_seconds, time_loaded_seconds, is_closed,
-                                   ST_AsText(geometry) as geometry,
-                                   ST_AsText(ST_StartPoint(geometry)) as start_point,
-                                   ST_AsText(ST_EndPoint(geometry)) as end_point,
-                                   created_at, last_modified
-                            FROM lane_segments
-                        """
-                        )
-
-                    elif table_name == "safety_zones":
-                        cursor.execute(
-                            """
-                            SELECT zone_id, zone_name, zone_type, is_active,
-                                   effective_start, effective_end,
-                                   ST_AsText(geometry) as geometry,
-                                   created_at, last_modified
-                            FROM safety_zones
-                        """
-                        )
-                    elif table_name == "roads":
-                        cursor.execute(
-                            """
-                            SELECT r.road_id, r.road_name, r.start_location_id, r.end_location_id,
-                                   COALESCE(SUM(ls.time_empty_seconds), 0) as total_time_empty,
-                                   COALESCE(SUM(ls.time_loaded_seconds), 0) as total_time_loaded,
-                                   COALESCE(SUM(ST_Length(ls.geometry) * 111000), 0) as total_distance_m,
-                                   COUNT(ls.lane_id) as lane_count,
-                                   r.created_at, r.last_modified
-                            FROM roads r
-                            LEFT JOIN lane_segments ls ON r.road_id = ls.road_id
-                            GROUP BY r.road_id, r.road_name, r.start_location_id, r.end_location_id, r.created_at, r.last_modified
-                            ORDER BY r.road_id
-                        """
-                        )
-                    elif table_name == "lane_connectors":
-                        cursor.execute(
-                            """
-                            SELECT lc.connector_id, lc.from_lane_id, lc.to_lane_id, 
-                                   STRING_AGG(lcm.movement_type, ', ') as movement_types, 
-                                   lc.is_active,
-                                   ls_from.road_id as from_road_id,
-                                   ls_to.road_id as to_road_id,
-                                   lc.effective_start, lc.effective_end
-                            FROM lane_connectors lc 
-                            LEFT JOIN lane_connector_movements lcm ON lc.connector_id = lcm.connector_id 
-                            LEFT JOIN lane_segments ls_from ON lc.from_lane_id = ls_from.lane_id
-                            LEFT JOIN lane_segments ls_to ON lc.to_lane_id = ls_to.lane_id
-                            GROUP BY lc.connector_id, lc.from_lane_id, lc.to_lane_id, lc.is_active,
-                                     ls_from.road_id, ls_to.road_id, lc.effective_start, lc.effective_end
-                            ORDER BY lc.connector_id
-                        """
-                        )
-                    else:
-                        cursor.execute(f"SELECT * FROM {table_name}")
-                    rows = cursor.fetchall()
-
-            if not rows:
-                self.show_dialog("TABLE INFO", f"Table '{table_name}' is empty")
-                return
+            if table_name == "infrastructure":
+                query = """
+                    SELECT location_id, location_name, pit_id, region_id, unit_id, 
+                           sign_id, signpost, shoptype, gpstype, radius_m, elevation_m,
+                           ST_AsText(center_point) as center_point,
+                           ST_AsText(geometry) as geometry
+                    FROM infrastructure
+                """
+            elif table_name == "lane_segments":
+                query = """
+                    SELECT lane_id, road_id, lane_name, lane_width_m, 
+                           weight_limit_tonnes, length_m,
+                           time_empty_seconds, time_loaded_seconds, is_closed,
+                           ST_AsText(geometry) as geometry,
+                           ST_AsText(ST_StartPoint(geometry)) as start_point,
+                           ST_AsText(ST_EndPoint(geometry)) as end_point,
+                           created_at, last_modified
+                    FROM lane_segments
+                """
+
+            elif table_name == "safety_zones":
+                query = """
+                    SELECT zone_id, zone_name, zone_type, is_active,
+                           effective_start, effective_end,
+                           ST_AsText(geometry) as geometry,
+                           created_at, last_modified
+                    FROM safety_zones
+                """
+            elif table_name == "roads":
+                query = """
+                    SELECT r.road_id, r.road_name, r.start_location_id, r.end_location_id,
+                           COALESCE(SUM(ls.time_empty_seconds), 0) as total_time_empty,
+                           COALESCE(SUM(ls.time_loaded_seconds), 0) as total_time_loaded,
+                           COALESCE(SUM(ST_Length(ls.geometry) * 111000), 0) as total_distance_m,
+                           COUNT(ls.lane_id) as lane_count,
+                           r.created_at, r.last_modified
+                    FROM roads r
+                    LEFT JOIN lane_segments ls ON r.road_id = ls.road_id
+                    GROUP BY r.road_id, r.road_name, r.start_location_id, r.end_location_id, r.created_at, r.last_modified
+                    ORDER BY r.road_id
+                """
+            elif table_name == "lane_connectors":
+                query = """
+                    SELECT lc.connector_id, lc.from_lane_id, lc.to_lane_id, 
+                           STRING_AGG(lcm.movement_type, ', ') as movement_types, 
+                           lc.is_active,
+                           ls_from.road_id as from_road_id,
+                           ls_to.road_id as to_road_id,
+                           lc.effective_start, lc.effective_end
+                    FROM lane_connectors lc 
+                    LEFT JOIN lane_connector_movements lcm ON lc.connector_id = lcm.connector_id 
+                    LEFT JOIN lane_segments ls_from ON lc.from_lane_id = ls_from.lane_id
+                    LEFT JOIN lane_segments ls_to ON lc.to_lane_id = ls_to.lane_id
+                    GROUP BY lc.connector_id, lc.from_lane_id, lc.to_lane_id, lc.is_active,
+                             ls_from.road_id, ls_to.road_id, lc.effective_start, lc.effective_end
+                    ORDER BY lc.connector_id
+                """
+            else:
+                query = f"SELECT * FROM {table_name}"
+            rows = StreamedRows(
+                self.db_manager.stream(query, batch_size=self.VIEW_BATCH_SIZE, columnar=True),
+                self.VIEW_BATCH_SIZE,
+            )
+            try:
+                if not len(rows):
+                    self.show_dialog("TABLE INFO", f"Table '{table_name}' is empty")
+                    return
 
-            self.show_table_data(table_name, rows)
+                self.show_table_data(table_name, rows, columns=rows.columns)
+            finally:
+                rows.close()
 
         except Exception as e:
             self.show_dialog("ERROR", f"Error viewing table:\n{str(e)}", is_error=True)
 
-    def show_table_data(self, table_name: str, rows: List[Dict]):
-        if not rows:
+    def show_table_data(self, table_name: str, rows: List[Dict],
+                        columns: Optional[List[str]] = None):
+        if not len(rows):
             return
 
-        all_columns = list(rows[0].keys()) if hasattr(rows[0], "keys") else []
+        if columns is not None:
+            all_columns = list(columns)
+        else:
+            all_columns = list(rows[0].keys()) if hasattr(rows[0], "keys") else []
+        column_index = {col: i for i, col in enumerate(all_columns)}
         columns = [
             col for col in all_columns if col not in ["created_at", "last_modified"]
         ]
@@ -472,16 +508,19 @@ class DatabaseCommander:
                 pass
 
             visible_height = self.height - 7
+            if isinstance(rows, StreamedRows):
+                # Keep one row beyond the window loaded so DOWN can advance
+                rows.fetch_until(row_scroll + visible_height + 1)
             visible_rows = rows[row_scroll : row_scroll + visible_height]
 
             for i, row in enumerate(visible_rows):
                 y = 4 + i
                 row_data = ""
 
-                if hasattr(row, "keys"):
+                if hasattr(row, "keys") or column_index:
                     values = []
                     for col in visible_columns:
-                        val = str(row[col])
+                        val = str(row[col] if hasattr(row, "keys") else row[column_index[col]])
                         if col in ["geometry", "center_point"] and len(val) > 100:
                             val = val[:97] + "..."
                         values.append(val[: col_width - 1])
@@ -504,6 +543,8 @@ class DatabaseCommander:
 
             try:
                 status = f"Row {row_cursor + 1}/{len(rows)}"
+                if not getattr(rows, "exhausted", True):
+                    status += "+"
                 if col_scroll > 0:
                     status += f" | Col {col_scroll + 1}/{len(columns)}"
                 self.stdscr.addstr(self.height - 1, 2, status, curses.color_pair(1))
@@ -559,6 +600,8 @@ class DatabaseCommander:
                 
                 # Run the complete ETL process
                 success = run_full_etl()
+                self.db_manager.invalidate_cache()
+                self.table_stats.request_refresh()
 
             finally:
                 sys.stdout = old_stdout
@@ -708,6 +751,10 @@ class DatabaseCommander:
                     
                     conn.commit()
 
+            # Deletes may cascade, so drop every cached count
+            self.db_manager.invalidate_cache()
+            self.table_stats.request_refresh(exact=True)
+
             self.show_dialog(
                 "PURGE SUCCESS", "All data purged successfully\nDatabase is now empty"
             )
@@ -796,31 +843,25 @@ class DatabaseCommander:
                         else "Unknown"
                     )
 
-            total_records = 0
-            table_count = 0
-
-            key_tables = [
-                "infrastructure",
-                "roads",
-                "lane_segments",
+            # Counts come from the background snapshot; exact ones are fetched off this thread
+            snapshot = self.table_stats.snapshot()
+            if not snapshot["exact"]:
+                self.table_stats.request_refresh(exact=True)
+            counts = [
+                snapshot["counts"].get(table)
+                for table in ["infrastructure", "roads", "lane_segments"]
             ]
-            for table in key_tables:
-                try:
-                    with self.db_manager.get_cursor() as conn:
-                        with conn.cursor() as cursor:
-                            cursor.execute(f"SELECT COUNT(*) as count FROM {table}")
-                            result = cursor.fetchone()
-                            count = result["count"] if result else 0
-                            total_records += count
-                            if count > 0:
-                                table_count += 1
-                except:
-                    pass
+            total_records = sum(count or 0 for count in counts)
+            table_count = sum(1 for count in counts if count)
 
             status = "Database: ONLINE\n"
             status += f"PostgreSQL: {version}\n"
-            status += f"Active Tables: {table_count}\n"
-            status += f"Total Records: {total_records:,}"
+            if snapshot["updated_at"] is None:
+                status += "Record counts: loading..."
+            else:
+                kind = "exact" if snapshot["exact"] else "estimated"
+                status += f"Active Tables: {table_count}\n"
+                status += f"Total Records: {total_records:,} ({kind})"
 
             self.show_dialog("DATABASE STATUS", status)
 
@@ -838,9 +879,15 @@ class DatabaseCommander:
 
             self.stdscr.refresh()
 
+            # Wake up periodically so background statistics get redrawn
+            self.stdscr.timeout(self.REDRAW_INTERVAL_MS)
             key = self.stdscr.getch()
+            self.stdscr.timeout(-1)
 
-            if key == curses.KEY_UP:
+            if key == -1:
+                if self.table_stats.snapshot()["version"] != self._stats_version:
+                    self.refresh_statistics()
+            elif key == curses.KEY_UP:
                 self.active_panel.move_up()
             elif key == curses.KEY_DOWN:
                 self.active_panel.move_down()
@@ -866,10 +913,15 @@ class DatabaseCommander:
                         self.show_db_status()
                     elif "Exit" in selected:
                         break
+            elif key in [ord("r"), ord("R")]:
+                self.table_stats.request_refresh(exact=True)
             elif key in [ord("q"), ord("Q")]:
                 break
 
+        self.table_stats.stop()
+
 
+@profiled("commander")
 def main(stdscr):
     commander = DatabaseCommander(stdscr)
     commander.run()
@@ -9,6 +9,7 @@ from pathlib import Path
 
 sys.path.append('/app')
 
+from src.core import ProgressReporter
 from src.models import DatabaseManager
 from src.models.coordinate_transform import transform_coordinates_batch
 
@@ -335,6 +336,8 @@ def create_bezier_roads():
     
     # Create proper lane segments for each curve
     inserted_count = 0
+    progress = ProgressReporter("Lane segments", total=len(bezier_curves_ultimate), unit="roads",
+                                stage="lane_segments")
     with db.get_cursor() as conn:
         with conn.cursor() as cursor:
             for curve in bezier_curves_ultimate:
@@ -374,14 +377,15 @@ def create_bezier_roads():
                         ))
                         inserted_count += cursor.rowcount
                     
-                    print(f"✅ Created {len(segments)} segments for road {curve['road_id']} ({curve['direction']})")
+                    progress.update(segments=len(segments))
                         
                 except Exception as e:
-                    print(f"❌ Error inserting segments for road {curve['road_id']}: {e}")
+                    progress.error(f"road {curve['road_id']}: {e}")
                     continue
         
         conn.commit()
     
+    progress.finish()
     print(f"✅ Created {inserted_count} lane segments from Bézier curves")
     return True
 
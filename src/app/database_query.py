@@ -14,6 +14,8 @@ from config import config
 
 
 class DatabaseQueryGUI:
+    RESULT_CACHE_TTL = 60.0
+
     def __init__(self, stdscr):
         self.stdscr = stdscr
         self.db_manager = DatabaseManager()
@@ -171,7 +173,9 @@ class DatabaseQueryGUI:
             self.results = []
             self.error_message = ""
 
-            results = self.db_manager.fetch_all(query["sql"])
+            results = self.db_manager.fetch_all(
+                query["sql"], prepared=True, cache_ttl=self.RESULT_CACHE_TTL
+            )
             if results:
                 self.results = [list(row) for row in results]
             else:
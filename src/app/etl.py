@@ -11,6 +11,9 @@ import numpy as np
 import psycopg2
 from pathlib import Path
 import json
+import time
+
+from src.core.profiling import profiled
 
 # Database configuration
 DB_CONFIG = {
@@ -413,9 +416,15 @@ def load_roads():
         
         cursor = conn.cursor()
         
+        from src.core.metrics import etl_batch_seconds, etl_rows
+        from src.core.progress import ProgressReporter
+        from src.core.tracing import span
+        
         processed_roads = 0
         total_segments = 0
         skipped_roads = 0
+        progress = ProgressReporter("Roads", total=len(roads_df), unit="roads", stage="load_roads")
+        batch_started = time.perf_counter()
         # Process each road independently
         
         # Process ALL roads, not just first 20 like notebook
@@ -428,6 +437,7 @@ def load_roads():
                 # Check if locations exist
                 if start_loc_id not in location_lookup or end_loc_id not in location_lookup:
                     skipped_roads += 1
+                    progress.update(skipped=1)
                     continue
                 
                 # Process each road independently - no opposite direction logic
@@ -472,7 +482,8 @@ def load_roads():
                     p2 = p3
                 
                 # Generate Bézier curve for this road direction
-                forward_curve = generate_bezier_curve(p0, p1, p2, p3, 50)
+                with span("bezier_curve", category="etl", road_id=road_id):
+                    forward_curve = generate_bezier_curve(p0, p1, p2, p3, 50)
                 
                 # Create segments for this road (forward direction)
                 road_distance = float(road['FieldDist'])
@@ -481,72 +492,81 @@ def load_roads():
                 is_closed = bool(road['FieldClosed'])
                 
                 # Forward segments for this road
-                forward_segments = create_lane_segments_from_curve(
-                    road_id, forward_curve, 'forward', road_distance, 
-                    time_empty, time_loaded, is_closed
-                )
+                with span("lane_segments", category="etl", road_id=road_id):
+                    forward_segments = create_lane_segments_from_curve(
+                        road_id, forward_curve, 'forward', road_distance, 
+                        time_empty, time_loaded, is_closed
+                    )
                 
                 # Each road gets only one direction - no opposite direction processing
                 reverse_segments = []
-                print(f"✅ Processed road: {road_id} (forward only)")
                 
                 # Insert all segments into database
-                for segment in forward_segments + reverse_segments:
-                    try:
-                        # Filter out any invalid coordinates from curve points (must be within Australia)
-                        valid_curve_points = []
-                        for lat, lon in segment['curve_points']:
-                            if (-44 <= lat <= -10 and 113 <= lon <= 154):
-                                valid_curve_points.append((lat, lon))
+                inserted_before = total_segments
+                with span("pg_insert", category="etl", road_id=road_id, segments=len(forward_segments)):
+                    for segment in forward_segments + reverse_segments:
+                        try:
+                            # Filter out any invalid coordinates from curve points (must be within Australia)
+                            valid_curve_points = []
+                            for lat, lon in segment['curve_points']:
+                                if (-44 <= lat <= -10 and 113 <= lon <= 154):
+                                    valid_curve_points.append((lat, lon))
                         
-                        # Skip segment if no valid points
-                        if len(valid_curve_points) < 2:
-                            continue
+                            # Skip segment if no valid points
+                            if len(valid_curve_points) < 2:
+                                continue
                             
-                        # Create LineString from valid curve points
-                        points_wkt = ', '.join([f"{lon} {lat}" for lat, lon in valid_curve_points])
-                        linestring_wkt = f"LINESTRING({points_wkt})"
+                            # Create LineString from valid curve points
+                            points_wkt = ', '.join([f"{lon} {lat}" for lat, lon in valid_curve_points])
+                            linestring_wkt = f"LINESTRING({points_wkt})"
                         
-                        cursor.execute("""
-                            INSERT INTO lane_segments (
-                                lane_id, road_id, lane_name, geometry,
-                                length_m, time_empty_seconds, time_loaded_seconds, 
-                                is_closed, direction
-                            ) VALUES (
-                                %s, %s, %s, ST_GeomFromText(%s, 4326),
-                                %s, %s, %s, %s, %s
-                            )
-                        """, (
-                            str(segment['lane_id']),
-                            int(segment['road_id']),
-                            str(segment['lane_name']),
-                            linestring_wkt,
-                            float(segment['length_m']),
-                            float(segment['time_empty_seconds']),
-                            float(segment['time_loaded_seconds']),
-                            bool(segment['is_closed']),
-                            str(segment['direction'])
-                        ))
-                        total_segments += 1
+                            cursor.execute("""
+                                INSERT INTO lane_segments (
+                                    lane_id, road_id, lane_name, geometry,
+                                    length_m, time_empty_seconds, time_loaded_seconds, 
+                                    is_closed, direction
+                                ) VALUES (
+                                    %s, %s, %s, ST_GeomFromText(%s, 4326),
+                                    %s, %s, %s, %s, %s
+                                )
+                            """, (
+                                str(segment['lane_id']),
+                                int(segment['road_id']),
+                                str(segment['lane_name']),
+                                linestring_wkt,
+                                float(segment['length_m']),
+                                float(segment['time_empty_seconds']),
+                                float(segment['time_loaded_seconds']),
+                                bool(segment['is_closed']),
+                                str(segment['direction'])
+                            ))
+                            total_segments += 1
                         
-                    except Exception as e:
-                        print(f"Error inserting segment {segment['lane_id']}: {e}")
-                        continue
+                        except Exception as e:
+                            progress.error(f"segment {segment['lane_id']}: {e}", advance=False)
+                            continue
                 
                 processed_roads += 1
+                progress.update(segments=total_segments - inserted_before)
                 
-                # Progress reporting
                 if processed_roads % 100 == 0:
-                    print(f"Processed {processed_roads} roads, created {total_segments} segments...")
-                    conn.commit()  # Commit periodically
+                    with span("commit", category="etl", roads=processed_roads):
+                        conn.commit()  # Commit periodically
+                    etl_batch_seconds.labels(
+                        stage="load_roads", table="lane_segments",
+                        road_batch=f"{processed_roads - 100}-{processed_roads - 1}"
+                    ).observe(time.perf_counter() - batch_started)
+                    batch_started = time.perf_counter()
                     
             except Exception as e:
-                print(f"Error processing road {road['Id']}: {e}")
                 skipped_roads += 1
+                progress.error(f"road {road['Id']}: {e}")
                 continue
         
+        progress.finish()
         # Final commit
         conn.commit()
+        etl_rows.labels(stage="load_roads", table="lane_segments").inc(total_segments)
         cursor.close()
         conn.close()
         
@@ -560,6 +580,28 @@ def load_roads():
         print(f"❌ Error loading roads: {e}")
         return False
 
+def check_referential_integrity():
+    """Report dangling references in the CSV exports before anything is loaded"""
+    print("Checking referential integrity...")
+    
+    try:
+        from src.models.validators import DataValidator
+        
+        report = DataValidator(data_dir='/app/Dataset').validate_referential_integrity()
+        if report.is_valid:
+            print(f"✅ {report.checks_run} reference checks passed")
+            return True
+        
+        for failure in report.failures:
+            print(f"⚠️  {failure.field} -> {failure.rule.split(':', 1)[1]}: {failure.message} "
+                  f"(e.g. {', '.join(str(value) for value in failure.samples)})")
+        print(f"⚠️  {report.orphan_count} orphaned rows will be skipped during loading")
+        return False
+        
+    except Exception as e:
+        print(f"❌ Error checking referential integrity: {e}")
+        return False
+
 def verify_data():
     """Verify the loaded data"""
     print("Verifying loaded data...")
@@ -608,34 +650,55 @@ def verify_data():
         print(f"❌ Error verifying data: {e}")
         return False
 
+@profiled("etl")
 def main():
     """Main ETL process"""
+    from src.core.metrics import registry, stage_timer
+    from src.core.tracing import write_trace
+    
     print("=== Komatsu Dispatch ETL Process ===")
     print("Processing CSV files and creating Bézier curve roads...")
     
-    # Step 1: Create tables
-    print("\n1. Creating database tables...")
-    if not create_tables():
-        print("❌ Failed to create tables")
-        sys.exit(1)
-    
-    # Step 2: Load locations
-    print("\n2. Loading locations...")
-    if not load_locations():
-        print("❌ Failed to load locations")
-        sys.exit(1)
-    
-    # Step 3: Load roads and create Bézier curves
-    print("\n3. Loading roads and creating Bézier curves...")
-    if not load_roads():
-        print("❌ Failed to load roads")
-        sys.exit(1)
-    
-    # Step 4: Verify data
-    print("\n4. Verifying loaded data...")
-    if not verify_data():
-        print("❌ Failed to verify data")
-        sys.exit(1)
+    try:
+        # Step 0: Check the exports reference each other consistently
+        print("\n0. Checking referential integrity...")
+        with stage_timer("referential_integrity"):
+            check_referential_integrity()
+        
+        # Step 1: Create tables
+        print("\n1. Creating database tables...")
+        with stage_timer("create_tables"):
+            if not create_tables():
+                print("❌ Failed to create tables")
+                sys.exit(1)
+        
+        # Step 2: Load locations
+        print("\n2. Loading locations...")
+        with stage_timer("load_locations"):
+            if not load_locations():
+                print("❌ Failed to load locations")
+                sys.exit(1)
+        
+        # Step 3: Load roads and create Bézier curves
+        print("\n3. Loading roads and creating Bézier curves...")
+        with stage_timer("load_roads"):
+            if not load_roads():
+                print("❌ Failed to load roads")
+                sys.exit(1)
+        
+        # Step 4: Verify data
+        print("\n4. Verifying loaded data...")
+        with stage_timer("verify_data"):
+            if not verify_data():
+                print("❌ Failed to verify data")
+                sys.exit(1)
+    finally:
+        metrics_file = registry.write_textfile()
+        if metrics_file:
+            print(f"📈 Metrics written to {metrics_file}")
+        trace_file = write_trace()
+        if trace_file:
+            print(f"🔥 Trace written to {trace_file} (open in chrome://tracing or ui.perfetto.dev)")
     
     print("\n🎉 ETL process completed successfully!")
     print("All roads are now available as Bézier curves in the database.")
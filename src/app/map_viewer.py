@@ -5,17 +5,33 @@ Fetches all data from GraphQL API backend
 """
 import sys
 import json
+import time
 import requests
 from pathlib import Path
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, g, render_template, jsonify, request
+
+sys.path.append('/app')
+
+from src.core.metrics import PROMETHEUS_CONTENT_TYPE, registry
+from src.core.profiling import init_flask_profiling
 
 app = Flask(__name__)
+init_flask_profiling(app)
+
+http_requests = registry.counter(
+    "dispatch_http_requests_total", "Map viewer HTTP requests", ("endpoint", "method", "status"))
+http_seconds = registry.histogram(
+    "dispatch_http_request_duration_seconds", "Map viewer request latency", ("endpoint",))
+graphql_seconds = registry.histogram(
+    "dispatch_graphql_request_duration_seconds", "Latency of GraphQL backend calls", ("status",))
 
 # GraphQL API endpoint
 GRAPHQL_URL = "http://dispatch_graphql:3000/api/graphql"
 
 def query_graphql(query, variables=None):
     """Make a GraphQL query to the backend API"""
+    start_time = time.perf_counter()
+    status = "error"
     try:
         response = requests.post(
             GRAPHQL_URL,
@@ -30,10 +46,13 @@ def query_graphql(query, variables=None):
             print(f"GraphQL errors: {data['errors']}")
             return None
             
+        status = "success"
         return data.get("data")
     except Exception as e:
         print(f"GraphQL query failed: {e}")
         return None
+    finally:
+        graphql_seconds.labels(status=status).observe(time.perf_counter() - start_time)
 
 def get_locations_data():
     """Get all locations from GraphQL API"""
@@ -135,6 +154,25 @@ def get_lane_segments_data():
         "features": features
     }
 
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    http_requests.labels(endpoint=endpoint, method=request.method, status=response.status_code).inc()
+    if "request_started" in g:
+        http_seconds.labels(endpoint=endpoint).observe(time.perf_counter() - g.request_started)
+    return response
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint; ?format=json returns the same data as JSON"""
+    if request.args.get('format') == 'json':
+        return jsonify(registry.to_dict())
+    return Response(registry.to_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+
 @app.route('/')
 def index():
     """Main map page"""
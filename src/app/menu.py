@@ -5,7 +5,6 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.app.etl import DispatchETL
 from src.app.database_query import DatabaseQueryGUI
 
 
@@ -9,6 +9,7 @@ from pathlib import Path
 
 sys.path.append('/app')
 
+from src.core import ProgressReporter, profiled
 from src.models import DatabaseManager
 from src.models.coordinate_transform import transform_coordinates_batch
 
@@ -594,65 +595,70 @@ def populate_roads_and_segments():
         # Create location lookup
         location_lookup = {loc['id']: loc for loc in location_coords_ultimate}
         
-        with db.pool.get_connection() as conn:
-            with conn.cursor() as cursor:
-                # Insert roads
-                for _, road in roads_df.iterrows():
-                    cursor.execute("""
-                        INSERT INTO roads (road_id, road_name, start_location_id, end_location_id)
-                        VALUES (%s, %s, %s, %s)
-                        ON CONFLICT (road_id) DO UPDATE SET
-                        road_name = EXCLUDED.road_name,
-                        start_location_id = EXCLUDED.start_location_id,
-                        end_location_id = EXCLUDED.end_location_id
-                    """, (
-                        int(road['Id']),
-                        f"Road {road['Id']}",
-                        int(road['FieldLocstart']),
-                        int(road['FieldLocend'])
-                    ))
+        # Commit per batch of rows rather than once at the very end, and run each
+        # curve in a savepoint so one bad insert doesn't abort the transaction
+        with db.batched_writes(commit_every=1000) as writer:
+            # Insert roads
+            for _, road in roads_df.iterrows():
+                writer.execute("""
+                    INSERT INTO roads (road_id, road_name, start_location_id, end_location_id)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (road_id) DO UPDATE SET
+                    road_name = EXCLUDED.road_name,
+                    start_location_id = EXCLUDED.start_location_id,
+                    end_location_id = EXCLUDED.end_location_id
+                """, (
+                    int(road['Id']),
+                    f"Road {road['Id']}",
+                    int(road['FieldLocstart']),
+                    int(road['FieldLocend'])
+                ))
+            
+            # Process roads with Bézier curves - same as notebook
+            bezier_curves_ultimate = []
+            processed_roads = 0
+            skipped_roads = 0
+            
+            print("Processing roads for Bézier curves...")
+            for _, road in roads_df.iterrows():
+                road_id = road['Id']
+                start_loc_id = road['FieldLocstart']
+                end_loc_id = road['FieldLocend']
                 
-                # Process roads with Bézier curves - same as notebook
-                bezier_curves_ultimate = []
-                processed_roads = 0
-                skipped_roads = 0
+                if start_loc_id not in location_lookup or end_loc_id not in location_lookup:
+                    skipped_roads += 1
+                    continue
                 
-                print("Processing roads for Bézier curves...")
-                for _, road in roads_df.iterrows():
-                    road_id = road['Id']
-                    start_loc_id = road['FieldLocstart']
-                    end_loc_id = road['FieldLocend']
-                    
-                    if start_loc_id not in location_lookup or end_loc_id not in location_lookup:
-                        skipped_roads += 1
-                        continue
-                    
-                    start_loc = location_lookup[start_loc_id]
-                    end_loc = location_lookup[end_loc_id]
-                    
-                    road_coords = coords_df[coords_df['Id'] == road_id]
-                    control_points = road_coords[road_coords['Index'].isin([1, 2])]
-                    
-                    # Create bidirectional curves for all roads - same as notebook
-                    road_curves = create_bidirectional_curves(
-                        road_id, start_loc, end_loc, control_points, 
-                        road['FieldClosed'] == 1, road['FieldDist']
-                    )
-                    
-                    bezier_curves_ultimate.extend(road_curves)
-                    processed_roads += 1
+                start_loc = location_lookup[start_loc_id]
+                end_loc = location_lookup[end_loc_id]
                 
-                print(f"✅ Successfully processed {processed_roads} roads with Bézier curves")
-                print(f"⚠️ Skipped {skipped_roads} roads (missing data or invalid coordinates)")
-                print(f"📊 Success rate: {processed_roads/(processed_roads+skipped_roads)*100:.1f}%")
+                road_coords = coords_df[coords_df['Id'] == road_id]
+                control_points = road_coords[road_coords['Index'].isin([1, 2])]
                 
-                # Create proper lane segments for each curve
-                inserted_count = 0
-                for curve in bezier_curves_ultimate:
-                    try:
-                        # Create multiple segments for each curve (50-100m each)
-                        segments = create_lane_segments_from_bezier_curve(curve, target_length=75.0)
-                        
+                # Create bidirectional curves for all roads - same as notebook
+                road_curves = create_bidirectional_curves(
+                    road_id, start_loc, end_loc, control_points, 
+                    road['FieldClosed'] == 1, road['FieldDist']
+                )
+                
+                bezier_curves_ultimate.extend(road_curves)
+                processed_roads += 1
+            
+            print(f"✅ Successfully processed {processed_roads} roads with Bézier curves")
+            print(f"⚠️ Skipped {skipped_roads} roads (missing data or invalid coordinates)")
+            print(f"📊 Success rate: {processed_roads/(processed_roads+skipped_roads)*100:.1f}%")
+            
+            # Create proper lane segments for each curve
+            inserted_count = 0
+            progress = ProgressReporter("Lane segments", total=len(bezier_curves_ultimate), unit="roads",
+                                        stage="lane_segments")
+            for curve in bezier_curves_ultimate:
+                try:
+                    # Create multiple segments for each curve (50-100m each)
+                    segments = create_lane_segments_from_bezier_curve(curve, target_length=75.0)
+                    
+                    curve_inserted = 0
+                    with writer.savepoint():
                         for segment in segments:
                             # Use Bézier curve function to create geometry
                             if segment.get('use_bezier', False):
@@ -661,7 +667,7 @@ def populate_roads_and_segments():
                                 p1 = segment['p1'] 
                                 p2 = segment['p2']
                                 p3 = segment['p3']
-                                
+                            
                                 geometry_sql = f"""
                                     bezier_cubic_line(
                                         ST_SetSRID(ST_MakePoint({p0[1]}, {p0[0]}), 4326),
@@ -680,8 +686,8 @@ def populate_roads_and_segments():
                                 else:
                                     # Simple line from start to end
                                     geometry_sql = f"ST_MakeLine(ST_MakePoint({segment['start_lon']}, {segment['start_lat']}), ST_MakePoint({segment['end_lon']}, {segment['end_lat']}))"
-                            
-                            cursor.execute(f"""
+                        
+                            curve_inserted += writer.execute(f"""
                                 INSERT INTO lane_segments (
                                     lane_id, road_id, lane_name, geometry,
                                     length_m, time_empty_seconds, time_loaded_seconds, is_closed
@@ -705,21 +711,23 @@ def populate_roads_and_segments():
                                 float(roads_df[roads_df['Id'] == curve['road_id']]['FieldTimeloaded'].iloc[0]),
                                 bool(curve['is_closed'])
                             ))
-                            inserted_count += cursor.rowcount
+                    
+                    inserted_count += curve_inserted
+                    
+                    progress.update(segments=len(segments))
                         
-                        print(f"✅ Created {len(segments)} segments for road {curve['road_id']} ({curve['direction']})")
-                            
-                    except Exception as e:
-                        print(f"❌ Error inserting segments for road {curve['road_id']}: {e}")
-                        continue
-        
-            conn.commit()
-            print(f"✅ Created {inserted_count} lane segments from Bézier curves")
+                except Exception as e:
+                    progress.error(f"road {curve['road_id']}: {e}")
+                    continue
+
+        progress.finish()
+        print(f"✅ Created {inserted_count} lane segments from Bézier curves")
         return True
     except Exception as e:
         print(f"❌ Error populating roads and segments: {e}")
         return False
 
+@profiled("populate_database")
 def main():
     """Main function to populate the database"""
     print("=== Populating Database with Corrected Data ===")
@@ -6,6 +6,9 @@ import sys
 
 sys.path.append('/app')
 
+from src.core.profiling import profiled
+
+@profiled("run_etl")
 def main():
     """Run the complete ETL process"""
     try:
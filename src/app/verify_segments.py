@@ -76,6 +76,8 @@ def verify_lane_segments():
                 
                 print(f"\n✅ Segments in 50-100m range: {proper_length_count:,} ({proper_length_pct:.1f}%)")
                 
+                verify_segment_geometry(db_manager)
+                
                 if proper_length_pct >= 80:
                     print("🎉 Lane segments table is properly populated!")
                     return True
@@ -87,5 +89,31 @@ def verify_lane_segments():
         print(f"❌ Error verifying lane segments: {e}")
         return False
 
+def verify_segment_geometry(db_manager, max_roads=10):
+    """Report degenerate, duplicate, overlapping and disconnected segments per road"""
+    try:
+        from src.models.geometry_validation import LaneGeometryValidator
+        
+        validator = LaneGeometryValidator()
+        report = validator.validate(validator.load_segments(db_manager))
+    except Exception as e:
+        print(f"\n⚠️ Geometry check skipped: {e}")
+        return None
+    
+    print(f"\n📐 Segment Geometry ({report.processing_time:.2f}s):")
+    if report.is_valid:
+        print("  • No geometry issues found")
+        return report
+    
+    for kind, count in sorted(report.counts().items()):
+        print(f"  • {kind.replace('_', ' ').title()}: {count:,}")
+    print(f"  • Roads affected: {len(report.issues):,}")
+    
+    worst = sorted(report.issues.items(), key=lambda item: len(item[1]), reverse=True)[:max_roads]
+    for road_id, issues in worst:
+        kinds = sorted({issue.kind for issue in issues})
+        print(f"    - Road {road_id}: {len(issues)} issues ({', '.join(kinds)})")
+    return report
+
 if __name__ == "__main__":
     verify_lane_segments()
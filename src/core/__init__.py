@@ -1,3 +1,11 @@
 from .logger import get_logger, get_performance_logger, get_audit_logger
+from .metrics import MetricsRegistry, registry, stage_timer
+from .profiling import memory_stage, profile_run, profiled
+from .progress import ProgressReporter
+from .tracing import span, traced, write_trace
 
-__all__ = ['get_logger', 'get_performance_logger', 'get_audit_logger']
+__all__ = [
+    'get_logger', 'get_performance_logger', 'get_audit_logger',
+    'MetricsRegistry', 'registry', 'stage_timer', 'ProgressReporter',
+    'span', 'traced', 'write_trace', 'profile_run', 'profiled', 'memory_stage'
+]
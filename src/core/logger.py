@@ -3,6 +3,11 @@ import logging.handlers
 import sys
 import time
 import functools
+import atexit
+import copy
+import multiprocessing.util
+import queue
+import threading
 from pathlib import Path
 from typing import Any, Dict, Optional, Callable
 import json
@@ -10,6 +15,17 @@ from datetime import datetime
 import traceback
 import os
 
+from .metrics import registry
+
+operation_seconds = registry.histogram(
+    "dispatch_operation_duration_seconds", "Duration of timed operations", ("operation", "status"))
+database_rows = registry.counter(
+    "dispatch_database_operation_rows_total", "Records handled by logged database operations",
+    ("operation", "table"))
+database_seconds = registry.histogram(
+    "dispatch_database_operation_duration_seconds", "Duration of logged database operations",
+    ("operation", "table"))
+
 class StructuredFormatter(logging.Formatter):
     """Custom formatter for structured logging"""
     
@@ -28,23 +44,48 @@ class StructuredFormatter(logging.Formatter):
         }
         
         if record.exc_info:
-            log_entry["exception"] = {
-                "type": record.exc_info[0].__name__ if record.exc_info[0] else None,
-                "message": str(record.exc_info[1]) if record.exc_info[1] else None,
-                "traceback": traceback.format_exception(*record.exc_info)
-            }
+            log_entry["exception"] = _exception_fields(record.exc_info)
+        elif getattr(record, 'exception', None):
+            log_entry["exception"] = record.exception
         
         if hasattr(record, 'extra_fields'):
             log_entry.update(record.extra_fields)
         
         return json.dumps(log_entry, default=str)
 
+def _exception_fields(exc_info) -> Dict[str, Any]:
+    return {
+        "type": exc_info[0].__name__ if exc_info[0] else None,
+        "message": str(exc_info[1]) if exc_info[1] else None,
+        "traceback": traceback.format_exception(*exc_info)
+    }
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves JSON formatting to the listener thread
+
+    The stock prepare() fully formats the record on the calling thread. This
+    one only merges the message arguments and renders any exception (the
+    traceback would otherwise keep frames alive), so the caller pays for a
+    record copy and a queue put.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exception = _exception_fields(record.exc_info)
+            record.exc_text = "".join(record.exception["traceback"]).rstrip()
+            record.exc_info = None
+        return record
+
 class PerformanceLogger:
     """Performance monitoring and logging"""
     
     def __init__(self, logger: logging.Logger):
         self.logger = logger
         self.metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
     
     def log_execution_time(self, operation: str):
         """Decorator to log execution time of functions"""
@@ -56,37 +97,41 @@ class PerformanceLogger:
                     result = func(*args, **kwargs)
                     execution_time = time.time() - start_time
                     
-                    self.logger.info(
-                        f"Operation '{operation}' completed successfully",
-                        extra={
-                            'extra_fields': {
-                                'operation': operation,
-                                'execution_time_seconds': execution_time,
-                                'status': 'success'
+                    if self.logger.isEnabledFor(logging.INFO):
+                        self.logger.info(
+                            f"Operation '{operation}' completed successfully",
+                            extra={
+                                'extra_fields': {
+                                    'operation': operation,
+                                    'execution_time_seconds': execution_time,
+                                    'status': 'success'
+                                }
                             }
-                        }
-                    )
-                    
-                    if operation not in self.metrics:
-                        self.metrics[operation] = {
-                            'total_calls': 0,
-                            'total_time': 0.0,
-                            'avg_time': 0.0,
-                            'min_time': float('inf'),
-                            'max_time': 0.0
-                        }
+                        )
                     
-                    metrics = self.metrics[operation]
-                    metrics['total_calls'] += 1
-                    metrics['total_time'] += execution_time
-                    metrics['avg_time'] = metrics['total_time'] / metrics['total_calls']
-                    metrics['min_time'] = min(metrics['min_time'], execution_time)
-                    metrics['max_time'] = max(metrics['max_time'], execution_time)
+                    operation_seconds.labels(operation=operation, status='success').observe(execution_time)
+                    with self._lock:
+                        if operation not in self.metrics:
+                            self.metrics[operation] = {
+                                'total_calls': 0,
+                                'total_time': 0.0,
+                                'avg_time': 0.0,
+                                'min_time': float('inf'),
+                                'max_time': 0.0
+                            }
+                        
+                        metrics = self.metrics[operation]
+                        metrics['total_calls'] += 1
+                        metrics['total_time'] += execution_time
+                        metrics['avg_time'] = metrics['total_time'] / metrics['total_calls']
+                        metrics['min_time'] = min(metrics['min_time'], execution_time)
+                        metrics['max_time'] = max(metrics['max_time'], execution_time)
                     
                     return result
                     
                 except Exception as e:
                     execution_time = time.time() - start_time
+                    operation_seconds.labels(operation=operation, status='error').observe(execution_time)
                     self.logger.error(
                         f"Operation '{operation}' failed",
                         extra={
@@ -107,6 +152,10 @@ class PerformanceLogger:
     
     def log_database_operation(self, operation: str, table: str, record_count: int, execution_time: float):
         """Log database operations with metrics"""
+        database_rows.labels(operation=operation, table=table).inc(max(record_count, 0))
+        database_seconds.labels(operation=operation, table=table).observe(execution_time)
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
             f"Database operation: {operation} on {table}",
             extra={
@@ -122,9 +171,11 @@ class PerformanceLogger:
     
     def get_metrics_summary(self) -> Dict[str, Any]:
         """Get performance metrics summary"""
+        with self._lock:
+            metrics = {operation: dict(values) for operation, values in self.metrics.items()}
         return {
             'timestamp': datetime.now().isoformat(),
-            'metrics': self.metrics
+            'metrics': metrics
         }
 
 class AuditLogger:
@@ -135,6 +186,8 @@ class AuditLogger:
     
     def log_data_access(self, user: str, operation: str, table: str, record_id: Optional[str] = None):
         """Log data access for audit trail"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
             f"Data access: {user} performed {operation} on {table}",
             extra={
@@ -151,6 +204,8 @@ class AuditLogger:
     
     def log_system_event(self, event_type: str, description: str, user: Optional[str] = None):
         """Log system events for audit trail"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
             f"System event: {event_type} - {description}",
             extra={
@@ -170,6 +225,9 @@ class LoggerManager:
     def __init__(self, config):
         self.config = config
         self.loggers: Dict[str, logging.Logger] = {}
+        self.handlers: list = []
+        self.queue_handler: Optional[StructuredQueueHandler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
         self._setup_logging()
     
     def _setup_logging(self):
@@ -184,6 +242,7 @@ class LoggerManager:
         root_logger.setLevel(getattr(logging, self.config.logging['level']))
         
         root_logger.handlers.clear()
+        handlers = []
         
         if os.getenv("LOG_TO_CONSOLE", "false").lower() == "true":
             console_handler = logging.StreamHandler(sys.stdout)
@@ -192,7 +251,7 @@ class LoggerManager:
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
             console_handler.setFormatter(console_formatter)
-            root_logger.addHandler(console_handler)
+            handlers.append(console_handler)
         
         file_handler = logging.handlers.RotatingFileHandler(
             self.config.logging['file'],
@@ -202,7 +261,7 @@ class LoggerManager:
         file_handler.setLevel(logging.DEBUG)
         file_formatter = StructuredFormatter()
         file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
         
         error_handler = logging.handlers.RotatingFileHandler(
             logs_dir / "errors.log",
@@ -211,7 +270,56 @@ class LoggerManager:
         )
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(file_formatter)
-        root_logger.addHandler(error_handler)
+        handlers.append(error_handler)
+        
+        self.handlers = handlers
+        self._start_listener()
+        atexit.register(self.shutdown)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+        # multiprocessing children leave via os._exit(), which skips atexit
+        multiprocessing.util.register_after_fork(self, LoggerManager._register_exit_flush)
+    
+    def _start_listener(self):
+        """Route the root logger through a queue drained by a listener thread
+
+        Formatting and file I/O run on the listener thread; callers only
+        enqueue. Forked children run this again since threads do not survive
+        fork().
+        """
+        root_logger = logging.getLogger()
+        if self.queue_handler is not None:
+            root_logger.removeHandler(self.queue_handler)
+        
+        log_queue = queue.SimpleQueue()
+        self.queue_handler = StructuredQueueHandler(log_queue)
+        root_logger.addHandler(self.queue_handler)
+        self.listener = logging.handlers.QueueListener(
+            log_queue, *self.handlers, respect_handler_level=True
+        )
+        self.listener.start()
+    
+    def _after_fork(self):
+        # The parent's listener may have been mid-write when we forked, so the
+        # inherited file objects can't be trusted; reopen them and restart.
+        # Records are flushed as they are emitted, so closing the inherited
+        # copies writes nothing new and releases their descriptors.
+        for handler in self.handlers:
+            if isinstance(handler, logging.FileHandler):
+                inherited = handler.setStream(handler._open())
+                if inherited is not None:
+                    inherited.close()
+        self._start_listener()
+    
+    @staticmethod
+    def _register_exit_flush(manager: "LoggerManager"):
+        multiprocessing.util.Finalize(manager, manager.shutdown, exitpriority=0)
+    
+    def shutdown(self):
+        """Flush queued records and stop the listener thread"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
     
     def get_logger(self, name: str) -> logging.Logger:
         """Get or create a logger with performance and audit capabilities"""
@@ -234,42 +342,31 @@ class LoggerManager:
         """Get audit logger"""
         return self.get_logger(name).audit
 
-logger_manager = None
+logger_manager: Optional[LoggerManager] = None
+_manager_lock = threading.Lock()
+
+def _get_manager() -> LoggerManager:
+    global logger_manager
+    if logger_manager is None:
+        with _manager_lock:
+            if logger_manager is None:
+                from config import config
+                logger_manager = LoggerManager(config)
+    return logger_manager
 
 def get_logger(name: str) -> logging.Logger:
-    """Get logger instance - DISABLED"""
-    # Return a dummy logger that does nothing
-    class DummyLogger:
-        def info(self, *args, **kwargs): pass
-        def error(self, *args, **kwargs): pass
-        def warning(self, *args, **kwargs): pass
-        def debug(self, *args, **kwargs): pass
-        def critical(self, *args, **kwargs): pass
-        def performance(self, *args, **kwargs): return self
-        def audit(self, *args, **kwargs): return self
-        def log_execution_time(self, *args, **kwargs):
-            def decorator(func):
-                return func
-            return decorator
-        def log_database_operation(self, *args, **kwargs): pass
-        def log_data_access(self, *args, **kwargs): pass
-        def log_system_event(self, *args, **kwargs): pass
-    
-    return DummyLogger()
+    """Get logger instance
+
+    Records are queued to a background listener. Guard expensive messages in
+    hot loops with ``logger.isEnabledFor(level)`` so nothing is built when
+    the level is off.
+    """
+    return _get_manager().get_logger(name)
 
-def get_performance_logger(name: str):
-    """Get performance logger - DISABLED"""
-    class DummyPerformanceLogger:
-        def log_execution_time(self, *args, **kwargs):
-            def decorator(func):
-                return func
-            return decorator
-        def log_database_operation(self, *args, **kwargs): pass
-    return DummyPerformanceLogger()
+def get_performance_logger(name: str) -> PerformanceLogger:
+    """Get performance logger"""
+    return _get_manager().get_performance_logger(name)
 
-def get_audit_logger(name: str):
-    """Get audit logger - DISABLED"""
-    class DummyAuditLogger:
-        def log_data_access(self, *args, **kwargs): pass
-        def log_system_event(self, *args, **kwargs): pass
-    return DummyAuditLogger()
+def get_audit_logger(name: str) -> AuditLogger:
+    """Get audit logger"""
+    return _get_manager().get_audit_logger(name)
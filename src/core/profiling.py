@@ -0,0 +1,382 @@
+import cProfile
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from config import config  # copy-specific
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+PROFILE_ENV = "DISPATCH_PROFILE"
+PROFILE_DIR_ENV = "DISPATCH_PROFILE_DIR"
+SAMPLE_INTERVAL_ENV = "DISPATCH_PROFILE_INTERVAL"
+PROFILE_MODES = ("cpu", "memory")
+
+_active = threading.local()
+_process_profiling = False
+
+
+def profile_mode() -> str:
+    """Profiling mode from $DISPATCH_PROFILE ("" when off)"""
+    return os.getenv(PROFILE_ENV, "").strip().lower()
+
+
+def profile_dir() -> Path:
+    return Path(os.getenv(PROFILE_DIR_ENV, config.logs_dir)) / "profiles"  # copy-specific
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples every thread's Python stack on a timer
+
+    Produces collapsed stacks ("root;caller;callee count" lines) for
+    flamegraph.pl, speedscope or Perfetto. Unlike cProfile it sees all
+    threads, including executor workers, at a fixed cost per sample.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="dispatch-stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack: List[str] = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write_collapsed(self, path: Path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _read_rss() -> Optional[int]:
+    """Current resident set size in bytes, or None if /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _max_rss() -> Optional[int]:
+    """Lifetime peak RSS in bytes (Linux reports ru_maxrss in KiB)"""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class _OpenStage:
+    def __init__(self, name: str, snapshot, rss: Optional[int]):
+        self.name = name
+        self.snapshot = snapshot
+        self.started = time.perf_counter()
+        self.traced_start = tracemalloc.get_traced_memory()[0]
+        self.traced_peak = self.traced_start
+        self.rss_start = rss
+        self.rss_peak = rss or 0
+
+
+class MemoryProfiler:
+    """tracemalloc snapshots at stage boundaries plus peak RSS per stage
+
+    Each stage records Python-heap size at entry/exit, its traced peak, the
+    process RSS at entry/exit with the peak seen by a background sampler,
+    and the allocation sites that grew most between the two snapshots.
+    Peaks are process-wide, so stages running concurrently on other threads
+    are included in each other's numbers.
+    """
+
+    def __init__(self, name: str, top: int = 10, frames: int = 1, rss_interval: float = 0.05):
+        self.name = name
+        self.top = top
+        self.frames = frames
+        self.rss_interval = rss_interval
+        self.stages: List[Dict[str, Any]] = []
+        self._open: List[_OpenStage] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started_tracing = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        if _read_rss() is not None:
+            self._sampler = threading.Thread(target=self._sample_rss, name="dispatch-rss-sampler", daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        if self._started_tracing:
+            tracemalloc.stop()
+
+    def _sample_rss(self):
+        while not self._stop.wait(self.rss_interval):
+            rss = _read_rss()
+            if rss is None:
+                continue
+            with self._lock:
+                for stage in self._open:
+                    stage.rss_peak = max(stage.rss_peak, rss)
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+    def _fold_peak(self):
+        # reset_peak() is global, so credit the peak so far to every open stage first
+        peak = tracemalloc.get_traced_memory()[1]
+        for stage in self._open:
+            stage.traced_peak = max(stage.traced_peak, peak)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        snapshot = self._snapshot()
+        with self._lock:
+            self._fold_peak()
+            stage = _OpenStage(name, snapshot, _read_rss())
+            self._open.append(stage)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._fold_peak()
+                self._open.remove(stage)
+            self._close(stage)
+
+    def _close(self, stage: _OpenStage):
+        after = self._snapshot()
+        traced_end = tracemalloc.get_traced_memory()[0]
+        rss_end = _read_rss()
+        growth = [
+            {
+                'site': str(stat.traceback),
+                'size_diff': stat.size_diff,
+                'count_diff': stat.count_diff,
+                'size': stat.size
+            }
+            for stat in after.compare_to(stage.snapshot, 'lineno')[:self.top]
+            if stat.size_diff > 0
+        ]
+        self.stages.append({
+            'stage': stage.name,
+            'seconds': time.perf_counter() - stage.started,
+            'traced_start_bytes': stage.traced_start,
+            'traced_end_bytes': traced_end,
+            'traced_peak_bytes': stage.traced_peak,
+            'rss_start_bytes': stage.rss_start,
+            'rss_end_bytes': rss_end,
+            'rss_peak_bytes': max(stage.rss_peak, rss_end or 0) or None,
+            'top_growth': growth
+        })
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'run': self.name,
+            'pid': os.getpid(),
+            'max_rss_bytes': _max_rss(),
+            'stages': self.stages
+        }
+
+    def write(self, path: Path) -> Path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+    def summary(self) -> str:
+        lines = [f"{'stage':<32} {'seconds':>9} {'heap peak MB':>13} {'RSS peak MB':>12}"]
+        for stage in self.stages:
+            rss_peak = stage['rss_peak_bytes']
+            lines.append(
+                f"{stage['stage'][:32]:<32} {stage['seconds']:>9.2f} "
+                f"{stage['traced_peak_bytes'] / 1e6:>13.1f} "
+                f"{(rss_peak / 1e6 if rss_peak else float('nan')):>12.1f}"
+            )
+            if stage['top_growth']:
+                top = stage['top_growth'][0]
+                lines.append(f"    top growth: {top['site']} (+{top['size_diff'] / 1e6:.1f} MB)")
+        return "\n".join(lines)
+
+
+class _NoStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_STAGE = _NoStage()
+_memory_profiler: Optional[MemoryProfiler] = None
+
+
+def memory_stage(name: str):
+    """Mark a stage boundary for the active memory profile; a no-op otherwise"""
+    profiler = _memory_profiler
+    if profiler is None:
+        return _NO_STAGE
+    return profiler.stage(name)
+
+
+def _output_stem(name: str) -> Path:
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    now = time.time()
+    timestamp = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}.{int(now * 1000) % 1000:03d}"
+    return directory / f"{name}-{timestamp}-{os.getpid()}"
+
+
+@contextmanager
+def profile_run(name: str, sample: bool = True) -> Iterator[Optional[Path]]:
+    """Profile the enclosed block according to DISPATCH_PROFILE, otherwise do nothing
+
+    ``cpu`` writes ``<stem>.pstats`` (cProfile, the calling thread) and,
+    with ``sample``, ``<stem>.collapsed`` (all threads). ``memory`` writes
+    ``<stem>.memory.json`` with one entry per memory_stage() plus the whole
+    run. Files go under ``$DISPATCH_PROFILE_DIR/profiles`` (default: the
+    logs directory's ``profiles``). Nested calls inside an active profile
+    are no-ops, so decorated entry points that call each other produce one
+    profile.
+    """
+    global _process_profiling, _memory_profiler
+    mode = profile_mode()
+    if mode not in PROFILE_MODES or getattr(_active, "profiling", False):
+        yield None
+        return
+
+    if mode == "memory":
+        if _memory_profiler is not None:
+            yield None
+            return
+        stem = _output_stem(name)
+        profiler = MemoryProfiler(name, top=int(os.getenv("DISPATCH_PROFILE_TOP", "10")),
+                                  frames=int(os.getenv("DISPATCH_PROFILE_FRAMES", "1")))
+        profiler.start()
+        _memory_profiler = profiler
+        try:
+            with profiler.stage(name):
+                yield stem
+        finally:
+            _memory_profiler = None
+            profiler.stop()
+            path = profiler.write(Path(f"{stem}.memory.json"))
+            print(f"Memory profile written: {path}\n{profiler.summary()}", file=sys.stderr, flush=True)
+        return
+
+    stem = _output_stem(name)
+    profiler = cProfile.Profile()
+    sampler = None
+    if sample and not _process_profiling:
+        _process_profiling = True
+        sampler = StackSampler(float(os.getenv(SAMPLE_INTERVAL_ENV, "0.005")))
+        sampler.start()
+    _active.profiling = True
+    profiler.enable()
+    try:
+        yield stem
+    finally:
+        profiler.disable()
+        _active.profiling = False
+        profiler.dump_stats(f"{stem}.pstats")
+        written = [f"{stem}.pstats"]
+        if sampler is not None:
+            sampler.stop()
+            _process_profiling = False
+            sampler.write_collapsed(Path(f"{stem}.collapsed"))
+            written.append(f"{stem}.collapsed ({sampler.samples} samples)")
+        print(f"CPU profile written: {', '.join(written)}", file=sys.stderr, flush=True)
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """Decorator for entry points: profile the call when DISPATCH_PROFILE is set"""
+    def decorator(func: Callable) -> Callable:
+        run_name = name or func.__module__.rsplit(".", 1)[-1]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if profile_mode() not in PROFILE_MODES:
+                return func(*args, **kwargs)
+            with profile_run(run_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def init_flask_profiling(app) -> bool:
+    """Profile each Flask request when DISPATCH_PROFILE=cpu
+
+    One ``.pstats`` per request, named after the endpoint. Set
+    ``DISPATCH_PROFILE_PATHS`` to a comma-separated list of path prefixes to
+    limit which requests are profiled.
+    """
+    if profile_mode() != "cpu":
+        return False
+
+    from flask import g, request
+
+    prefixes = [prefix for prefix in os.getenv("DISPATCH_PROFILE_PATHS", "").split(",") if prefix]
+
+    @app.before_request
+    def _start_request_profile():
+        if prefixes and not any(request.path.startswith(prefix) for prefix in prefixes):
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return  # another request's profiler is active (3.12+ allows one per process)
+        g.dispatch_profiler = profiler
+
+    @app.teardown_request
+    def _stop_request_profile(exc=None):
+        profiler = g.pop("dispatch_profiler", None)
+        if profiler is None:
+            return
+        profiler.disable()
+        endpoint = (request.endpoint or "unmatched").replace(".", "_")
+        profiler.dump_stats(f"{_output_stem(f'request-{endpoint}')}.pstats")
+
+    return True
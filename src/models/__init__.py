@@ -1,6 +1,40 @@
-from .database import DatabaseManager
-from .spatial import SpatialProcessor
-from .validators import DataValidator
-from .sampling import SamplingManager, SamplingConfig, SamplingStrategy
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-__all__ = ['DatabaseManager', 'SpatialProcessor', 'DataValidator', 'SamplingManager', 'SamplingConfig', 'SamplingStrategy']
+# Exports are resolved on first attribute access so that importing one model
+# (e.g. DatabaseManager for the TUI) does not pull in pandas, shapely or the
+# validation rule CSVs.
+_EXPORTS = {
+    'DatabaseManager': '.database',
+    'AsyncDatabaseManager': '.async_database',
+    'SpatialProcessor': '.spatial',
+    'DataValidator': '.validators',
+    'LaneGeometryValidator': '.geometry_validation',
+    'SamplingManager': '.sampling',
+    'SamplingConfig': '.sampling',
+    'SamplingStrategy': '.sampling',
+}
+
+if TYPE_CHECKING:
+    from .database import DatabaseManager
+    from .async_database import AsyncDatabaseManager
+    from .spatial import SpatialProcessor
+    from .validators import DataValidator
+    from .geometry_validation import LaneGeometryValidator
+    from .sampling import SamplingManager, SamplingConfig, SamplingStrategy
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+__all__ = ['DatabaseManager', 'AsyncDatabaseManager', 'SpatialProcessor', 'DataValidator', 'LaneGeometryValidator', 'SamplingManager', 'SamplingConfig', 'SamplingStrategy']
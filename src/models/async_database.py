@@ -0,0 +1,234 @@
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - optional dependency
+    asyncpg = None
+
+from config import config
+from src.core import get_logger
+
+from .database import QueryResult, convert_placeholders
+
+logger = get_logger(__name__)
+
+
+class AsyncConnectionPool:
+    """asyncpg connection pool built from the shared database config"""
+
+    def __init__(self, db_config):
+        self.config = db_config
+        self.pool = None
+        self._stats = {
+            'total_connections': 0,
+            'failed_connections': 0,
+            'queries_executed': 0,
+            'total_query_time': 0.0
+        }
+
+    async def initialize(self):
+        """Create the underlying asyncpg pool"""
+        if asyncpg is None:
+            raise ImportError("asyncpg is required for AsyncDatabaseManager (pip install asyncpg)")
+        if self.pool is not None:
+            return
+
+        try:
+            self.pool = await asyncpg.create_pool(
+                host=self.config.host,
+                port=self.config.port,
+                database=self.config.database,
+                user=self.config.user,
+                password=self.config.password,
+                min_size=1,
+                max_size=self.config.pool_size,
+                timeout=self.config.pool_timeout,
+                max_inactive_connection_lifetime=self.config.pool_recycle
+            )
+            self._stats['total_connections'] = self.config.pool_size
+        except Exception:
+            self._stats['failed_connections'] += 1
+            raise
+
+    @asynccontextmanager
+    async def get_connection(self):
+        """Acquire a connection from the pool"""
+        if self.pool is None:
+            await self.initialize()
+        async with self.pool.acquire(timeout=self.config.pool_timeout) as connection:
+            yield connection
+
+    def record_query(self, execution_time: float):
+        self._stats['queries_executed'] += 1
+        self._stats['total_query_time'] += execution_time
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics"""
+        stats = self._stats.copy()
+        if self.pool is not None:
+            stats['active_connections'] = self.pool.get_size() - self.pool.get_idle_size()
+            stats['idle_connections'] = self.pool.get_idle_size()
+        return stats
+
+    async def close(self):
+        """Close connection pool"""
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+
+class AsyncDatabaseManager:
+    """Asyncio counterpart to DatabaseManager for concurrent request paths
+
+    Queries use the same %s placeholder style as DatabaseManager so SQL can be
+    shared between the sync and async code paths.
+    """
+
+    def __init__(self, db_config=None):
+        self.pool = AsyncConnectionPool(db_config or config.database)
+
+    async def __aenter__(self):
+        await self.pool.initialize()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @asynccontextmanager
+    async def _acquire(self, connection=None):
+        if connection is not None:
+            yield connection
+        else:
+            async with self.pool.get_connection() as conn:
+                yield conn
+
+    @asynccontextmanager
+    async def transaction(self, isolation_level: str = "READ_COMMITTED"):
+        """Transaction context manager with automatic rollback on error
+
+        Nested use of the yielded connection (``conn.transaction()``) creates
+        savepoints, as asyncpg does natively.
+        """
+        async with self.pool.get_connection() as conn:
+            async with conn.transaction(isolation=isolation_level.lower()):
+                yield conn
+
+    async def fetch(self, query: str, params: Optional[Sequence] = None,
+                    connection=None) -> List[Dict[str, Any]]:
+        """Execute a query and return all rows as dicts"""
+        start_time = time.time()
+        async with self._acquire(connection) as conn:
+            rows = await conn.fetch(convert_placeholders(query), *(params or ()))
+        self.pool.record_query(time.time() - start_time)
+        return [dict(row) for row in rows]
+
+    async def fetch_one(self, query: str, params: Optional[Sequence] = None,
+                        connection=None) -> Optional[Dict[str, Any]]:
+        """Execute a query and return a single row"""
+        start_time = time.time()
+        async with self._acquire(connection) as conn:
+            row = await conn.fetchrow(convert_placeholders(query), *(params or ()))
+        self.pool.record_query(time.time() - start_time)
+        return dict(row) if row is not None else None
+
+    async def execute(self, query: str, params: Optional[Sequence] = None,
+                      connection=None) -> QueryResult:
+        """Execute a statement and report the affected row count"""
+        start_time = time.time()
+
+        try:
+            async with self._acquire(connection) as conn:
+                status = await conn.execute(convert_placeholders(query), *(params or ()))
+            execution_time = time.time() - start_time
+            self.pool.record_query(execution_time)
+
+            return QueryResult(
+                data=[],
+                row_count=self._rows_from_status(status),
+                execution_time=execution_time,
+                query=query,
+                success=True
+            )
+
+        except Exception as e:
+            return QueryResult(
+                data=[],
+                row_count=0,
+                execution_time=time.time() - start_time,
+                query=query,
+                success=False,
+                error=str(e)
+            )
+
+    async def copy(self, table_name: str, records: Iterable[Tuple],
+                   columns: Optional[List[str]] = None, connection=None) -> QueryResult:
+        """Bulk load records into a table using COPY"""
+        start_time = time.time()
+
+        try:
+            async with self._acquire(connection) as conn:
+                status = await conn.copy_records_to_table(
+                    table_name, records=records, columns=columns
+                )
+            execution_time = time.time() - start_time
+            self.pool.record_query(execution_time)
+
+            return QueryResult(
+                data=[],
+                row_count=self._rows_from_status(status),
+                execution_time=execution_time,
+                query=f"COPY {table_name}",
+                success=True
+            )
+
+        except Exception as e:
+            return QueryResult(
+                data=[],
+                row_count=0,
+                execution_time=time.time() - start_time,
+                query=f"COPY {table_name}",
+                success=False,
+                error=str(e)
+            )
+
+    async def iterate(self, query: str, params: Optional[Sequence] = None,
+                      prefetch: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        """Stream rows through a server-side cursor"""
+        async with self.pool.get_connection() as conn:
+            async with conn.transaction():
+                async for row in conn.cursor(convert_placeholders(query), *(params or ()),
+                                             prefetch=prefetch):
+                    yield dict(row)
+
+    @staticmethod
+    def _rows_from_status(status: str) -> int:
+        """Parse the row count out of a command tag such as 'INSERT 0 5'"""
+        try:
+            return int(status.split()[-1])
+        except (AttributeError, ValueError, IndexError):
+            return 0
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        return self.pool.get_stats()
+
+    async def health_check(self) -> Dict[str, Any]:
+        start_time = time.time()
+        try:
+            await self.fetch_one("SELECT 1 as health_check")
+            return {
+                'status': 'healthy',
+                'response_time': time.time() - start_time,
+                'timestamp': time.time(),
+                'connection_stats': self.get_connection_stats()
+            }
+        except Exception as e:
+            return {
+                'status': 'unhealthy',
+                'error': str(e),
+                'timestamp': time.time()
+            }
+
+    async def close(self):
+        await self.pool.close()
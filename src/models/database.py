@@ -2,18 +2,31 @@ import psycopg2
 from psycopg2 import pool
 from psycopg2.extras import RealDictCursor, execute_values
 from contextlib import contextmanager
-from typing import Any, Dict, List, Optional, Tuple, Generator
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Generator
 import time
 from dataclasses import dataclass
 import threading
-from queue import Queue, Empty
+from queue import Queue, Empty, Full
+from collections import OrderedDict
+import itertools
+import logging
 import json
+import re
+import weakref
 
 from config import config
-from src.core import get_logger, get_performance_logger, get_audit_logger
+from src.core import get_logger, get_performance_logger, get_audit_logger, registry
+
+from .query_cache import QueryResultCache, is_read_only
+from .query_stats import QueryStatistics
 
 logger = get_logger(__name__)
 perf_logger = get_performance_logger(__name__)
+
+query_seconds = registry.histogram(
+    "dispatch_db_query_duration_seconds", "PostgreSQL statement latency", ("table", "status"))
+query_rows = registry.counter(
+    "dispatch_db_query_rows_total", "Rows returned or affected by PostgreSQL statements", ("table",))
 audit_logger = get_audit_logger(__name__)
 
 @dataclass
@@ -25,6 +38,234 @@ class QueryResult:
     query: str
     success: bool
     error: Optional[str] = None
+    cached: bool = False
+
+_PLACEHOLDER_RE = re.compile(r"%%|%s")
+_FROM_TABLE_RE = re.compile(r"\bFROM\s+(?:ONLY\s+)?([\w.\"]+)", re.IGNORECASE)
+_EXPLAINABLE = ('SELECT', 'WITH', 'VALUES', 'TABLE')
+
+
+def convert_placeholders(query: str) -> str:
+    """Rewrite psycopg2-style %s placeholders into server-side $n placeholders
+
+    Mirrors psycopg2's own interpolation: %% is an escaped percent sign
+    everywhere in the query, including inside string literals.
+    """
+    counter = 0
+
+    def _replace(match):
+        nonlocal counter
+        token = match.group(0)
+        if token == "%s":
+            counter += 1
+            return f"${counter}"
+        return "%"
+
+    return _PLACEHOLDER_RE.sub(_replace, query)
+
+
+class StatementCache:
+    """Per-connection cache of named server-side prepared statements
+
+    Statements are keyed by query text and live on the connection itself, so
+    they survive pool checkouts for as long as the connection stays open.
+    Queries that fail to prepare are remembered (up to max_uncacheable, least
+    recently seen dropped first) so they are not re-prepared on every call.
+    """
+
+    PREPARABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'VALUES')
+
+    def __init__(self, max_statements: int = 64, max_uncacheable: int = 1024):
+        self.max_statements = max_statements
+        self.max_uncacheable = max_uncacheable
+        self._connections = weakref.WeakKeyDictionary()
+        self._uncacheable = OrderedDict()
+        self._names = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'prepares': 0,
+            'evictions': 0,
+            'failures': 0,
+            'resets': 0,
+            'total_prepare_time': 0.0
+        }
+
+    def is_cacheable(self, query: str) -> bool:
+        stripped = query.strip().rstrip(';')
+        if not stripped or ';' in stripped:
+            return False
+        if query in self._uncacheable:
+            with self._lock:
+                if query in self._uncacheable:
+                    self._uncacheable.move_to_end(query)
+            return False
+        return stripped.split(None, 1)[0].upper() in self.PREPARABLE
+
+    def execute(self, cursor, query: str, params: Optional[Tuple] = None) -> bool:
+        """Execute query through a prepared statement on the cursor's connection
+
+        Returns False without executing anything when the query cannot be
+        prepared, so the caller can fall back to plain execution. If the
+        session lost its prepared statements (DISCARD ALL, reconnect) the
+        query is run unprepared instead, unless it failed inside an open
+        transaction, which is then aborted and the error is raised.
+        """
+        if not self.is_cacheable(query):
+            return False
+
+        conn = cursor.connection
+        with self._lock:
+            statements = self._connections.setdefault(conn, OrderedDict())
+
+        name = statements.get(query)
+        if name is None:
+            name = self._prepare(cursor, query, params, statements)
+            if name is None:
+                return False
+        else:
+            statements.move_to_end(query)
+            self._bump('hits')
+
+        idle = conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        try:
+            if params:
+                placeholders = ", ".join(["%s"] * len(params))
+                cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+            else:
+                cursor.execute(f"EXECUTE {name}")
+        except psycopg2.errors.InvalidSqlStatementName:
+            # Session was reset underneath us (DISCARD ALL, reconnect)
+            self.forget(conn)
+            if not (conn.autocommit or idle):
+                raise
+            if not conn.autocommit:
+                # The failed EXECUTE opened the transaction, nothing else is lost
+                conn.rollback()
+            self._bump('resets')
+            cursor.execute(query, params)
+        return True
+
+    def _prepare(self, cursor, query: str, params: Optional[Tuple],
+                 statements: OrderedDict) -> Optional[str]:
+        conn = cursor.connection
+        name = f"dispatch_stmt_{next(self._names)}"
+        use_savepoint = not conn.autocommit
+        start_time = time.time()
+
+        try:
+            if use_savepoint:
+                cursor.execute("SAVEPOINT dispatch_prepare")
+            # psycopg2 only interpolates (and unescapes %%) when params are given
+            statement = convert_placeholders(query) if params else query
+            cursor.execute(f"PREPARE {name} AS {statement}")
+            if use_savepoint:
+                cursor.execute("RELEASE SAVEPOINT dispatch_prepare")
+        except psycopg2.Error:
+            if use_savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT dispatch_prepare")
+            with self._lock:
+                self._uncacheable[query] = None
+                while len(self._uncacheable) > self.max_uncacheable:
+                    self._uncacheable.popitem(last=False)
+                self._stats['failures'] += 1
+            return None
+
+        with self._lock:
+            self._stats['misses'] += 1
+            self._stats['prepares'] += 1
+            self._stats['total_prepare_time'] += time.time() - start_time
+
+        statements[query] = name
+        while len(statements) > self.max_statements:
+            _, evicted = statements.popitem(last=False)
+            cursor.execute(f"DEALLOCATE {evicted}")
+            self._bump('evictions')
+        return name
+
+    def _bump(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def forget(self, conn):
+        """Drop bookkeeping for a connection whose session state was lost"""
+        with self._lock:
+            self._connections.pop(conn, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self._stats.copy()
+            stats['cached_statements'] = sum(len(s) for s in self._connections.values())
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        stats['avg_prepare_time'] = (
+            stats['total_prepare_time'] / stats['prepares'] if stats['prepares'] else 0.0
+        )
+        return stats
+
+
+class _TransactionState(threading.local):
+    """Per-thread transaction bookkeeping for DatabaseManager"""
+    connection = None
+    depth = 0
+
+
+class BatchWriter:
+    """Runs writes on the current thread's transaction, committing every N rows
+
+    Created by DatabaseManager.batched_writes(). Intermediate commits only
+    happen when the writer owns the outermost transaction and no savepoint is
+    open, so a failed savepoint() block never loses already-committed work.
+    """
+    
+    def __init__(self, manager: 'DatabaseManager', commit_every: int, owns_transaction: bool):
+        self.manager = manager
+        self.commit_every = commit_every
+        self.owns_transaction = owns_transaction
+        self.pending = 0
+        self.rows_written = 0
+        self.commits = 0
+    
+    def execute(self, query: str, params: Optional[Tuple] = None) -> int:
+        """Execute one statement and return its rowcount"""
+        with self.manager.current_connection().cursor() as cursor:
+            cursor.execute(query, params)
+            rowcount = cursor.rowcount
+        self._written(1)
+        return rowcount
+    
+    def execute_values(self, query: str, rows: List[Tuple], template: Optional[str] = None,
+                       page_size: int = 1000) -> int:
+        """Multi-row insert through execute_values"""
+        with self.manager.current_connection().cursor() as cursor:
+            execute_values(cursor, query, rows, template=template, page_size=page_size)
+        self._written(len(rows))
+        return len(rows)
+    
+    @contextmanager
+    def savepoint(self):
+        """Group writes so a failure rolls back only this block"""
+        with self.manager.transaction() as conn:
+            yield conn
+        self._maybe_commit()
+    
+    def commit(self):
+        if not self.owns_transaction:
+            return
+        self.manager.commit()
+        self.commits += 1
+        self.pending = 0
+    
+    def _written(self, rows: int):
+        self.pending += rows
+        self.rows_written += rows
+        self._maybe_commit()
+    
+    def _maybe_commit(self):
+        if self.pending >= self.commit_every and self.manager.transaction_depth == 1:
+            self.commit()
+
 
 class ConnectionPool:
     """Advanced connection pool with monitoring and health checks"""
@@ -80,6 +321,11 @@ class ConnectionPool:
             if connection:
                 self.pool.putconn(connection)
     
+    def record_query(self, execution_time: float):
+        with self._lock:
+            self._stats['queries_executed'] += 1
+            self._stats['total_query_time'] += execution_time
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get connection pool statistics"""
         with self._lock:
@@ -91,88 +337,353 @@ class ConnectionPool:
             self.pool.closeall()
             
 
+class SlowQueryExplainer:
+    """Captures EXPLAIN (ANALYZE, BUFFERS) plans for slow reads in the background
+
+    EXPLAIN ANALYZE re-executes the statement, so running it on the caller's
+    thread would double the latency of the queries that already hurt. Requests
+    are queued (at most ``max_pending``, extras are dropped) and a single
+    daemon thread runs them one at a time on its own pooled connection, then
+    attaches each plan to its slow-log entry.
+    """
+
+    def __init__(self, pool: ConnectionPool, query_stats: QueryStatistics, max_pending: int = 8):
+        self.pool = pool
+        self.query_stats = query_stats
+        self._queue: Queue = Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, entry: Dict[str, Any], query: str, params: Optional[Tuple]) -> bool:
+        """Queue a plan capture for a slow-log entry; False when the queue is full"""
+        try:
+            self._queue.put_nowait((entry, query, params))
+        except Full:
+            return False
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="slow-query-explain", daemon=True)
+                self._thread.start()
+        return True
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            entry, query, params = item
+            plan = self.explain(query, params)
+            if plan is None:
+                continue
+            self.query_stats.attach_plan(entry, plan)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    f"Slow query plan: {entry['execution_time']:.3f}s",
+                    extra={'extra_fields': {'fingerprint': entry['fingerprint'], 'plan': plan}}
+                )
+
+    def explain(self, query: str, params: Optional[Tuple] = None) -> Optional[List[str]]:
+        try:
+            with self.pool.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", params)
+                    plan = [list(row.values())[0] if hasattr(row, 'values') else row[0]
+                            for row in cursor.fetchall()]
+                conn.rollback()
+                return plan
+        except Exception:
+            return None
+
+    def stop(self, timeout: float = 1.0):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except Full:
+                return
+            thread.join(timeout)
+
+
 class DatabaseManager:
     """Advanced database manager with enterprise features"""
     
+    METADATA_CACHE_TTL = 300.0
+    HEALTH_CACHE_TTL = 5.0
+    
     def __init__(self):
         self.pool = ConnectionPool(config.database)
-        self._transaction_depth = 0
-        self._transaction_connections = {}
+        cache_size = config.database.statement_cache_size
+        self.statement_cache = StatementCache(cache_size) if cache_size > 0 else None
+        self.query_cache = (
+            QueryResultCache(config.database.query_cache_size, config.database.query_cache_ttl)
+            if config.database.query_cache_size > 0 else None
+        )
+        self.query_stats = QueryStatistics(config.database.slow_query_threshold)
+        self.explainer = SlowQueryExplainer(self.pool, self.query_stats)
+        self._stream_ids = itertools.count(1)
+        self._local = _TransactionState()
     
     @contextmanager
     def transaction(self, isolation_level: str = "READ_COMMITTED"):
-        """Transaction context manager with automatic rollback on error"""
-        thread_id = threading.get_ident()
+        """Transaction context manager with automatic rollback on error
+
+        Transactions are tracked per thread. Nesting on the same thread opens
+        a SAVEPOINT on the already-active connection, so an inner failure
+        rolls back only the inner block; isolation_level applies to the
+        outermost transaction only.
+        """
+        state = self._local
+        if state.connection is not None:
+            with self._savepoint(state) as conn:
+                yield conn
+            return
         
+        with self.pool.get_connection() as conn:
+            conn.set_isolation_level(getattr(psycopg2.extensions, f"ISOLATION_LEVEL_{isolation_level}"))
+            conn.autocommit = False
+            state.connection = conn
+            state.depth = 1
+            
+            try:
+                yield conn
+                conn.commit()
+                # Writes made on the raw connection are not visible to us
+                self.invalidate_cache()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                state.connection = None
+                state.depth = 0
+                if not conn.closed:
+                    # Don't leak a non-default isolation level to the next borrower
+                    conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_DEFAULT)
+    
+    @contextmanager
+    def _savepoint(self, state: _TransactionState):
+        state.depth += 1
+        name = f"dispatch_sp_{state.depth}"
+        conn = state.connection
         try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"SAVEPOINT {name}")
+            try:
+                yield conn
+            except Exception:
+                with conn.cursor() as cursor:
+                    cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+                raise
+            with conn.cursor() as cursor:
+                cursor.execute(f"RELEASE SAVEPOINT {name}")
+        finally:
+            state.depth -= 1
+    
+    @property
+    def in_transaction(self) -> bool:
+        return self._local.connection is not None
+    
+    @property
+    def transaction_depth(self) -> int:
+        """Nesting level on this thread: 0 outside, 1 in a transaction, >1 in savepoints"""
+        return self._local.depth
+    
+    def current_connection(self):
+        """The connection of this thread's active transaction"""
+        if self._local.connection is None:
+            raise RuntimeError("No transaction is active on this thread")
+        return self._local.connection
+    
+    @contextmanager
+    def _connection(self):
+        """This thread's transaction connection if one is active, else a pooled one"""
+        if self._local.connection is not None:
+            yield self._local.connection
+        else:
             with self.pool.get_connection() as conn:
-                conn.set_isolation_level(getattr(psycopg2.extensions, f"ISOLATION_LEVEL_{isolation_level}"))
-                
-                conn.autocommit = False
-                self._transaction_depth += 1
-                self._transaction_connections[thread_id] = conn
-                
-
-                
-                try:
-                    yield conn
-                    conn.commit()
+                yield conn
+    
+    @contextmanager
+    def _statement_scope(self):
+        """Connection for a statement whose errors are caught by the caller
+
+        Inside a transaction the statement runs in a savepoint so a swallowed
+        failure does not leave the whole transaction aborted.
+        """
+        if self._local.connection is not None:
+            with self.transaction() as conn:
+                yield conn, True
+        else:
+            with self.pool.get_connection() as conn:
+                yield conn, False
+    
+    @contextmanager
+    def batched_writes(self, commit_every: Optional[int] = None,
+                       isolation_level: str = "READ_COMMITTED") -> Generator[BatchWriter, None, None]:
+        """Group many writes per transaction, committing every commit_every rows
 
-                except Exception as e:
-                    conn.rollback()
+        Each worker thread gets its own connection. When called inside an
+        existing transaction the writes join it and the outer block decides
+        when to commit.
+        """
+        owns_transaction = not self.in_transaction
+        with self.transaction(isolation_level):
+            yield BatchWriter(
+                self, commit_every or config.processing.batch_size, owns_transaction
+            )
+    
+    def _execute(self, cursor, query: str, params: Optional[Tuple], prepared: bool):
+        """Execute on a cursor, through the statement cache when requested"""
+        if prepared and self.statement_cache is not None:
+            if self.statement_cache.execute(cursor, query, params):
+                return
+        cursor.execute(query, params)
+    
+    def _cache_key(self, kind: str, query: str, params: Optional[Tuple],
+                   cache_ttl: Optional[float]):
+        """Cache key for a cacheable read, or None when caching does not apply
 
-                    raise
-                finally:
-                    self._transaction_depth -= 1
-                    if thread_id in self._transaction_connections:
-                        del self._transaction_connections[thread_id]
-        except Exception as e:
-            
-            raise
+        Reads inside a transaction bypass the cache: they can see this
+        transaction's uncommitted writes, which may still be rolled back.
+        """
+        if (cache_ttl is None or self.query_cache is None or self.in_transaction
+                or not is_read_only(query)):
+            return None
+        return self.query_cache.make_key(query, params) + (kind,)
     
-    def fetch_one(self, query: str, params: Optional[Tuple] = None) -> Optional[Tuple]:
+    def fetch_one(self, query: str, params: Optional[Tuple] = None,
+                  prepared: bool = False, cache_ttl: Optional[float] = None,
+                  tables: Optional[Iterable[str]] = None) -> Optional[Tuple]:
         """Execute a query and return a single row"""
-        with self.pool.get_connection() as conn:
+        key = self._cache_key('one', query, params, cache_ttl)
+        if key is not None:
+            found, row = self.query_cache.get(key)
+            if found:
+                return row
+        
+        generation = self.query_cache.generation() if key is not None else None
+        start_time = time.time()
+        with self._connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute(query, params)
-                return cursor.fetchone()
+                self._execute(cursor, query, params, prepared)
+                row = cursor.fetchone()
+        self._record_query(query, params, time.time() - start_time, 1 if row is not None else 0)
+        
+        if key is not None:
+            self.query_cache.put(key, row, tables=tables, ttl=cache_ttl, generation=generation)
+        return row
     
-    def fetch_all(self, query: str, params: Optional[Tuple] = None) -> List[Tuple]:
+    def fetch_all(self, query: str, params: Optional[Tuple] = None,
+                  prepared: bool = False, cache_ttl: Optional[float] = None,
+                  tables: Optional[Iterable[str]] = None) -> List[Tuple]:
         """Execute a query and return all rows"""
-        with self.pool.get_connection() as conn:
+        key = self._cache_key('all', query, params, cache_ttl)
+        if key is not None:
+            found, rows = self.query_cache.get(key)
+            if found:
+                return list(rows)
+        
+        generation = self.query_cache.generation() if key is not None else None
+        start_time = time.time()
+        with self._connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute(query, params)
-                return cursor.fetchall()
+                self._execute(cursor, query, params, prepared)
+                rows = cursor.fetchall()
+        self._record_query(query, params, time.time() - start_time, len(rows))
+        
+        if key is not None:
+            self.query_cache.put(key, rows, tables=tables, ttl=cache_ttl, generation=generation)
+            return list(rows)
+        return rows
     
+    def stream(self, query: str, params: Optional[Tuple] = None,
+               batch_size: Optional[int] = None,
+               columnar: bool = False) -> Generator[Any, None, None]:
+        """Stream a large result set through a named server-side cursor
+
+        Yields plain row tuples, or with ``columnar=True`` one dict of
+        column name -> list of values per batch. Only ``batch_size`` rows are
+        held client-side at a time; the pooled connection is returned when the
+        generator is exhausted or closed.
+        """
+        batch_size = batch_size or config.processing.batch_size
+        cursor_name = f"dispatch_stream_{next(self._stream_ids)}"
+
+        joined = self.in_transaction
+        with self._connection() as conn:
+            cursor = conn.cursor(name=cursor_name, cursor_factory=psycopg2.extensions.cursor)
+            cursor.itersize = batch_size
+            try:
+                cursor.execute(query, params)
+                if columnar:
+                    while True:
+                        batch = cursor.fetchmany(batch_size)
+                        if not batch:
+                            break
+                        columns = [desc[0] for desc in cursor.description]
+                        yield dict(zip(columns, (list(values) for values in zip(*batch))))
+                else:
+                    for row in cursor:
+                        yield row
+            finally:
+                if not conn.closed:
+                    cursor.close()
+                    if not joined:
+                        conn.rollback()
+
     def get_cursor(self):
         """Get a database connection"""
         return self.pool.get_connection()
     
     def commit(self):
         """Commit current transaction"""
-        thread_id = threading.get_ident()
-        if thread_id in self._transaction_connections:
-            conn = self._transaction_connections[thread_id]
-            conn.commit()
-            
+        state = self._local
+        if state.connection is None:
+            return
+        if state.depth > 1:
+            raise RuntimeError("Cannot commit inside a nested transaction (savepoint)")
+        state.connection.commit()
+        self.invalidate_cache()
     
     def rollback(self):
         """Rollback current transaction"""
-        thread_id = threading.get_ident()
-        if thread_id in self._transaction_connections:
-            conn = self._transaction_connections[thread_id]
-            conn.rollback()
-            
+        state = self._local
+        if state.connection is None:
+            return
+        if state.depth > 1:
+            raise RuntimeError("Cannot roll back the outer transaction from a savepoint")
+        state.connection.rollback()
+
     
     def execute_query(self, query: str, params: Optional[Tuple] = None, 
-                     fetch: bool = True, commit: bool = True) -> QueryResult:
-        """Execute query with performance monitoring"""
+                     fetch: bool = True, commit: bool = True,
+                     prepared: bool = False, cache_ttl: Optional[float] = None,
+                     tables: Optional[Iterable[str]] = None) -> QueryResult:
+        """Execute query with performance monitoring
+
+        Reads with ``cache_ttl`` set are served from the result cache; writes
+        invalidate cached results for the tables they touch.
+        """
         start_time = time.time()
         
+        key = self._cache_key('result', query, params, cache_ttl) if fetch else None
+        if key is not None:
+            found, data = self.query_cache.get(key)
+            if found:
+                return QueryResult(
+                    data=list(data),
+                    row_count=len(data),
+                    execution_time=time.time() - start_time,
+                    query=query,
+                    success=True,
+                    cached=True
+                )
+            generation = self.query_cache.generation()
+        
         try:
-            with self.pool.get_connection() as conn:
+            with self._statement_scope() as (conn, joined):
                 with conn.cursor() as cursor:
-                    cursor.execute(query, params)
+                    self._execute(cursor, query, params, prepared)
                     
                     if fetch:
                         data = cursor.fetchall()
@@ -181,24 +692,32 @@ class DatabaseManager:
                         data = []
                         row_count = cursor.rowcount
                     
-                    if commit and not conn.autocommit:
+                    if commit and not joined and not conn.autocommit:
                         conn.commit()
                     
                     execution_time = time.time() - start_time
                     
-
-                    
-                    return QueryResult(
-                        data=data,
-                        row_count=row_count,
-                        execution_time=execution_time,
-                        query=query,
-                        success=True
-                    )
+                    if self.query_cache is not None:
+                        if key is not None:
+                            self.query_cache.put(key, data, tables=tables, ttl=cache_ttl,
+                                                 generation=generation)
+                            data = list(data)
+                        elif not is_read_only(query):
+                            self._invalidate_for_write(query, tables)
+            
+            # Recorded once the connection is back in the pool
+            self._record_query(query, params, execution_time, row_count)
+            return QueryResult(
+                data=data,
+                row_count=row_count,
+                execution_time=execution_time,
+                query=query,
+                success=True
+            )
         
         except Exception as e:
             execution_time = time.time() - start_time
-            
+            self._record_query(query, params, execution_time, 0, success=False)
             
             return QueryResult(
                 data=[],
@@ -209,13 +728,54 @@ class DatabaseManager:
                 error=str(e)
             )
     
+    def _record_query(self, query: str, params: Optional[Tuple], execution_time: float,
+                      row_count: int, success: bool = True):
+        """Feed latency histograms and capture a plan for slow statements"""
+        self.pool.record_query(execution_time)
+        table = self._extract_table_name(query)
+        key = self.query_stats.record(
+            query, execution_time, row_count, table=table, success=success
+        )
+        query_seconds.labels(table=table, status="success" if success else "error").observe(execution_time)
+        if success and row_count > 0:
+            query_rows.labels(table=table).inc(row_count)
+        if not success or not self.query_stats.is_slow(execution_time):
+            return
+        
+        entry = self.query_stats.log_slow_query(key, query, execution_time, row_count)
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning(
+                f"Slow query: {execution_time:.3f}s, {row_count} rows",
+                extra={'extra_fields': {'fingerprint': key, 'execution_time_seconds': execution_time,
+                                        'row_count': row_count}}
+            )
+        # EXPLAIN ANALYZE re-executes the statement, so only do it for reads, off this thread
+        if (config.database.slow_query_explain and is_read_only(query)
+                and query.split(None, 1)[0].upper() in _EXPLAINABLE
+                and self.query_stats.should_explain(key)):
+            self.explainer.submit(entry, query, params)
+    
+    def _invalidate_for_write(self, query: str, tables: Optional[Iterable[str]] = None):
+        if self.query_cache is None:
+            return
+        if tables:
+            self.query_cache.invalidate(tables)
+        else:
+            self.query_cache.invalidate_for_write(query)
+    
+    def invalidate_cache(self, tables: Optional[Iterable[str]] = None) -> int:
+        """Drop cached results for the given tables, or all of them"""
+        if self.query_cache is None:
+            return 0
+        return self.query_cache.invalidate(tables)
+    
     def execute_batch(self, query: str, data: List[Tuple], batch_size: int = 1000, template: Optional[str] = None) -> QueryResult:
         """Execute batch insert/update with progress monitoring"""
         start_time = time.time()
         total_rows = len(data)
         
         try:
-            with self.pool.get_connection() as conn:
+            with self._statement_scope() as (conn, joined):
                 with conn.cursor() as cursor:
                     for i in range(0, total_rows, batch_size):
                         batch = data[i:i + batch_size]
@@ -226,10 +786,12 @@ class DatabaseManager:
                         progress = (i + len(batch)) / total_rows * 100
                         
                     
-                    conn.commit()
+                    if not joined:
+                        conn.commit()
                     execution_time = time.time() - start_time
+                    self._record_query(query, None, execution_time, total_rows)
                     
-
+                    self._invalidate_for_write(query)
                     
                     return QueryResult(
                         data=[],
@@ -241,7 +803,7 @@ class DatabaseManager:
         
         except Exception as e:
             execution_time = time.time() - start_time
-            
+            self._record_query(query, None, execution_time, 0, success=False)
             
             return QueryResult(
                 data=[],
@@ -265,7 +827,9 @@ class DatabaseManager:
         ORDER BY ordinal_position
         """
         
-        result = self.execute_query(query, (table_name,))
+        result = self.execute_query(
+            query, (table_name,), cache_ttl=self.METADATA_CACHE_TTL, tables=[table_name]
+        )
         
         if result.success:
             return {
@@ -290,7 +854,9 @@ class DatabaseManager:
         WHERE tablename = %s
         """
         
-        result = self.execute_query(query, (table_name,))
+        result = self.execute_query(
+            query, (table_name,), cache_ttl=self.METADATA_CACHE_TTL, tables=[table_name]
+        )
         
         if result.success:
             return {
@@ -307,6 +873,7 @@ class DatabaseManager:
                 with conn.cursor() as cursor:
                     cursor.execute(f"VACUUM ANALYZE {table_name}")
                     conn.commit()
+                    self.invalidate_cache([table_name])
                     
                     
                     return True
@@ -316,22 +883,33 @@ class DatabaseManager:
     
     def _extract_table_name(self, query: str) -> str:
         query_upper = query.upper().strip()
+        tokens = query.split()
         if query_upper.startswith('INSERT INTO'):
-            return query_upper.split()[2]
+            return tokens[2].split('(')[0].lower()
         elif query_upper.startswith('UPDATE'):
-            return query_upper.split()[1]
+            return tokens[1].lower()
         elif query_upper.startswith('DELETE FROM'):
-            return query_upper.split()[2]
-        elif query_upper.startswith('SELECT'):
-            return "unknown"
+            return tokens[2].lower()
+        elif query_upper.startswith(('SELECT', 'WITH')):
+            match = _FROM_TABLE_RE.search(query)
+            if match:
+                return match.group(1).replace('"', '').lower()
         return "unknown"
     
     def get_connection_stats(self) -> Dict[str, Any]:
-        return self.pool.get_stats()
+        stats = self.pool.get_stats()
+        if self.statement_cache is not None:
+            stats['statement_cache'] = self.statement_cache.get_stats()
+        if self.query_cache is not None:
+            stats['query_cache'] = self.query_cache.get_stats()
+        stats.update(self.query_stats.get_stats())
+        return stats
     
     def health_check(self) -> Dict[str, Any]:
         try:
-            result = self.execute_query("SELECT 1 as health_check")
+            result = self.execute_query(
+                "SELECT 1 as health_check", cache_ttl=self.HEALTH_CACHE_TTL, tables=()
+            )
             
             return {
                 'status': 'healthy' if result.success else 'unhealthy',
@@ -347,5 +925,6 @@ class DatabaseManager:
             }
     
     def close(self):
+        self.explainer.stop()
         self.pool.close()
         
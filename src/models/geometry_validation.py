@@ -0,0 +1,213 @@
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+try:
+    import shapely
+    from shapely import STRtree
+except ImportError:  # pragma: no cover - optional dependency
+    shapely = None
+    STRtree = None
+
+from src.core import get_logger
+
+logger = get_logger(__name__)
+
+_LANE_ID_RE = re.compile(r"^road_(\d+)_(\d+)_(\w+)$")
+
+# lane_segments has no direction column; _sequence_key derives it from lane_id
+SEGMENTS_QUERY = """
+SELECT lane_id, road_id, NULL AS direction, ST_AsBinary(geometry) AS wkb
+FROM lane_segments
+WHERE geometry IS NOT NULL
+"""
+
+
+@dataclass
+class GeometryIssue:
+    kind: str
+    lane_id: str
+    other_lane_id: Optional[str] = None
+    detail: Optional[str] = None
+
+
+@dataclass
+class GeometryReport:
+    """Geometry problems in a batch of lane segments, grouped by road"""
+    total_segments: int
+    issues: Dict[Any, List[GeometryIssue]] = field(default_factory=dict)
+    processing_time: float = 0.0
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.issues
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = defaultdict(int)
+        for road_issues in self.issues.values():
+            for issue in road_issues:
+                counts[issue.kind] += 1
+        return dict(counts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total_segments': self.total_segments,
+            'roads_with_issues': len(self.issues),
+            'counts': self.counts(),
+            'processing_time': self.processing_time,
+            'issues': {
+                str(road_id): [issue.__dict__ for issue in road_issues]
+                for road_id, road_issues in self.issues.items()
+            }
+        }
+
+
+class LaneGeometryValidator:
+    """Checks generated lane segment geometry with a packed STRtree
+
+    Candidate pairs for duplicate/overlap detection come from one bulk
+    STRtree query, so the cost grows with the number of segments that
+    actually touch rather than with every pair. Reported issues:
+
+    - ``degenerate``: fewer than two points or no longer than tolerance
+    - ``self_intersection``: the line crosses itself
+    - ``discontinuity``: a gap between ``road_X_i`` and ``road_X_{i+1}``
+    - ``duplicate``: another segment has the same shape, either direction
+    - ``overlap``: another segment shares a stretch longer than tolerance
+
+    Tolerances are in coordinate units. The default of 1e-6 suits lane_segments,
+    which stores EPSG:4326 degrees (about 0.1 m).
+    """
+
+    def __init__(self, tolerance: float = 1e-6, gap_tolerance: Optional[float] = None):
+        if shapely is None:
+            raise ImportError("shapely>=2.0 is required for LaneGeometryValidator (pip install shapely)")
+        self.tolerance = tolerance
+        self.gap_tolerance = tolerance if gap_tolerance is None else gap_tolerance
+
+    def load_segments(self, db_manager, road_ids: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """Fetch lane_segments rows (lane_id, road_id, direction, wkb) for validation"""
+        query, params = SEGMENTS_QUERY, None
+        if road_ids is not None:
+            query += "  AND road_id = ANY(%s)\n"
+            params = (list(road_ids),)
+        return db_manager.fetch_all(query, params)
+
+    def validate(self, segments: Iterable[Dict[str, Any]]) -> GeometryReport:
+        """Validate segment dicts
+
+        Each segment needs ``lane_id`` and ``road_id`` and one of ``geometry``
+        (a shapely geometry), ``wkb`` or ``curve_points``. Curve points are
+        (lat, lon) pairs, as the ETL generates them.
+        """
+        start_time = datetime.now()
+        segments = list(segments)
+        report = GeometryReport(total_segments=len(segments))
+        if not segments:
+            return report
+
+        geoms = np.array([self._geometry(segment) for segment in segments], dtype=object)
+        lane_ids = [str(segment['lane_id']) for segment in segments]
+        road_ids = [segment['road_id'] for segment in segments]
+
+        def add(index, kind, other=None, detail=None):
+            report.issues.setdefault(road_ids[index], []).append(GeometryIssue(
+                kind=kind,
+                lane_id=lane_ids[index],
+                other_lane_id=lane_ids[other] if other is not None else None,
+                detail=detail
+            ))
+
+        lengths = shapely.length(geoms)
+        point_counts = shapely.get_num_coordinates(geoms)
+        degenerate = (point_counts < 2) | (lengths <= self.tolerance)
+        for index in np.flatnonzero(degenerate):
+            add(index, 'degenerate', detail=f"{point_counts[index]} points, length {lengths[index]:.3g}")
+
+        usable = ~degenerate
+        for index in np.flatnonzero(usable & ~shapely.is_simple(geoms)):
+            add(index, 'self_intersection')
+
+        self._check_continuity(segments, geoms, usable, add)
+        self._check_overlaps(segments, geoms, usable, add)
+
+        report.processing_time = (datetime.now() - start_time).total_seconds()
+        return report
+
+    def _geometry(self, segment: Dict[str, Any]):
+        if segment.get('geometry') is not None:
+            return segment['geometry']
+        if segment.get('wkb') is not None:
+            return shapely.from_wkb(bytes(segment['wkb']))
+        points = [(lon, lat) for lat, lon in segment['curve_points']]
+        if len(points) < 2:
+            return shapely.linestrings(points * 2) if points else shapely.from_wkt("LINESTRING EMPTY")
+        return shapely.linestrings(points)
+
+    @staticmethod
+    def _sequence_key(segment: Dict[str, Any], position: int):
+        match = _LANE_ID_RE.match(str(segment['lane_id']))
+        if match:
+            return (segment['road_id'], match.group(3)), int(match.group(2))
+        return (segment['road_id'], segment.get('direction')), position
+
+    def _check_continuity(self, segments, geoms, usable, add):
+        chains = defaultdict(list)
+        for position, segment in enumerate(segments):
+            if usable[position]:
+                chain, order = self._sequence_key(segment, position)
+                chains[chain].append((order, position))
+
+        previous, following = [], []
+        for members in chains.values():
+            members.sort()
+            for (_, a), (_, b) in zip(members, members[1:]):
+                previous.append(a)
+                following.append(b)
+        if not previous:
+            return
+
+        previous = np.array(previous)
+        following = np.array(following)
+        gaps = shapely.distance(shapely.get_point(geoms[previous], -1),
+                                shapely.get_point(geoms[following], 0))
+        for index in np.flatnonzero(gaps > self.gap_tolerance):
+            add(following[index], 'discontinuity', previous[index], f"gap {gaps[index]:.3g}")
+
+    def _check_overlaps(self, segments, geoms, usable, add):
+        candidates = np.flatnonzero(usable)
+        if len(candidates) < 2:
+            return
+
+        tree = STRtree(geoms[candidates])
+        left, right = tree.query(geoms[candidates], predicate='dwithin', distance=self.tolerance)
+        pairs = left < right
+        left, right = candidates[left[pairs]], candidates[right[pairs]]
+        if not len(left):
+            return
+
+        # Consecutive segments of one chain legitimately share an endpoint
+        keys = [self._sequence_key(segment, position) for position, segment in enumerate(segments)]
+        adjacent = np.array([
+            keys[a][0] == keys[b][0] and abs(keys[a][1] - keys[b][1]) == 1
+            for a, b in zip(left, right)
+        ], dtype=bool)
+        left, right = left[~adjacent], right[~adjacent]
+        if not len(left):
+            return
+
+        duplicate = shapely.hausdorff_distance(geoms[left], geoms[right]) <= self.tolerance
+        for a, b in zip(left[duplicate], right[duplicate]):
+            add(b, 'duplicate', a)
+
+        left, right = left[~duplicate], right[~duplicate]
+        if not len(left):
+            return
+        shared = shapely.length(shapely.intersection(geoms[left], geoms[right]))
+        for a, b, length in zip(left, right, shared):
+            if length > self.tolerance:
+                add(b, 'overlap', a, f"shared length {length:.3g}")
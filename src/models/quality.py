@@ -0,0 +1,249 @@
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Signed log buckets for outlier estimation: each bucket spans ~1% of |x|+1
+_BUCKET_GROWTH = 1.01
+_LOG_GROWTH = math.log(_BUCKET_GROWTH)
+
+
+class ColumnMoments:
+    """Count, mean and M2 of a numeric column, mergeable across chunks
+
+    Chunks are summarised with numpy and combined with Chan et al.'s parallel
+    form of Welford's update, so the result matches a single pass over all
+    rows without ever holding them together.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values: np.ndarray):
+        if not len(values):
+            return
+        other = ColumnMoments()
+        other.count = len(values)
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min = float(values.min())
+        other.max = float(values.max())
+        self.merge(other)
+
+    def merge(self, other: "ColumnMoments"):
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation, as pandas' Series.std()"""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+def _bucket_indices(values: np.ndarray) -> np.ndarray:
+    magnitude = np.floor(np.log1p(np.abs(values)) / _LOG_GROWTH).astype(np.int64) + 1
+    return np.where(values == 0, 0, np.sign(values).astype(np.int64) * magnitude)
+
+
+def _bucket_midpoint(index: int) -> float:
+    if index == 0:
+        return 0.0
+    magnitude = abs(index)
+    low = math.expm1((magnitude - 1) * _LOG_GROWTH)
+    high = math.expm1(magnitude * _LOG_GROWTH)
+    return math.copysign((low + high) / 2, index)
+
+
+def _hashable_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast numeric and boolean columns to float64 before hashing
+
+    hash_pandas_object hashes by dtype, and a chunk read with NaNs turns an
+    int column into float64, so 3 and 3.0 must hash the same across chunks.
+    """
+    numeric = df.select_dtypes(include=[np.number, 'bool']).columns
+    if not len(numeric):
+        return df
+    return df.astype({column: 'float64' for column in numeric})
+
+
+class _HashSet:
+    """Distinct uint64 hashes, about 8 bytes each
+
+    Each chunk is deduplicated on arrival and kept aside; the pending arrays
+    are merged into the sorted set only once they outgrow it, so the total
+    sorting work stays O(n log n) instead of re-sorting the set per chunk.
+    """
+
+    _MIN_COMPACT = 1 << 16
+
+    def __init__(self):
+        self._sorted = np.empty(0, dtype=np.uint64)
+        self._pending: List[np.ndarray] = []
+        self._pending_size = 0
+
+    def add(self, hashes: np.ndarray):
+        if not len(hashes):
+            return
+        hashes = np.unique(hashes)
+        self._pending.append(hashes)
+        self._pending_size += len(hashes)
+        if self._pending_size > max(len(self._sorted), self._MIN_COMPACT):
+            self._compact()
+
+    def merge(self, other: "_HashSet"):
+        for hashes in [other._sorted, *other._pending]:
+            self.add(hashes)
+
+    def _compact(self):
+        if self._pending:
+            self._sorted = np.unique(np.concatenate([self._sorted, *self._pending]))
+            self._pending, self._pending_size = [], 0
+
+    def __len__(self) -> int:
+        self._compact()
+        return len(self._sorted)
+
+
+class QualityAccumulator:
+    """One-pass, mergeable version of DataValidator.validate_data_quality
+
+    Tracks per-column null counts, numeric moments, a log-bucketed value
+    histogram for estimating 3-sigma outliers once the final mean/std are
+    known, and 64-bit row/key hashes for duplicate detection. Numeric columns
+    are hashed as float64 so chunk dtypes do not matter, and hashes are kept
+    as distinct uint64 values, about 8 bytes per distinct row.
+    """
+
+    def __init__(self, key_columns: Optional[List[str]] = None):
+        self.key_columns = key_columns
+        self.rows = 0
+        self.columns: List[str] = []
+        self.nulls: Dict[str, int] = {}
+        self.moments: Dict[str, ColumnMoments] = {}
+        self.histograms: Dict[str, Dict[int, int]] = {}
+        self.row_hashes = _HashSet()
+        self.key_hashes: Dict[str, _HashSet] = {}
+        self.key_rows = 0
+
+    def update(self, df: pd.DataFrame):
+        if not self.columns:
+            self.columns = list(df.columns)
+        self.rows += len(df)
+
+        for column, count in df.isna().sum().items():
+            self.nulls[column] = self.nulls.get(column, 0) + int(count)
+
+        for column in df.select_dtypes(include=[np.number]).columns:
+            values = df[column].dropna().to_numpy(dtype=float)
+            self.moments.setdefault(column, ColumnMoments()).update(values)
+            buckets, counts = np.unique(_bucket_indices(values), return_counts=True)
+            histogram = self.histograms.setdefault(column, {})
+            for bucket, count in zip(buckets.tolist(), counts.tolist()):
+                histogram[bucket] = histogram.get(bucket, 0) + count
+
+        hashable = _hashable_frame(df)
+        self.row_hashes.add(pd.util.hash_pandas_object(hashable, index=False).to_numpy())
+
+        for column in self._key_columns(df):
+            key_hashes = pd.util.hash_pandas_object(hashable[column], index=False).to_numpy()
+            self.key_hashes.setdefault(column, _HashSet()).add(key_hashes)
+        self.key_rows += len(df)
+
+    def merge(self, other: "QualityAccumulator"):
+        if not self.columns:
+            self.columns = list(other.columns)
+        self.rows += other.rows
+        self.key_rows += other.key_rows
+        for column, count in other.nulls.items():
+            self.nulls[column] = self.nulls.get(column, 0) + count
+        for column, moments in other.moments.items():
+            self.moments.setdefault(column, ColumnMoments()).merge(moments)
+        for column, other_histogram in other.histograms.items():
+            histogram = self.histograms.setdefault(column, {})
+            for bucket, count in other_histogram.items():
+                histogram[bucket] = histogram.get(bucket, 0) + count
+        self.row_hashes.merge(other.row_hashes)
+        for column, hashes in other.key_hashes.items():
+            self.key_hashes.setdefault(column, _HashSet()).merge(hashes)
+
+    def _key_columns(self, df: pd.DataFrame) -> List[str]:
+        if self.key_columns is not None:
+            return [column for column in self.key_columns if column in df.columns]
+        return ['Id'] if 'Id' in df.columns else list(df.columns[:1])
+
+    def _estimate_outliers(self, column: str) -> int:
+        moments = self.moments[column]
+        std = moments.std
+        if std <= 0:
+            return 0
+        low, high = moments.mean - 3 * std, moments.mean + 3 * std
+        return sum(count for bucket, count in self.histograms.get(column, {}).items()
+                   if not low <= _bucket_midpoint(bucket) <= high)
+
+    def report(self) -> Dict[str, Any]:
+        """Quality report in the same shape as DataValidator.validate_data_quality"""
+        total_cells = self.rows * len(self.columns)
+        null_cells = sum(self.nulls.values())
+        completeness_ratio = (total_cells - null_cells) / total_cells if total_cells else 0.0
+
+        duplicate_rows = self.rows - len(self.row_hashes)
+        consistency_ratio = (self.rows - duplicate_rows) / self.rows if self.rows else 0.0
+
+        accuracy_issues = sum(self._estimate_outliers(column) for column in self.moments)
+        duplicate_values = sum(self.key_rows - len(hashes) for hashes in self.key_hashes.values())
+
+        return {
+            'completeness': {
+                'total_cells': total_cells,
+                'null_cells': null_cells,
+                'completeness_ratio': completeness_ratio,
+                'status': 'good' if completeness_ratio > 0.95 else 'needs_attention'
+            },
+            'consistency': {
+                'total_rows': self.rows,
+                'duplicate_rows': duplicate_rows,
+                'consistency_ratio': consistency_ratio,
+                'status': 'good' if consistency_ratio > 0.99 else 'needs_attention'
+            },
+            'accuracy': {
+                'numeric_columns': len(self.moments),
+                'potential_outliers': accuracy_issues,
+                'column_stats': {
+                    column: {
+                        'count': moments.count,
+                        'mean': moments.mean,
+                        'std': moments.std,
+                        'min': moments.min,
+                        'max': moments.max
+                    }
+                    for column, moments in self.moments.items()
+                    if moments.count
+                },
+                'status': 'good' if accuracy_issues < self.rows * 0.01 else 'needs_attention'
+            },
+            'uniqueness': {
+                'key_columns_checked': len(self.key_hashes),
+                'duplicate_values': duplicate_values,
+                'status': 'good' if duplicate_values == 0 else 'needs_attention'
+            },
+            'timeliness': {
+                'assessment': 'Data timeliness cannot be assessed without timestamp information',
+                'status': 'unknown'
+            }
+        }
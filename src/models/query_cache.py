@@ -0,0 +1,164 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+_TABLE_RE = re.compile(
+    r"\b(?:FROM|JOIN|INTO|UPDATE|TABLE|TRUNCATE)\s+"
+    r"(?:ONLY\s+|IF\s+(?:NOT\s+)?EXISTS\s+)?"
+    r"((?:\"?[A-Za-z_][\w$]*\"?\.)?\"?[A-Za-z_][\w$]*\"?)",
+    re.IGNORECASE
+)
+_READ_STATEMENTS = ('SELECT', 'VALUES', 'SHOW', 'EXPLAIN', 'TABLE')
+_WRITE_KEYWORDS_RE = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+
+def extract_tables(query: str) -> FrozenSet[str]:
+    """Return the lower-cased, schema-less table names a query references"""
+    tables = set()
+    for match in _TABLE_RE.finditer(query):
+        name = match.group(1).replace('"', '').split('.')[-1].lower()
+        tables.add(name)
+    return frozenset(tables)
+
+
+def is_read_only(query: str) -> bool:
+    """Best-effort check that a statement does not modify data"""
+    stripped = query.strip()
+    if not stripped:
+        return False
+    keyword = stripped.split(None, 1)[0].upper()
+    if keyword == 'WITH':
+        return not _WRITE_KEYWORDS_RE.search(stripped)
+    return keyword in _READ_STATEMENTS
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    tables: FrozenSet[str]
+    expires_at: float
+
+
+class QueryResultCache:
+    """LRU cache of query results with TTL expiry and per-table invalidation
+
+    Entries are keyed by query text and parameters and tagged with the tables
+    they read, so a write touching a table drops only the results built on it.
+
+    Every invalidation bumps a generation counter and stamps the tables it
+    touched. A reader takes generation() before running its query and passes
+    it to put(), which drops the result if any of its tables was invalidated
+    meanwhile, so a read racing a write cannot re-cache pre-write data.
+    """
+
+    def __init__(self, max_entries: int = 256, default_ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Tuple[str, Any], _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._cleared_at = 0  # generation of the last full invalidation
+        self._table_generations: Dict[str, int] = {}
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'expirations': 0,
+            'evictions': 0,
+            'invalidations': 0,
+            'stale_puts': 0
+        }
+
+    @staticmethod
+    def make_key(query: str, params: Optional[Iterable] = None) -> Tuple[str, Any]:
+        if params is None:
+            return (query, None)
+        if isinstance(params, dict):
+            return (query, tuple(sorted(params.items())))
+        return (query, tuple(params))
+
+    def generation(self) -> int:
+        """Invalidation counter to take before executing a query that will be put()"""
+        with self._lock:
+            return self._generation
+
+    def get(self, key: Tuple[str, Any]) -> Tuple[bool, Any]:
+        """Look up a key, returning (found, value)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return False, None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return True, entry.value
+
+    def put(self, key: Tuple[str, Any], value: Any,
+            tables: Optional[Iterable[str]] = None, ttl: Optional[float] = None,
+            generation: Optional[int] = None) -> bool:
+        """Store a result tagged with the tables it was read from
+
+        Keys start with the query text; tables are parsed from it when not
+        given explicitly. With ``generation`` (from generation() before the
+        query ran) the result is discarded if its tables were invalidated
+        since; returns whether it was stored.
+        """
+        if tables is None:
+            tables = extract_tables(key[0])
+        ttl = self.default_ttl if ttl is None else ttl
+        entry = _CacheEntry(
+            value=value,
+            tables=frozenset(t.lower() for t in tables),
+            expires_at=time.monotonic() + ttl
+        )
+        with self._lock:
+            if generation is not None and (
+                    self._cleared_at > generation
+                    or any(self._table_generations.get(t, 0) > generation for t in entry.tables)):
+                self._stats['stale_puts'] += 1
+                return False
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+        return True
+
+    def invalidate(self, tables: Optional[Iterable[str]] = None) -> int:
+        """Drop entries reading any of the given tables, or everything if None"""
+        with self._lock:
+            self._generation += 1
+            if tables is None:
+                self._cleared_at = self._generation
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                targets = {t.lower() for t in tables}
+                for table in targets:
+                    self._table_generations[table] = self._generation
+                stale = [key for key, entry in self._entries.items() if entry.tables & targets]
+                for key in stale:
+                    del self._entries[key]
+                removed = len(stale)
+            self._stats['invalidations'] += removed
+            return removed
+
+    def invalidate_for_write(self, query: str):
+        """Invalidate whatever a write statement may have touched"""
+        tables = extract_tables(query)
+        self.invalidate(tables or None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self._stats.copy()
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,169 @@
+import math
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%s|\$\d+")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(query: str) -> str:
+    """Normalise a statement so calls differing only in literals group together"""
+    normalized = _STRING_RE.sub("?", query)
+    normalized = _PARAM_RE.sub("?", normalized)
+    normalized = _NUMBER_RE.sub("?", normalized)
+    normalized = _IN_LIST_RE.sub("IN (?...)", normalized)
+    return _WHITESPACE_RE.sub(" ", normalized).strip()
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with approximate percentiles
+
+    Buckets grow geometrically from ``min_value`` seconds, so percentiles are
+    accurate to within one growth factor (~10% by default) at any scale.
+    """
+
+    def __init__(self, min_value: float = 1e-5, growth: float = 1.1):
+        self.min_value = min_value
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def record(self, value: float):
+        if value <= self.min_value:
+            index = 0
+        else:
+            index = int(math.log(value / self.min_value) / self._log_growth) + 1
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(self.count * pct / 100.0))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= target:
+                upper = self.min_value * self.growth ** index
+                return min(upper, self.max)
+        return self.max
+
+
+class QueryStatistics:
+    """Per-fingerprint latency and row-count tracking with a slow-query log
+
+    Fingerprints are kept in LRU order and capped at ``max_fingerprints``, so
+    ad-hoc statements that defeat fingerprinting cannot grow memory forever.
+    """
+
+    def __init__(self, slow_threshold: float = 0.5, slow_log_size: int = 50,
+                 explain_interval: float = 300.0, max_fingerprints: int = 1000):
+        self.slow_threshold = slow_threshold
+        self.explain_interval = explain_interval
+        self.max_fingerprints = max_fingerprints
+        self._queries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._slow_queries = deque(maxlen=slow_log_size)
+        self._last_explained: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _touch(self, entries: OrderedDict, key: str):
+        entries.move_to_end(key)
+        while len(entries) > self.max_fingerprints:
+            entries.popitem(last=False)
+
+    def record(self, query: str, execution_time: float, row_count: int = 0,
+               table: Optional[str] = None, success: bool = True) -> str:
+        key = fingerprint(query)
+        with self._lock:
+            entry = self._queries.get(key)
+            if entry is None:
+                entry = self._queries[key] = {
+                    'table': table,
+                    'histogram': LatencyHistogram(),
+                    'rows_total': 0,
+                    'errors': 0
+                }
+            self._touch(self._queries, key)
+            entry['histogram'].record(execution_time)
+            if success:
+                entry['rows_total'] += max(row_count, 0)
+            else:
+                entry['errors'] += 1
+        return key
+
+    def is_slow(self, execution_time: float) -> bool:
+        return self.slow_threshold > 0 and execution_time >= self.slow_threshold
+
+    def should_explain(self, key: str) -> bool:
+        """Rate-limit plan capture to once per fingerprint per interval"""
+        now = time.time()
+        with self._lock:
+            last = self._last_explained.get(key)
+            if last is not None and now - last < self.explain_interval:
+                return False
+            self._last_explained[key] = now
+            self._touch(self._last_explained, key)
+            return True
+
+    def log_slow_query(self, key: str, query: str, execution_time: float,
+                       row_count: int, plan: Optional[List[str]] = None) -> Dict[str, Any]:
+        entry = {
+            'fingerprint': key,
+            'query': query.strip(),
+            'execution_time': execution_time,
+            'row_count': row_count,
+            'timestamp': time.time(),
+            'plan': plan
+        }
+        with self._lock:
+            self._slow_queries.append(entry)
+        return entry
+
+    def attach_plan(self, entry: Dict[str, Any], plan: List[str]):
+        """Fill in a plan captured after the slow-log entry was written"""
+        with self._lock:
+            entry['plan'] = plan
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            queries = {}
+            for key, entry in self._queries.items():
+                histogram = entry['histogram']
+                calls = histogram.count
+                queries[key] = {
+                    'table': entry['table'],
+                    'calls': calls,
+                    'errors': entry['errors'],
+                    'total_time': histogram.total,
+                    'avg_time': histogram.total / calls if calls else 0.0,
+                    'min_time': histogram.min if calls else 0.0,
+                    'max_time': histogram.max,
+                    'p50': histogram.percentile(50),
+                    'p95': histogram.percentile(95),
+                    'p99': histogram.percentile(99),
+                    'rows_total': entry['rows_total'],
+                    'avg_rows': entry['rows_total'] / calls if calls else 0.0
+                }
+            return {
+                'queries': queries,
+                'slow_queries': [dict(entry) for entry in self._slow_queries]
+            }
+
+    def reset(self):
+        with self._lock:
+            self._queries.clear()
+            self._slow_queries.clear()
+            self._last_explained.clear()
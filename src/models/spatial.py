@@ -1,16 +1,15 @@
 import numpy as np
-import pandas as pd
 from shapely.geometry import LineString, Point, Polygon
-from shapely.ops import transform
-import pyproj
 from typing import List, Tuple, Optional, Dict, Any, Union
 from dataclasses import dataclass
+import logging
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import multiprocessing as mp
+import threading
 
 from config import config
-from src.core import get_logger, get_performance_logger
+from src.core import get_logger, get_performance_logger, ProgressReporter, span, traced
 
 logger = get_logger(__name__)
 perf_logger = get_performance_logger(__name__)
@@ -68,6 +67,7 @@ class SpatialProcessor:
             
             raise
 
+    @traced(category="spatial")
     def create_bezier_curve(
         self,
         start_point: Tuple[float, float],
@@ -208,6 +208,7 @@ class SpatialProcessor:
 
         return abs(cross_product) / (dP_magnitude**3)
 
+    @traced(category="spatial")
     def sample_curve_curvature_based(
         self, segments: List[CurveSegment]
     ) -> List[Tuple[float, float]]:
@@ -268,9 +269,10 @@ class SpatialProcessor:
 
             processing_time = time.time() - start_time
             
-            print(
-                f"Curve sampling completed: {len(all_points)} points in {processing_time:.3f}s"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Curve sampling completed: {len(all_points)} points in {processing_time:.3f}s"
+                )
 
             return all_points
 
@@ -278,6 +280,7 @@ class SpatialProcessor:
             
             raise
 
+    @traced(category="spatial")
     def create_lane_segments(
         self,
         curve_points: List[Tuple[float, float]],
@@ -364,9 +367,10 @@ class SpatialProcessor:
 
             processing_time = time.time() - start_time
             
-            print(
-                f"Created {len(segments)} lane segments for road {road_id} (total length: {total_distance:.1f}m) in {processing_time:.3f}s"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Created {len(segments)} lane segments for road {road_id} (total length: {total_distance:.1f}m) in {processing_time:.3f}s"
+                )
 
             return segments
 
@@ -473,6 +477,7 @@ class SpatialProcessor:
         
         return segment_points
 
+    @traced(category="spatial")
     def process_roads_parallel(
         self, roads_data: List[Dict[str, Any]], max_workers: Optional[int] = None
     ) -> List[Dict[str, Any]]:
@@ -480,9 +485,11 @@ class SpatialProcessor:
             max_workers = min(config.processing.max_workers, mp.cpu_count())
 
         all_segments = []
+        progress = ProgressReporter("Parallel road processing", total=len(roads_data), unit="roads",
+                                    stage="process_roads")
 
         try:
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            with progress, ThreadPoolExecutor(max_workers=max_workers) as executor:
                 future_to_road = {
                     executor.submit(self._process_single_road, road): road
                     for road in roads_data
@@ -493,19 +500,10 @@ class SpatialProcessor:
                     try:
                         segments = future.result()
                         all_segments.extend(segments)
-                        
-                        print(
-                            f"Processed road {road.get('Id', 'unknown')}: {len(segments)} segments"
-                        )
+                        progress.update(segments=len(segments))
                     except Exception as e:
-                        
-                        print(
-                            f"Failed to process road {road.get('Id', 'unknown')}: {e}"
-                        )
+                        progress.error(f"road {road.get('Id', 'unknown')}: {e}")
 
-            print(
-                f"Parallel processing completed: {len(all_segments)} total segments"
-            )
             return all_segments
 
         except Exception as e:
@@ -515,17 +513,36 @@ class SpatialProcessor:
     def _process_single_road(self, road: Dict[str, Any]) -> List[Dict[str, Any]]:
         try:
             road_id = road["Id"]
-            start_xy = (road["StartX"], road["StartY"])
-            end_xy = (road["EndX"], road["EndY"])
-            control_points = road.get("control_points", None)
-            segments = self.create_bezier_curve(start_xy, end_xy, control_points)
-            curve_points = self.sample_curve_curvature_based(segments)
-            lane_segments = self.create_lane_segments(curve_points, road_id, total_distance=None)
-            return lane_segments
+            with span("road", category="spatial", road_id=road_id):
+                start_xy = (road["StartX"], road["StartY"])
+                end_xy = (road["EndX"], road["EndY"])
+                control_points = road.get("control_points", None)
+                segments = self.create_bezier_curve(start_xy, end_xy, control_points)
+                curve_points = self.sample_curve_curvature_based(segments)
+                lane_segments = self.create_lane_segments(curve_points, road_id, total_distance=None)
+                return lane_segments
 
         except Exception as e:
             
             return []
 
 
-spatial_processor = SpatialProcessor()
+_spatial_processor: Optional[SpatialProcessor] = None
+_spatial_processor_lock = threading.Lock()
+
+
+def get_spatial_processor() -> SpatialProcessor:
+    """Shared SpatialProcessor, created on first use"""
+    global _spatial_processor
+    if _spatial_processor is None:
+        with _spatial_processor_lock:
+            if _spatial_processor is None:
+                _spatial_processor = SpatialProcessor()
+    return _spatial_processor
+
+
+def __getattr__(name: str):
+    # Keeps ``from src.models.spatial import spatial_processor`` working
+    if name == 'spatial_processor':
+        return get_spatial_processor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
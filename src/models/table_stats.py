@@ -0,0 +1,118 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+ESTIMATE_QUERY = """
+SELECT c.relname AS table_name,
+       COALESCE(s.n_live_tup, GREATEST(c.reltuples, 0))::bigint AS row_estimate
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+WHERE c.relkind IN ('r', 'p')
+  AND n.nspname = ANY(current_schemas(false))
+  AND c.relname = ANY(%s)
+"""
+
+
+class TableStatistics:
+    """Batched row counts for dashboard tables, refreshed off the UI thread
+
+    Estimates come from pg_stat_user_tables (falling back to pg_class.reltuples)
+    and cost one catalog lookup regardless of table size. Exact counts run every
+    COUNT(*) as a scalar subquery of a single statement, so either way the
+    whole dashboard is one round trip.
+    """
+
+    def __init__(self, db_manager, tables: Iterable[str], refresh_interval: float = 30.0):
+        self.db_manager = db_manager
+        self.tables = list(tables)
+        self.refresh_interval = refresh_interval
+        self._snapshot: Dict[str, Any] = {
+            'counts': {},
+            'exact': False,
+            'updated_at': None,
+            'error': None,
+            'version': 0
+        }
+        self._exact_requested = False
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def estimate_counts(self, tables: Optional[Iterable[str]] = None) -> Dict[str, Optional[int]]:
+        """Approximate row counts; tables that do not exist map to None"""
+        tables = list(tables or self.tables)
+        rows = self.db_manager.fetch_all(ESTIMATE_QUERY, (tables,))
+        estimates = {row['table_name']: int(row['row_estimate']) for row in rows}
+        return {table: estimates.get(table) for table in tables}
+
+    def exact_counts(self, tables: Optional[Iterable[str]] = None) -> Dict[str, Optional[int]]:
+        """Exact COUNT(*) for every table in one statement"""
+        tables = list(tables or self.tables)
+        existing = [table for table, estimate in self.estimate_counts(tables).items()
+                    if estimate is not None]
+        counts: Dict[str, Optional[int]] = {table: None for table in tables}
+        if not existing:
+            return counts
+
+        columns = ",\n       ".join(
+            f'(SELECT COUNT(*) FROM "{table}") AS "{table}"' for table in existing
+        )
+        row = self.db_manager.fetch_one(f"SELECT {columns}")
+        for table in existing:
+            counts[table] = int(row[table])
+        return counts
+
+    def refresh(self, exact: bool = False):
+        """Collect counts synchronously and publish a new snapshot"""
+        try:
+            counts = self.exact_counts() if exact else self.estimate_counts()
+            error = None
+        except Exception as e:
+            counts, error = None, str(e)
+
+        with self._lock:
+            if counts is not None:
+                self._snapshot['counts'] = counts
+                self._snapshot['exact'] = exact
+                self._snapshot['updated_at'] = time.time()
+            self._snapshot['error'] = error
+            self._snapshot['version'] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = self._snapshot.copy()
+            snapshot['counts'] = dict(snapshot['counts'])
+            return snapshot
+
+    def request_refresh(self, exact: bool = False):
+        """Ask the background thread to refresh now instead of waiting"""
+        with self._lock:
+            self._exact_requested = self._exact_requested or exact
+        self._wakeup.set()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="table-statistics", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.clear()
+            with self._lock:
+                exact = self._exact_requested
+                self._exact_requested = False
+            self.refresh(exact=exact)
+            self._wakeup.wait(self.refresh_interval)
@@ -1,15 +1,25 @@
 import pandas as pd
 import numpy as np
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import io
+import itertools
+import json
+import os
 import re
+import threading
 from datetime import datetime
 from pathlib import Path
 
 from config import config
 from src.core import get_logger
 
+from .quality import QualityAccumulator
+
 logger = get_logger(__name__)
 
 class ValidationSeverity(Enum):
@@ -28,6 +38,7 @@ class ValidationResult:
     field: Optional[str] = None
     value: Any = None
     suggestions: Optional[List[str]] = None
+    row_index: Any = None
 
 @dataclass
 class ValidationReport:
@@ -39,39 +50,300 @@ class ValidationReport:
     summary: Dict[str, int]
     processing_time: float
 
+@dataclass
+class RuleFailureSummary:
+    """Every row that failed one rule on one field"""
+    rule: str
+    field: str
+    severity: ValidationSeverity
+    message: str
+    count: int
+    rows: np.ndarray
+    samples: List[Any]
+    suggestions: Optional[List[str]] = None
+
+@dataclass
+class AggregatedValidationReport:
+    """Validation results grouped by rule and field
+
+    ``rows`` holds positional (0-based) row numbers of the validated DataFrame,
+    so failing records can be pulled back with ``df.iloc[failure.rows]``.
+    """
+    data_type: str
+    total_records: int
+    valid_records: int
+    invalid_records: int
+    failures: List[RuleFailureSummary]
+    summary: Dict[str, int]
+    processing_time: float
+    quality: Optional[Dict[str, Any]] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready dict; failing rows are written as inclusive [start, end] ranges"""
+        report = {
+            'data_type': self.data_type,
+            'total_records': self.total_records,
+            'valid_records': self.valid_records,
+            'invalid_records': self.invalid_records,
+            'summary': self.summary,
+            'processing_time': self.processing_time,
+            'failures': [
+                {
+                    'rule': failure.rule,
+                    'field': failure.field,
+                    'severity': failure.severity.value,
+                    'message': failure.message,
+                    'count': failure.count,
+                    'row_ranges': _row_ranges(failure.rows),
+                    'samples': [_json_value(value) for value in failure.samples],
+                    'suggestions': failure.suggestions
+                }
+                for failure in self.failures
+            ]
+        }
+        if self.quality is not None:
+            report['quality'] = self.quality
+        return report
+    
+    def to_json(self, path: Optional[Union[str, Path]] = None) -> str:
+        """Serialize to JSON, also writing it to ``path`` when given"""
+        text = json.dumps(self.to_dict(), separators=(',', ':'))
+        if path is not None:
+            Path(path).write_text(text)
+        return text
+    
+    def to_parquet(self, path: Union[str, Path]):
+        """Write one row per rule/field with the failing rows as list<int64>
+
+        Report-level totals and the summary go into the schema metadata.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("pyarrow is required for Parquet output. Install with: pip install pyarrow")
+        
+        table = pa.table({
+            'rule': pa.array([f.rule for f in self.failures], pa.string()),
+            'field': pa.array([f.field for f in self.failures], pa.string()),
+            'severity': pa.array([f.severity.value for f in self.failures], pa.string()),
+            'message': pa.array([f.message for f in self.failures], pa.string()),
+            'count': pa.array([f.count for f in self.failures], pa.int64()),
+            'rows': pa.array([f.rows for f in self.failures], pa.list_(pa.int64())),
+            'samples': pa.array([[json.dumps(_json_value(v)) for v in f.samples] for f in self.failures],
+                                pa.list_(pa.string())),
+            'suggestions': pa.array([f.suggestions or [] for f in self.failures],
+                                    pa.list_(pa.string()))
+        })
+        metadata = {
+            'data_type': self.data_type,
+            'total_records': str(self.total_records),
+            'valid_records': str(self.valid_records),
+            'invalid_records': str(self.invalid_records),
+            'processing_time': str(self.processing_time),
+            'summary': json.dumps(self.summary)
+        }
+        if self.quality is not None:
+            metadata['quality'] = json.dumps(self.quality)
+        pq.write_table(table.replace_schema_metadata(metadata), str(path))
+
+@dataclass
+class IntegrityReport:
+    """Orphaned references found across the dataset tables"""
+    table_rows: Dict[str, int]
+    checks_run: int
+    failures: List[RuleFailureSummary]
+    processing_time: float
+    
+    @property
+    def is_valid(self) -> bool:
+        return not self.failures
+    
+    @property
+    def orphan_count(self) -> int:
+        return sum(failure.count for failure in self.failures)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'table_rows': self.table_rows,
+            'checks_run': self.checks_run,
+            'orphan_count': self.orphan_count,
+            'processing_time': self.processing_time,
+            'failures': [
+                {
+                    'rule': failure.rule,
+                    'field': failure.field,
+                    'severity': failure.severity.value,
+                    'message': failure.message,
+                    'count': failure.count,
+                    'row_ranges': _row_ranges(failure.rows),
+                    'samples': [_json_value(value) for value in failure.samples],
+                    'suggestions': failure.suggestions
+                }
+                for failure in self.failures
+            ]
+        }
+
+@dataclass
+class _RuleHits:
+    """Positions failing one rule; values are only read back when needed"""
+    rule: str
+    field: str
+    severity: ValidationSeverity
+    positions: np.ndarray
+    message: Callable[[Any], str]
+    summary_message: str
+    columns: List[str]
+    suggestions: Optional[List[str]] = None
+    
+    def values(self, df: pd.DataFrame, limit: Optional[int] = None) -> Iterator[Any]:
+        positions = self.positions if limit is None else self.positions[:limit]
+        if not self.columns:
+            return iter([None] * len(positions))
+        if len(self.columns) == 1:
+            return iter(df[self.columns[0]].to_numpy()[positions])
+        return df[self.columns].iloc[positions].itertuples(index=False, name=None)
+
+def _row_ranges(rows: np.ndarray) -> List[List[int]]:
+    """Collapse sorted row positions into inclusive [start, end] runs"""
+    if len(rows) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(rows) != 1)
+    starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+    ends = np.concatenate((rows[breaks], [rows[-1]]))
+    return [[int(start), int(end)] for start, end in zip(starts, ends)]
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, tuple):
+        return [_json_value(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
 class DataValidator:
-    """Checks if the data is good"""
+    """Checks if the data is good
+
+    Rules are inferred from the dataset CSVs on first use and cached on disk,
+    keyed by each file's SHA-256, so later runs skip pandas CSV parsing
+    entirely until a file changes.
+    """
     
-    def __init__(self):
+    RULE_SOURCES = {
+        'locations': 'locations.csv',
+        'roads': 'roads.csv',
+        'roadgraphx': 'roadgraphx.csv',
+        'roadgraphy': 'roadgraphy.csv',
+        'gps_types': 'enum gpstypes.csv',
+        'shop_types': 'enum shops.csv',
+        'unit_types': 'enum units.csv'
+    }
+    RULES_CACHE_VERSION = 1
+    STREAM_CHUNK_ROWS = 100_000
+    # (child, column, parent, parent column) for validate_referential_integrity
+    REFERENCES = [
+        ('roads', 'FieldLocstart', 'locations', 'Id'),
+        ('roads', 'FieldLocend', 'locations', 'Id'),
+        ('roadgraphx', 'Id', 'roads', 'Id'),
+        ('roadgraphy', 'Id', 'roads', 'Id'),
+        ('locations', 'UnitId', 'unit_types', 'Id'),
+        ('locations', 'Shoptype', 'shop_types', 'Id'),
+        ('locations', 'Gpstype', 'gps_types', 'Id')
+    ]
+    
+    def __init__(self, data_dir: Optional[Union[str, Path]] = None,
+                 cache_path: Optional[Union[str, Path]] = None):
         self.config = config
-        self.validation_rules = self._load_validation_rules()
+        self.data_dir = Path(data_dir) if data_dir is not None else config.data_dir
+        self.cache_path = (Path(cache_path) if cache_path is not None
+                           else config.cache_dir / "validation_rules.json")
+        self._validation_rules: Optional[Dict[str, Dict[str, Any]]] = None
+        self._rules_lock = threading.Lock()
+    
+    @property
+    def validation_rules(self) -> Dict[str, Dict[str, Any]]:
+        if self._validation_rules is None:
+            with self._rules_lock:
+                if self._validation_rules is None:
+                    self._validation_rules = self._load_validation_rules()
+        return self._validation_rules
+    
+    @validation_rules.setter
+    def validation_rules(self, rules: Dict[str, Dict[str, Any]]):
+        self._validation_rules = rules
     
     def _load_validation_rules(self) -> Dict[str, Dict[str, Any]]:
-        """Generate validation rules from CSV files"""
+        """Generate validation rules from CSV files, reusing cached rules for unchanged files"""
         rules = {}
+        cached = self._read_rules_cache()
+        entries = {}
         
         try:
-            csv_files = {
-                'locations': 'Dataset/locations.csv',
-                'roads': 'Dataset/roads.csv',
-                'roadgraphx': 'Dataset/roadgraphx.csv',
-                'roadgraphy': 'Dataset/roadgraphy.csv',
-                'gps_types': 'Dataset/enum gpstypes.csv',
-                'shop_types': 'Dataset/enum shops.csv',
-                'unit_types': 'Dataset/enum units.csv'
-            }
-            
-            for data_type, file_path in csv_files.items():
-                if Path(file_path).exists():
-                    df = pd.read_csv(file_path, nrows=10)
-                    rules[data_type] = self._generate_rules_from_dataframe(df)
+            for data_type, file_name in self.RULE_SOURCES.items():
+                file_path = self.data_dir / file_name
+                if not file_path.exists():
+                    continue
+                
+                stat = file_path.stat()
+                entry = cached.get(data_type)
+                if not (entry and entry['size'] == stat.st_size
+                        and entry['mtime_ns'] == stat.st_mtime_ns):
+                    digest = self._file_digest(file_path)
+                    if entry and entry['sha256'] == digest:
+                        entry = dict(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                    else:
+                        df = pd.read_csv(file_path, nrows=10)
+                        entry = {
+                            'sha256': digest,
+                            'size': stat.st_size,
+                            'mtime_ns': stat.st_mtime_ns,
+                            'rules': self._generate_rules_from_dataframe(df)
+                        }
+                
+                entries[data_type] = entry
+                rules[data_type] = entry['rules']
                     
         except Exception as e:
             logger.warning(f"Could not load validation rules from CSV: {e}")
-            rules = self._get_default_rules()
+            return self._get_default_rules()
+        
+        if entries != cached:
+            self._write_rules_cache(entries)
             
         return rules
     
+    @staticmethod
+    def _file_digest(file_path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as handle:
+            for block in iter(lambda: handle.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _read_rules_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path) as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        if payload.get('version') != self.RULES_CACHE_VERSION:
+            return {}
+        return payload.get('sources', {})
+    
+    def _write_rules_cache(self, entries: Dict[str, Any]):
+        """Best effort; a read-only checkout just regenerates rules each run"""
+        payload = {'version': self.RULES_CACHE_VERSION, 'sources': entries}
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(payload))
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.debug(f"Could not write validation rules cache: {e}")
+    
     def _generate_rules_from_dataframe(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Generate validation rules from DataFrame structure"""
         rules = {}
@@ -89,7 +361,7 @@ class DataValidator:
             
             rules[column] = {
                 'type': data_type,
-                'required': not has_nulls
+                'required': not bool(has_nulls)
             }
             
         return rules
@@ -97,7 +369,9 @@ class DataValidator:
     def _infer_data_type(self, sample_values: pd.Series) -> str:
         """Infer data type from sample values"""
         try:
-            pd.to_numeric(sample_values, errors='raise').astype(int)
+            numeric = pd.to_numeric(sample_values, errors='raise')
+            if not (numeric % 1 == 0).all():
+                return 'float'
             return 'integer'
         except:
             try:
@@ -146,58 +420,85 @@ class DataValidator:
         }
     
     def validate_dataframe(self, df: pd.DataFrame, data_type: str) -> ValidationReport:
-        """Validate entire DataFrame"""
+        """Validate entire DataFrame
+
+        Rules are evaluated column-wise as boolean masks; ValidationResult
+        objects are only created for failing cells. Passing cells are still
+        counted in the summary as 'valid'/'info'.
+        """
         start_time = datetime.now()
-        results = []
         
         try:
-            if data_type not in self.validation_rules:
-                raise ValueError(f"Unknown data type: {data_type}")
+            hits, invalid_rows, field_checks = self._evaluate_rules(df, data_type)
             
-            rules = self.validation_rules[data_type]
-            total_records = len(df)
-            valid_records = 0
+            results = []
+            for hit in hits:
+                for position, value in zip(hit.positions, hit.values(df)):
+                    results.append(ValidationResult(
+                        is_valid=False,
+                        severity=hit.severity,
+                        message=hit.message(value),
+                        field=hit.field,
+                        value=value,
+                        suggestions=hit.suggestions,
+                        row_index=df.index[position]
+                    ))
             
-            # Validate each record
-            for index, row in df.iterrows():
-                record_valid = True
-                record_results = []
-                
-                for field, rule in rules.items():
-                    if field in df.columns:
-                        field_result = self._validate_field(row[field], field, rule, index)
-                        record_results.append(field_result)
-                        
-                        if field_result.severity in [ValidationSeverity.ERROR, ValidationSeverity.CRITICAL]:
-                            record_valid = False
-                    elif rule.get('required', False):
-                        record_results.append(ValidationResult(
-                            is_valid=False,
-                            severity=ValidationSeverity.ERROR,
-                            message=f"Required field '{field}' is missing",
-                            field=field
-                        ))
-                        record_valid = False
-                
-                results.extend(record_results)
-                
-                if record_valid:
-                    valid_records += 1
+            total_records = len(df)
+            invalid_records = int(invalid_rows.sum())
+            processing_time = (datetime.now() - start_time).total_seconds()
             
-            cross_results = self._validate_cross_fields(df, data_type)
-            results.extend(cross_results)
+            return ValidationReport(
+                total_records=total_records,
+                valid_records=total_records - invalid_records,
+                invalid_records=invalid_records,
+                results=results,
+                summary=self._summary_from_hits(hits, field_checks),
+                processing_time=processing_time
+            )
+        
+        except Exception as e:
+            logger.error(f"DataFrame validation failed: {e}")
+            raise
+    
+    def validate_dataframe_aggregated(self, df: pd.DataFrame, data_type: str,
+                                      sample_size: int = 5) -> AggregatedValidationReport:
+        """Validate a DataFrame into one entry per failing rule and field
+
+        Memory is bounded by the number of failing rows (as an int64 position
+        array) rather than rows x columns result objects, which makes this the
+        variant to use for large exports.
+        """
+        start_time = datetime.now()
+        
+        try:
+            hits, invalid_rows, field_checks = self._evaluate_rules(df, data_type)
             
-            summary = self._calculate_summary(results)
-            invalid_records = total_records - valid_records
+            failures = [
+                RuleFailureSummary(
+                    rule=hit.rule,
+                    field=hit.field,
+                    severity=hit.severity,
+                    message=hit.summary_message,
+                    count=len(hit.positions),
+                    rows=hit.positions,
+                    samples=list(hit.values(df, limit=sample_size)),
+                    suggestions=hit.suggestions
+                )
+                for hit in hits
+            ]
             
+            total_records = len(df)
+            invalid_records = int(invalid_rows.sum())
             processing_time = (datetime.now() - start_time).total_seconds()
             
-            return ValidationReport(
+            return AggregatedValidationReport(
+                data_type=data_type,
                 total_records=total_records,
-                valid_records=valid_records,
+                valid_records=total_records - invalid_records,
                 invalid_records=invalid_records,
-                results=results,
-                summary=summary,
+                failures=failures,
+                summary=self._summary_from_hits(hits, field_checks),
                 processing_time=processing_time
             )
         
@@ -205,6 +506,306 @@ class DataValidator:
             logger.error(f"DataFrame validation failed: {e}")
             raise
     
+    def validate_referential_integrity(self, tables: Optional[Dict[str, pd.DataFrame]] = None,
+                                       sample_size: int = 5) -> IntegrityReport:
+        """Find references to rows that do not exist, before anything is loaded
+
+        Each foreign key is checked as one hash lookup of the child column
+        against the parent's key set. Tables not passed in are read from
+        data_dir. Null references are treated as "no reference".
+        ``rows`` are positional row numbers in the child table, and
+        ``samples`` are distinct missing keys.
+        """
+        start_time = datetime.now()
+        tables = dict(tables or {})
+        
+        needed: Dict[str, set] = {}
+        for child, column, parent, parent_column in self.REFERENCES:
+            needed.setdefault(child, set()).add(column)
+            needed.setdefault(parent, set()).add(parent_column)
+        
+        for data_type, columns in needed.items():
+            if data_type not in tables:
+                file_path = self.data_dir / self.RULE_SOURCES[data_type]
+                if file_path.exists():
+                    tables[data_type] = pd.read_csv(file_path, usecols=sorted(columns))
+        
+        failures = []
+        checks_run = 0
+        key_sets: Dict[Tuple[str, str], pd.Index] = {}
+        
+        for child, column, parent, parent_column in self.REFERENCES:
+            child_df = tables.get(child)
+            parent_df = tables.get(parent)
+            if child_df is None or parent_df is None:
+                logger.warning(f"Skipping integrity check {child}.{column} -> {parent}.{parent_column}: table not available")
+                continue
+            
+            keys = key_sets.get((parent, parent_column))
+            if keys is None:
+                keys = key_sets[(parent, parent_column)] = pd.Index(parent_df[parent_column].dropna().unique())
+            
+            references = child_df[column]
+            orphans = (references.notna() & ~references.isin(keys)).to_numpy()
+            checks_run += 1
+            if not orphans.any():
+                continue
+            
+            rows = np.flatnonzero(orphans)
+            missing = pd.unique(references.to_numpy()[rows])
+            failures.append(RuleFailureSummary(
+                rule=f"reference:{parent}.{parent_column}",
+                field=f"{child}.{column}",
+                severity=ValidationSeverity.ERROR,
+                message=f"{len(rows)} {child} rows reference {len(missing)} {parent_column} values missing from {parent}",
+                count=len(rows),
+                rows=rows,
+                samples=list(missing[:sample_size]),
+                suggestions=[f"Re-export {parent} or drop the orphaned {child} rows"]
+            ))
+        
+        processing_time = (datetime.now() - start_time).total_seconds()
+        return IntegrityReport(
+            table_rows={name: len(df) for name, df in tables.items()},
+            checks_run=checks_run,
+            failures=failures,
+            processing_time=processing_time
+        )
+    
+    def validate_stream(self, source: Union[str, Path, pd.DataFrame, Iterable[Any]], data_type: str,
+                        chunk_size: Optional[int] = None, max_workers: Optional[int] = None,
+                        sample_size: int = 5) -> AggregatedValidationReport:
+        """Validate a CSV file or a stream of chunks without loading it whole
+
+        ``source`` is a CSV path, a DataFrame, or an iterable of DataFrames or
+        column dicts, such as ``db.stream(query, columnar=True)`` for a table.
+        Chunks are validated on a process pool, with at most two chunks per
+        worker in flight. Each worker also builds a QualityAccumulator, and the
+        merged accumulators become ``report.quality``, so one pass produces
+        both the rule failures and the data quality report.
+
+        Cross-field checks such as duplicate coordinates only see one chunk
+        at a time, and the parallel CSV reader splits on newlines, so quoted
+        fields must not contain line breaks.
+        """
+        start_time = datetime.now()
+        chunk_size = chunk_size or self.STREAM_CHUNK_ROWS
+        if max_workers is None:
+            max_workers = config.processing.max_workers if config.processing.enable_parallel_processing else 1
+        rules = self.validation_rules
+        if data_type not in rules:
+            raise ValueError(f"Unknown data type: {data_type}")
+        
+        merged = _StreamMerger(data_type, sample_size)
+        offset = 0
+        
+        if max_workers <= 1:
+            for chunk in self._iter_chunks(source, chunk_size):
+                merged.add(_validate_chunk(self, chunk, data_type, offset, sample_size))
+                offset += len(chunk)
+        else:
+            # CSV files are split into raw line blocks so parsing happens in the workers too
+            if isinstance(source, (str, Path)):
+                chunks = _iter_csv_blocks(source, chunk_size)
+            else:
+                chunks = ((chunk, len(chunk)) for chunk in self._iter_chunks(source, chunk_size))
+            
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_stream_worker,
+                                     initargs=(rules,)) as executor:
+                pending = deque()
+                for chunk, rows in chunks:
+                    pending.append(executor.submit(_validate_chunk, None, chunk, data_type, offset, sample_size))
+                    offset += rows
+                    if len(pending) >= max_workers * 2:
+                        merged.add(pending.popleft().result())
+                while pending:
+                    merged.add(pending.popleft().result())
+        
+        processing_time = (datetime.now() - start_time).total_seconds()
+        return merged.report(processing_time)
+    
+    @staticmethod
+    def _iter_chunks(source: Union[str, Path, pd.DataFrame, Iterable[Any]],
+                     chunk_size: int) -> Iterator[pd.DataFrame]:
+        if isinstance(source, (str, Path)):
+            yield from pd.read_csv(source, chunksize=chunk_size)
+        elif isinstance(source, pd.DataFrame):
+            for start in range(0, len(source), chunk_size):
+                yield source.iloc[start:start + chunk_size]
+        else:
+            for chunk in source:
+                yield chunk if isinstance(chunk, pd.DataFrame) else pd.DataFrame(chunk)
+    
+    def _evaluate_rules(self, df: pd.DataFrame,
+                        data_type: str) -> Tuple[List[_RuleHits], np.ndarray, int]:
+        """Run every field and cross-field rule for a data type
+
+        Returns the failing rule hits, a boolean array of rows with an ERROR or
+        CRITICAL failure, and the number of field checks performed.
+        """
+        if data_type not in self.validation_rules:
+            raise ValueError(f"Unknown data type: {data_type}")
+        
+        rules = self.validation_rules[data_type]
+        total_records = len(df)
+        invalid_rows = np.zeros(total_records, dtype=bool)
+        field_checks = 0
+        hits = []
+        
+        for field, rule in rules.items():
+            if field in df.columns:
+                field_hits = self._validate_column(df[field], field, rule)
+            elif rule.get('required', False) and total_records:
+                field_hits = [_RuleHits(
+                    rule='missing',
+                    field=field,
+                    severity=ValidationSeverity.ERROR,
+                    positions=np.arange(total_records, dtype=np.int64),
+                    message=lambda value, field=field: f"Required field '{field}' is missing",
+                    summary_message=f"Required field '{field}' is missing",
+                    columns=[]
+                )]
+            else:
+                continue
+            
+            field_checks += total_records
+            for hit in field_hits:
+                invalid_rows[hit.positions] = True
+            hits.extend(field_hits)
+        
+        hits.extend(self._cross_field_hits(df, data_type))
+        return hits, invalid_rows, field_checks
+    
+    def _validate_column(self, series: pd.Series, field: str,
+                         rule: Dict[str, Any]) -> List[_RuleHits]:
+        """Apply one field's rules to a whole column
+
+        Checks run in the same order as _validate_field and each cell reports
+        only its first failure.
+        """
+        hits = []
+        
+        def report(name, mask, severity, message, summary_message, suggestions=None):
+            nonlocal remaining
+            mask = np.asarray(mask, dtype=bool) & remaining
+            if not mask.any():
+                return
+            remaining &= ~mask
+            hits.append(_RuleHits(
+                rule=name,
+                field=field,
+                severity=severity,
+                positions=np.flatnonzero(mask),
+                message=message,
+                summary_message=summary_message,
+                suggestions=suggestions,
+                columns=[field]
+            ))
+        
+        nulls = series.isna().to_numpy()
+        remaining = np.ones(len(series), dtype=bool)
+        
+        if rule.get('required', False):
+            report('required', nulls, ValidationSeverity.ERROR,
+                   lambda value: f"Required field '{field}' is null",
+                   f"Required field '{field}' is null")
+        remaining &= ~nulls
+        
+        expected_type = rule.get('type', 'string')
+        report('type', ~self._type_mask(series, expected_type), ValidationSeverity.ERROR,
+               lambda value: f"Field '{field}' has invalid type. Expected {expected_type}, got {type(value).__name__}",
+               f"Field '{field}' has invalid type. Expected {expected_type}",
+               [f"Convert to {expected_type}"])
+        
+        if 'min' in rule or 'max' in rule:
+            numeric = pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+            report('comparable', np.isnan(numeric), ValidationSeverity.CRITICAL,
+                   lambda value: f"Validation error for field '{field}': {value!r} is not comparable",
+                   f"Validation error for field '{field}': value is not comparable")
+            with np.errstate(invalid='ignore'):
+                if 'min' in rule:
+                    report('min', numeric < rule['min'], ValidationSeverity.ERROR,
+                           lambda value: f"Field '{field}' value {value} is below minimum {rule['min']}",
+                           f"Field '{field}' is below minimum {rule['min']}",
+                           [f"Use value >= {rule['min']}"])
+                if 'max' in rule:
+                    report('max', numeric > rule['max'], ValidationSeverity.ERROR,
+                           lambda value: f"Field '{field}' value {value} exceeds maximum {rule['max']}",
+                           f"Field '{field}' exceeds maximum {rule['max']}",
+                           [f"Use value <= {rule['max']}"])
+        
+        if expected_type == 'string' and 'max_length' in rule and remaining.any():
+            lengths = series.astype(str).str.len().to_numpy()
+            report('max_length', lengths > rule['max_length'], ValidationSeverity.ERROR,
+                   lambda value: f"Field '{field}' length {len(str(value))} exceeds maximum {rule['max_length']}",
+                   f"Field '{field}' length exceeds maximum {rule['max_length']}",
+                   [f"Truncate to {rule['max_length']} characters"])
+        
+        if 'pattern' in rule and remaining.any():
+            matches = series.astype(str).str.match(rule['pattern'], na=False).to_numpy(dtype=bool)
+            report('pattern', ~matches, ValidationSeverity.ERROR,
+                   lambda value: f"Field '{field}' does not match required pattern",
+                   f"Field '{field}' does not match required pattern",
+                   [f"Use pattern: {rule['pattern']}"])
+        
+        return hits
+    
+    def _summary_from_hits(self, hits: List[_RuleHits], field_checks: int) -> Dict[str, int]:
+        """Summary counts equivalent to _calculate_summary over every check made
+
+        Each passing field check counts as one valid INFO result; cross-field
+        hits add to the total without a matching valid result.
+        """
+        summary = {
+            'total_validations': field_checks,
+            'valid': field_checks,
+            'info': field_checks,
+            'warning': 0,
+            'error': 0,
+            'critical': 0
+        }
+        for hit in hits:
+            count = len(hit.positions)
+            summary[hit.severity.value] += count
+            if hit.rule.startswith('cross:'):
+                summary['total_validations'] += count
+            else:
+                summary['valid'] -= count
+                summary['info'] -= count
+        return summary
+    
+    def _type_mask(self, series: pd.Series, expected_type: str) -> np.ndarray:
+        """Column-wise _validate_type; True where the (non-null) value has the expected type
+
+        Integral floats count as integers, since pandas stores integer columns
+        containing nulls as float64.
+        """
+        dtype = series.dtype
+        
+        if expected_type == 'integer':
+            if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+                return np.ones(len(series), dtype=bool)
+            if pd.api.types.is_float_dtype(dtype):
+                return (series % 1 == 0).to_numpy()
+        elif expected_type == 'float':
+            if pd.api.types.is_numeric_dtype(dtype):
+                return np.ones(len(series), dtype=bool)
+        elif expected_type == 'string':
+            if pd.api.types.is_numeric_dtype(dtype):
+                return np.zeros(len(series), dtype=bool)
+        elif expected_type == 'boolean':
+            if pd.api.types.is_bool_dtype(dtype):
+                return np.ones(len(series), dtype=bool)
+            return series.isin([0, 1, '0', '1', 'true', 'false']).to_numpy()
+        else:
+            return np.ones(len(series), dtype=bool)
+        
+        # Mixed object columns fall back to the per-value check
+        return np.fromiter(
+            (self._validate_type(value, expected_type) for value in series.to_numpy()),
+            dtype=bool, count=len(series)
+        )
+    
     def _validate_field(self, value: Any, field: str, rule: Dict[str, Any], index: int) -> ValidationResult:
         """Validate individual field"""
         try:
@@ -299,6 +900,8 @@ class DataValidator:
     def _validate_type(self, value: Any, expected_type: str) -> bool:
         try:
             if expected_type == 'integer':
+                if isinstance(value, (float, np.floating)):
+                    return float(value).is_integer()
                 return isinstance(value, (int, np.integer)) or (isinstance(value, str) and value.isdigit())
             elif expected_type == 'float':
                 return isinstance(value, (int, float, np.number)) or (isinstance(value, str) and value.replace('.', '').isdigit())
@@ -314,51 +917,71 @@ class DataValidator:
     def _validate_cross_fields(self, df: pd.DataFrame, data_type: str) -> List[ValidationResult]:
         results = []
         
+        for hit in self._cross_field_hits(df, data_type):
+            for position, value in zip(hit.positions, hit.values(df)):
+                results.append(ValidationResult(
+                    is_valid=False,
+                    severity=hit.severity,
+                    message=hit.summary_message,
+                    field=hit.field,
+                    value=value,
+                    suggestions=hit.suggestions,
+                    row_index=df.index[position]
+                ))
+        
+        return results
+    
+    def _cross_field_hits(self, df: pd.DataFrame, data_type: str) -> List[_RuleHits]:
+        checks = []
+        
         try:
             if data_type == 'roads':
-                same_location_mask = df['FieldLocstart'] == df['FieldLocend']
-                if same_location_mask.any():
-                    for index in df[same_location_mask].index:
-                        results.append(ValidationResult(
-                            is_valid=False,
-                            severity=ValidationSeverity.WARNING,
-                            message="Start and end locations are the same",
-                            field="FieldLocstart,FieldLocend",
-                            value=(df.loc[index, 'FieldLocstart'], df.loc[index, 'FieldLocend']),
-                            suggestions=["Use different start and end locations"]
-                        ))
+                checks.append((
+                    'cross:same_location',
+                    df['FieldLocstart'] == df['FieldLocend'],
+                    "Start and end locations are the same",
+                    ['FieldLocstart', 'FieldLocend'],
+                    ["Use different start and end locations"]
+                ))
                 
                 if 'FieldDist' in df.columns and 'FieldTimeempty' in df.columns:
-                    zero_distance_mask = df['FieldDist'] == 0
-                    if zero_distance_mask.any():
-                        for index in df[zero_distance_mask].index:
-                            results.append(ValidationResult(
-                                is_valid=False,
-                                severity=ValidationSeverity.WARNING,
-                                message="Road has zero distance",
-                                field="FieldDist",
-                                value=df.loc[index, 'FieldDist'],
-                                suggestions=["Check road distance"]
-                            ))
+                    checks.append((
+                        'cross:zero_distance',
+                        df['FieldDist'] == 0,
+                        "Road has zero distance",
+                        ['FieldDist'],
+                        ["Check road distance"]
+                    ))
             
             elif data_type == 'locations':
                 if 'Xloc' in df.columns and 'Yloc' in df.columns:
-                    duplicate_coords = df.duplicated(subset=['Xloc', 'Yloc'], keep=False)
-                    if duplicate_coords.any():
-                        for index in df[duplicate_coords].index:
-                            results.append(ValidationResult(
-                                is_valid=False,
-                                severity=ValidationSeverity.WARNING,
-                                message="Duplicate coordinates found",
-                                field="Xloc,Yloc",
-                                value=(df.loc[index, 'Xloc'], df.loc[index, 'Yloc']),
-                                suggestions=["Check for duplicate locations"]
-                            ))
+                    checks.append((
+                        'cross:duplicate_coordinates',
+                        df.duplicated(subset=['Xloc', 'Yloc'], keep=False),
+                        "Duplicate coordinates found",
+                        ['Xloc', 'Yloc'],
+                        ["Check for duplicate locations"]
+                    ))
         
         except Exception as e:
             logger.error(f"Cross-field validation failed: {e}")
         
-        return results
+        hits = []
+        for name, mask, message, columns, suggestions in checks:
+            positions = np.flatnonzero(mask.to_numpy(dtype=bool))
+            if len(positions):
+                hits.append(_RuleHits(
+                    rule=name,
+                    field=",".join(columns),
+                    severity=ValidationSeverity.WARNING,
+                    positions=positions,
+                    message=lambda value, message=message: message,
+                    summary_message=message,
+                    suggestions=suggestions,
+                    columns=columns
+                ))
+        
+        return hits
     
     def _calculate_summary(self, results: List[ValidationResult]) -> Dict[str, int]:
         """Calculate validation summary statistics"""
@@ -460,4 +1083,105 @@ class DataValidator:
             'status': 'unknown'
         }
 
-data_validator = DataValidator()
+_stream_validator: Optional[DataValidator] = None
+
+def _init_stream_worker(rules: Dict[str, Dict[str, Any]]):
+    global _stream_validator
+    _stream_validator = DataValidator()
+    _stream_validator.validation_rules = rules
+
+def _iter_csv_blocks(path: Union[str, Path], chunk_size: int) -> Iterator[Tuple[bytes, int]]:
+    """Yield (header + up to chunk_size raw lines, line count) from a CSV file"""
+    with open(path, 'rb') as handle:
+        header = handle.readline()
+        while True:
+            lines = list(itertools.islice(handle, chunk_size))
+            if not lines:
+                return
+            yield header + b''.join(lines), len(lines)
+
+def _validate_chunk(validator: Optional[DataValidator], chunk: Union[pd.DataFrame, bytes], data_type: str,
+                    offset: int, sample_size: int) -> Tuple[AggregatedValidationReport, QualityAccumulator]:
+    """Validate one chunk; row positions in the report are relative to the whole stream"""
+    validator = validator or _stream_validator
+    if isinstance(chunk, bytes):
+        chunk = pd.read_csv(io.BytesIO(chunk))
+    report = validator.validate_dataframe_aggregated(chunk, data_type, sample_size=sample_size)
+    for failure in report.failures:
+        failure.rows = failure.rows + offset
+    accumulator = QualityAccumulator()
+    accumulator.update(chunk)
+    return report, accumulator
+
+class _StreamMerger:
+    """Folds per-chunk reports and accumulators into one stream-wide report"""
+    
+    def __init__(self, data_type: str, sample_size: int):
+        self.data_type = data_type
+        self.sample_size = sample_size
+        self.total_records = 0
+        self.invalid_records = 0
+        self.summary: Dict[str, int] = {}
+        self.failures: Dict[Tuple[str, str], RuleFailureSummary] = {}
+        self.rows: Dict[Tuple[str, str], List[np.ndarray]] = {}
+        self.quality = QualityAccumulator()
+    
+    def add(self, result: Tuple[AggregatedValidationReport, QualityAccumulator]):
+        report, accumulator = result
+        self.total_records += report.total_records
+        self.invalid_records += report.invalid_records
+        for key, value in report.summary.items():
+            self.summary[key] = self.summary.get(key, 0) + value
+        for failure in report.failures:
+            key = (failure.rule, failure.field)
+            merged = self.failures.get(key)
+            if merged is None:
+                self.failures[key] = merged = RuleFailureSummary(
+                    rule=failure.rule,
+                    field=failure.field,
+                    severity=failure.severity,
+                    message=failure.message,
+                    count=0,
+                    rows=failure.rows,
+                    samples=[],
+                    suggestions=failure.suggestions
+                )
+                self.rows[key] = []
+            merged.count += failure.count
+            merged.samples.extend(failure.samples[:self.sample_size - len(merged.samples)])
+            self.rows[key].append(failure.rows)
+        self.quality.merge(accumulator)
+    
+    def report(self, processing_time: float) -> AggregatedValidationReport:
+        failures = []
+        for key, failure in self.failures.items():
+            failure.rows = np.sort(np.concatenate(self.rows[key]))
+            failures.append(failure)
+        return AggregatedValidationReport(
+            data_type=self.data_type,
+            total_records=self.total_records,
+            valid_records=self.total_records - self.invalid_records,
+            invalid_records=self.invalid_records,
+            failures=failures,
+            summary=self.summary,
+            processing_time=processing_time,
+            quality=self.quality.report()
+        )
+
+_data_validator: Optional[DataValidator] = None
+_data_validator_lock = threading.Lock()
+
+def get_data_validator() -> DataValidator:
+    """Shared DataValidator, created on first use"""
+    global _data_validator
+    if _data_validator is None:
+        with _data_validator_lock:
+            if _data_validator is None:
+                _data_validator = DataValidator()
+    return _data_validator
+
+def __getattr__(name: str):
+    # Keeps ``from src.models.validators import data_validator`` working
+    if name == 'data_validator':
+        return get_data_validator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,10 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# src.* imports resolve from the repository root; the ETL scripts import their
+# siblings as top-level modules
+for path in (ROOT, ROOT / "Frontrunner" / "etl"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,104 @@
+import pytest
+
+pytest.importorskip("Crypto")
+from Crypto.Cipher import AES
+
+from aes_engine import PoseDecryptor, decrypt_pose_batch, mysql_aes_decrypt, mysql_aes_key, parse_pose
+
+# FIPS-197 / SP 800-38A AES-128 ECB vector
+NIST_KEY = bytes.fromhex("2b7e151628aed2a6abf7158809cf4f3c")
+NIST_PLAINTEXT = bytes.fromhex("6bc1bee22e409f96e93d7e117393172a")
+NIST_CIPHERTEXT = bytes.fromhex("3ad77bb40d7a3660a89ecaf32466ef97")
+
+KEY = "a8ba99bd-6871-4344-a227-4c2807ef5fbc"
+
+
+def mysql_aes_encrypt(plaintext: bytes, key) -> bytes:
+    """AES_ENCRYPT(plaintext, key): folded key, AES-128-ECB, PKCS#7 padding"""
+    pad = 16 - len(plaintext) % 16
+    return AES.new(mysql_aes_key(key), AES.MODE_ECB).encrypt(plaintext + bytes([pad]) * pad)
+
+
+def test_key_folding_xors_into_sixteen_bytes():
+    assert mysql_aes_key(NIST_KEY) == NIST_KEY
+    assert mysql_aes_key(NIST_KEY + bytes(16)) == NIST_KEY
+    assert mysql_aes_key(NIST_KEY + NIST_KEY) == bytes(16)
+    assert mysql_aes_key(b"ab") == b"ab" + bytes(14)
+    assert mysql_aes_key(KEY) == mysql_aes_key(KEY.encode("utf-8"))
+
+
+def test_decrypt_matches_known_vector():
+    # A full block of plaintext gets a whole block of padding, which AES_ENCRYPT appends
+    padding = AES.new(NIST_KEY, AES.MODE_ECB).encrypt(bytes([16]) * 16)
+    assert mysql_aes_decrypt(NIST_CIPHERTEXT + padding, NIST_KEY) == NIST_PLAINTEXT
+
+
+@pytest.mark.parametrize("plaintext", [b"", b"1", b"1.5\t2\t3\t90\t0\t1", bytes(range(32))])
+def test_decrypt_strips_padding(plaintext):
+    assert mysql_aes_decrypt(mysql_aes_encrypt(plaintext, KEY), KEY) == plaintext
+
+
+@pytest.mark.parametrize("ciphertext", [None, b"", b"short", NIST_CIPHERTEXT])
+def test_decrypt_returns_none_like_aes_decrypt(ciphertext):
+    # NIST_CIPHERTEXT decrypts to a last byte that is not valid padding
+    assert mysql_aes_decrypt(ciphertext, NIST_KEY) is None
+
+
+def test_parse_pose_fills_trailing_fields():
+    assert parse_pose("1\t2\t3") == (1.0, 2.0, 3.0, 0.0, 0.0, 0.0)
+    assert parse_pose("1\t2\t3\tnull\t5\t6") == (1.0, 2.0, 3.0, 0.0, 5.0, 6.0)
+    assert parse_pose("\t2\t3\t4\t5\t6") is None
+    with pytest.raises(ValueError):
+        parse_pose("1\tx\t3")
+
+
+def test_parse_pose_fixed_width():
+    assert parse_pose("\t2\t3\t4\t5\t6", fixed_width=True) == (0.0, 2.0, 3.0, 4.0, 5.0, 6.0)
+    assert parse_pose("1\t2\t3", fixed_width=True) is None
+
+
+def test_decrypt_pose_batch_reports_failures():
+    cipher = AES.new(mysql_aes_key(KEY), AES.MODE_ECB)
+    rows = [
+        (1, mysql_aes_encrypt(b"1\t2\t3\t4\t5\t6", KEY)),
+        (2, b"not a block"),
+        (3, mysql_aes_encrypt(b"1\tnorth\t3", KEY)),
+        (4, mysql_aes_encrypt(b"\t\t", KEY)),
+    ]
+    poses, failures = decrypt_pose_batch(rows, cipher)
+    assert poses == [(1, (1.0, 2.0, 3.0, 4.0, 5.0, 6.0))]
+    assert [oid for oid, _ in failures] == [2, 3, 4]
+    assert failures[0][1] == "decrypt failed"
+    assert failures[1][1].startswith("parse failed")
+
+
+def test_pool_matches_inline_decryption():
+    rows = [(oid, mysql_aes_encrypt(f"{oid}\t{oid * 2}\t{oid * 3}\t0\t0\t1".encode(), KEY)) for oid in range(50)]
+    rows[7] = (7, b"garbage")
+    inline = PoseDecryptor(KEY, processes=1).decrypt(rows)
+    with PoseDecryptor(KEY, processes=2, batch_size=8) as decryptor:
+        pooled = decryptor.decrypt(rows)
+    assert pooled == inline
+    assert len(inline[0]) == 49 and inline[1] == [(7, "decrypt failed")]
+
+
+def test_validate_flags_rows_that_differ_from_aes_decrypt():
+    good = mysql_aes_encrypt(b"1\t2\t3", KEY)
+    other_key = mysql_aes_encrypt(b"1\t2\t3", "another key")
+    sample = [(1, good, b"1\t2\t3"), (2, other_key, b"1\t2\t3"), (3, b"bad", None)]
+
+    class Cursor:
+        def execute(self, query, params):
+            assert "AES_DECRYPT(`pose_aes`, %s)" in query and params == (KEY, 100)
+
+        def fetchall(self):
+            return sample
+
+        def close(self):
+            pass
+
+    class Connection:
+        def cursor(self):
+            return Cursor()
+
+    assert PoseDecryptor(KEY, processes=1).validate(Connection(), "coordinate", "pose_aes") == (3, [2])
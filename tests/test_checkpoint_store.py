@@ -0,0 +1,80 @@
+import json
+import sqlite3
+import threading
+
+from checkpoint_store import CheckpointStore
+
+
+def _rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM checkpoint")}
+    finally:
+        conn.close()
+
+
+def test_empty_store_loads_none(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoint.db"))
+    assert store.load() is None
+    store.close()
+
+
+def test_save_writes_changes_and_deletes_removed_keys(tmp_path):
+    path = str(tmp_path / "checkpoint.db")
+    store = CheckpointStore(path)
+    store.load()
+    checkpoint = {"processed_tables": ["a"], "a_export_rows": 10, "b_ranges": [{"lower": None, "done": False}]}
+    store.save(checkpoint)
+    assert _rows(path) == checkpoint
+
+    checkpoint["a_export_rows"] = 20
+    del checkpoint["b_ranges"]
+    store.save(checkpoint)
+    store.close()
+    assert _rows(path) == {"processed_tables": ["a"], "a_export_rows": 20}
+    assert CheckpointStore(path).load() == {"processed_tables": ["a"], "a_export_rows": 20}
+
+
+def test_concurrent_saves_are_all_durable(tmp_path):
+    path = str(tmp_path / "checkpoint.db")
+    store = CheckpointStore(path, synchronous="NORMAL")
+    store.load()
+    checkpoint = {}
+    lock = threading.Lock()
+
+    def worker(table):
+        for i in range(100):
+            with lock:
+                checkpoint[f"{table}_export_rows"] = i
+            store.save(checkpoint)
+
+    threads = [threading.Thread(target=worker, args=(f"t{n}",)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.close()
+    assert _rows(path) == {f"t{n}_export_rows": 99 for n in range(8)}
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    path, legacy = str(tmp_path / "checkpoint.db"), tmp_path / "migration_checkpoint.json"
+    legacy.write_text(json.dumps({"processed_tables": ["a", "b"], "c_export_rows": 5}))
+
+    store = CheckpointStore(path, legacy_json=str(legacy))
+    assert store.load() == {"processed_tables": ["a", "b"], "c_export_rows": 5}
+    store.save({"processed_tables": ["a", "b", "c"]})
+    store.close()
+
+    # The store now wins over the stale JSON file
+    assert CheckpointStore(path, legacy_json=str(legacy)).load() == {"processed_tables": ["a", "b", "c"]}
+
+
+def test_unreadable_legacy_json_is_ignored(tmp_path):
+    legacy = tmp_path / "migration_checkpoint.json"
+    legacy.write_text("{not json")
+    assert CheckpointStore(str(tmp_path / "checkpoint.db"), legacy_json=str(legacy)).load() is None
+
+
+def test_unknown_sync_mode_falls_back_to_full(tmp_path):
+    assert CheckpointStore(str(tmp_path / "checkpoint.db"), synchronous="sometimes").synchronous == "FULL"
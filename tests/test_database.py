@@ -0,0 +1,77 @@
+import threading
+import uuid
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+from src.models.database import DatabaseManager
+
+
+@pytest.fixture
+def db():
+    try:
+        manager = DatabaseManager()
+    except Exception as e:
+        pytest.skip(f"PostgreSQL is not available: {e}")
+    if manager.query_cache is None:
+        pytest.skip("query result cache is disabled")
+    table = f"cache_test_{uuid.uuid4().hex[:8]}"
+    manager.execute_query(f"CREATE TABLE {table} (id integer)", fetch=False)
+    manager.table = table
+    yield manager
+    manager.execute_query(f"DROP TABLE IF EXISTS {table}", fetch=False)
+
+
+def _read_from_other_thread(db, query):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(rows=db.fetch_all(query, cache_ttl=60)))
+    thread.start()
+    thread.join()
+    return [row["id"] for row in result["rows"]]
+
+
+def test_rolled_back_read_is_not_cached(db):
+    query = f"SELECT id FROM {db.table} ORDER BY id"
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.execute_query(f"INSERT INTO {db.table} (id) VALUES (1)", fetch=False)
+            assert [row["id"] for row in db.fetch_all(query, cache_ttl=60)] == [1]
+            raise RuntimeError("roll back")
+
+    assert _read_from_other_thread(db, query) == []
+
+
+def test_committed_read_is_cached(db):
+    query = f"SELECT id FROM {db.table} ORDER BY id"
+    with db.transaction():
+        db.execute_query(f"INSERT INTO {db.table} (id) VALUES (2)", fetch=False)
+    assert [row["id"] for row in db.fetch_all(query, cache_ttl=60)] == [2]
+    found, rows = db.query_cache.get(db.query_cache.make_key(query, None) + ('all',))
+    assert found and [row["id"] for row in rows] == [2]
+
+
+def test_statement_cache_survives_session_reset(db):
+    query = f"SELECT COUNT(*) AS n FROM {db.table} WHERE id > %s"
+    with db.pool.get_connection() as conn:
+        with conn.cursor() as cursor:
+            assert db.statement_cache.execute(cursor, query, (0,))
+            conn.rollback()
+            conn.autocommit = True
+            cursor.execute("DISCARD ALL")
+            conn.autocommit = False
+            assert db.statement_cache.execute(cursor, query, (0,))
+            assert cursor.fetchone()["n"] == 0
+        conn.rollback()
+    assert db.statement_cache.get_stats()['resets'] == 1
+
+
+def test_statement_cache_bounds_uncacheable_queries(db):
+    cache = db.statement_cache
+    cache.max_uncacheable = 3
+    with db.pool.get_connection() as conn:
+        with conn.cursor() as cursor:
+            for i in range(5):
+                assert not cache.execute(cursor, f"SELECT * FROM missing_table_{i}")
+        conn.rollback()
+    assert list(cache._uncacheable) == [f"SELECT * FROM missing_table_{i}" for i in (2, 3, 4)]
@@ -0,0 +1,338 @@
+import sqlite3
+import uuid
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+psycopg2 = pytest.importorskip("psycopg2")
+import psycopg2.pool
+
+import migrate
+from config import config
+
+
+class SqliteCursor:
+    """The slice of a mysql.connector cursor that the export code uses, over sqlite"""
+
+    def __init__(self, conn):
+        self._cursor = conn.cursor()
+        self.queries = []
+
+    def execute(self, query, params=()):
+        self.queries.append(query)
+        self._cursor.execute(query.replace("`", '"').replace("%s", "?"), params)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def close(self):
+        self._cursor.close()
+
+
+class SqliteMySQL:
+    """Stands in for a MySQL connection; MySQL-only statements are not supported"""
+
+    def __init__(self, path=":memory:"):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.cursors = []
+
+    def cursor(self, buffered=True):
+        cursor = SqliteCursor(self.conn)
+        self.cursors.append(cursor)
+        return cursor
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        pass
+
+
+class SqlitePool:
+    def __init__(self, path):
+        self.path = path
+
+    def get_connection(self):
+        return SqliteMySQL(self.path)
+
+
+class ShowKeysConnection:
+    """Answers SHOW KEYS with canned rows"""
+
+    COLUMNS = ("Table", "Non_unique", "Key_name", "Seq_in_index", "Column_name", "Sub_part", "Null")
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def cursor(self, buffered=True):
+        conn = self
+
+        class Cursor:
+            description = [(name,) for name in conn.COLUMNS]
+
+            def execute(self, query, params=()):
+                assert query.startswith("SHOW KEYS FROM")
+
+            def fetchall(self):
+                return [("t",) + row for row in conn.rows]
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+
+@pytest.fixture
+def mysql_table(tmp_path):
+    mysql = SqliteMySQL(str(tmp_path / "mysql.db"))
+    mysql.conn.execute('CREATE TABLE "events" (site TEXT, seq INTEGER, value TEXT, PRIMARY KEY (site, seq))')
+    mysql.conn.executemany('INSERT INTO "events" VALUES (?, ?, ?)',
+                           [(site, seq, f"{site}{seq}") for site in "abc" for seq in range(10)])
+    mysql.conn.commit()
+    mysql.path = str(tmp_path / "mysql.db")
+    return mysql
+
+
+@pytest.fixture
+def pg_conn():
+    db = config.database
+    try:
+        conn = psycopg2.connect(host=db.host, port=db.port, dbname=db.database, user=db.user,
+                                password=db.password, connect_timeout=3)
+    except psycopg2.Error as e:
+        pytest.skip(f"PostgreSQL is not available: {e}")
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def pg_table(pg_conn):
+    table = f"migrate_test_{uuid.uuid4().hex[:8]}"
+    with pg_conn.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE "{table}" (id integer, note text)')
+    pg_conn.commit()
+    yield table
+    pg_conn.rollback()
+    with pg_conn.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS "{table}"')
+    pg_conn.commit()
+
+
+@pytest.fixture
+def range_migration(mysql_table, pg_conn, monkeypatch):
+    """Set up migrate_table_ranges over the sqlite events table into a fresh PostgreSQL table"""
+    db = config.database
+    pool = psycopg2.pool.ThreadedConnectionPool(0, 4, host=db.host, port=db.port, dbname=db.database,
+                                                user=db.user, password=db.password)
+    table = f"events_{uuid.uuid4().hex[:8]}"
+    with pg_conn.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE "{table}" (site text, seq integer, value text)')
+    pg_conn.commit()
+    mysql_table.conn.execute(f'ALTER TABLE "events" RENAME TO "{table}"')
+    mysql_table.conn.commit()
+
+    monkeypatch.setattr(migrate, "mysql_pool", SqlitePool(mysql_table.path))
+    monkeypatch.setattr(migrate, "pg_pool", pool)
+    monkeypatch.setattr(migrate, "RANGE_WORKERS", 3)
+    monkeypatch.setattr(migrate, "CHUNK_SIZE", 4)
+    monkeypatch.setattr(migrate, "EXPORT_PAGE_SIZE", 8)
+    monkeypatch.setattr(migrate, "get_key_columns", lambda *args: ["site", "seq"])
+    monkeypatch.setattr(migrate, "save_checkpoint", lambda checkpoint: None)
+    yield mysql_table, table
+
+    pg_conn.rollback()
+    with pg_conn.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS "{table}"')
+        for i in range(3):
+            cursor.execute(f'DROP TABLE IF EXISTS "{table}__range{i}"')
+    pg_conn.commit()
+    pool.closeall()
+
+
+def _pg_tables(pg_conn, prefix):
+    with pg_conn.cursor() as cursor:
+        cursor.execute("SELECT tablename FROM pg_tables WHERE tablename LIKE %s", (prefix + "%",))
+        tables = sorted(row[0] for row in cursor.fetchall())
+    pg_conn.rollback()
+    return tables
+
+
+def _pg_rows(pg_conn, table):
+    with pg_conn.cursor() as cursor:
+        cursor.execute(f'SELECT id, note FROM "{table}" ORDER BY id')
+        rows = cursor.fetchall()
+    pg_conn.rollback()
+    return rows
+
+
+def test_key_condition_single_column():
+    assert migrate._key_condition(["id"], ">") == "`id` > %s"
+
+
+def test_key_condition_composite_uses_row_comparison():
+    assert migrate._key_condition(["site", "seq"], "<=") == "(`site`, `seq`) <= (%s, %s)"
+
+
+def test_get_key_columns_prefers_primary_key_in_index_order():
+    conn = ShowKeysConnection([
+        (0, "uniq_code", 1, "code", None, ""),
+        (0, "PRIMARY", 2, "seq", None, ""),
+        (0, "PRIMARY", 1, "site", None, ""),
+    ])
+    columns = ["site", "seq", "code"]
+    assert migrate.get_key_columns(conn, "t", columns, {}) == ["site", "seq"]
+
+
+def test_get_key_columns_skips_unusable_keys():
+    conn = ShowKeysConnection([
+        (0, "PRIMARY", 1, "pose_aes", None, ""),  # encrypted column, not exported
+        (0, "uniq_name", 1, "name", 10, ""),  # prefix index
+        (0, "uniq_nullable", 1, "nickname", None, "YES"),
+        (0, "uniq_blob", 1, "digest", None, ""),
+        (1, "idx_site", 1, "site", None, ""),  # not unique
+        (0, "uniq_pair", 1, "site", None, ""),
+        (0, "uniq_pair", 2, "seq", None, ""),
+        (0, "uniq_code", 1, "code", None, ""),
+    ])
+    columns = ["name", "nickname", "digest", "site", "seq", "code"]
+    types = {"digest": "varbinary(32)"}
+    assert migrate.get_key_columns(conn, "t", columns, types) == ["code"]
+
+
+def test_get_key_columns_without_usable_key():
+    conn = ShowKeysConnection([(0, "uniq_nullable", 1, "nickname", None, "YES")])
+    assert migrate.get_key_columns(conn, "t", ["nickname"], {}) == []
+
+
+def test_iter_export_batches_pages_by_composite_key(mysql_table, monkeypatch):
+    monkeypatch.setattr(migrate, "CHUNK_SIZE", 4)
+    monkeypatch.setattr(migrate, "EXPORT_PAGE_SIZE", 8)
+    batches = list(migrate.iter_export_batches(mysql_table, "events", ["site", "seq", "value"], ["site", "seq"]))
+
+    rows = [row for batch, _ in batches for row in batch]
+    assert [(site, seq) for site, seq, _ in rows] == [(site, seq) for site in "abc" for seq in range(10)]
+    assert all(last_key == list(batch[-1][:2]) for batch, last_key in batches)
+    # Later pages continue from the previous page's last key
+    queries = [query for cursor in mysql_table.cursors for query in cursor.queries]
+    assert len(queries) == 4
+    assert "WHERE (`site`, `seq`) > (%s, %s) ORDER BY `site`, `seq` LIMIT 8" in queries[1]
+
+
+def test_iter_export_batches_resumes_within_a_key_range(mysql_table, monkeypatch):
+    monkeypatch.setattr(migrate, "CHUNK_SIZE", 100)
+    batches = migrate.iter_export_batches(mysql_table, "events", ["site", "seq", "value"], ["site", "seq"],
+                                          last_key=["a", 7], upper_key=["b", 2])
+    rows = [row for batch, _ in batches for row in batch]
+    assert [(site, seq) for site, seq, _ in rows] == [("a", 8), ("a", 9), ("b", 0), ("b", 1), ("b", 2)]
+
+
+def test_iter_export_batches_without_key_skips_exported_rows(mysql_table, monkeypatch):
+    monkeypatch.setattr(migrate, "CHUNK_SIZE", 4)
+    batches = list(migrate.iter_export_batches(mysql_table, "events", ["value"], [], skip_rows=6))
+    assert sum(len(batch) for batch, _ in batches) == 24
+    assert all(last_key is None for _, last_key in batches)
+
+
+def test_encode_copy_rows_escapes_copy_text():
+    rows = [(1, "back\\slash"), (2, "tab\there"), (3, "two\nlines\r"), (4, ""), (5, None), (6, b"\x00")]
+    assert migrate.encode_copy_rows(rows) == (
+        b"1\tback\\\\slash\n"
+        b"2\ttab\\there\n"
+        b"3\ttwo\\nlines\\r\n"
+        b"4\t\\N\n"
+        b"5\t\\N\n"
+        b"6\t\\N\n"
+    )
+
+
+def test_copy_into_postgres_round_trips_special_characters(pg_conn, pg_table):
+    rows = [(1, "back\\slash"), (2, "tab\there"), (3, "two\nlines\r"), (4, ""), (5, None), (6, "N")]
+    chunks = [migrate.encode_copy_rows(rows[:3]), migrate.encode_copy_rows(rows[3:])]
+    migrate.copy_into_postgres(pg_conn, pg_table, ["id", "note"], iter(chunks))
+
+    # Empty strings load as NULL, like the CSV path
+    assert _pg_rows(pg_conn, pg_table) == [(1, "back\\slash"), (2, "tab\there"), (3, "two\nlines\r"),
+                                           (4, None), (5, None), (6, "N")]
+
+
+def test_copy_into_postgres_raises_producer_errors(pg_conn, pg_table):
+    closed = []
+
+    def chunks():
+        try:
+            yield migrate.encode_copy_rows([(1, "first")])
+            raise ValueError("MySQL went away")
+        finally:
+            closed.append(True)
+
+    with pytest.raises(ValueError, match="MySQL went away"):
+        migrate.copy_into_postgres(pg_conn, pg_table, ["id", "note"], chunks())
+
+    # The COPY was rolled back and the connection is usable again
+    assert closed == [True]
+    assert _pg_rows(pg_conn, pg_table) == []
+
+
+def test_copy_pipe_stops_a_producer_once_aborted():
+    pipe = migrate.CopyPipe(depth=1)
+    assert pipe.put(b"chunk")
+    pipe.abort()
+    assert not pipe.put(b"more")
+    assert pipe.queue.empty()
+
+
+def _events(pg_conn, table):
+    with pg_conn.cursor() as cursor:
+        cursor.execute(f'SELECT site, seq, value FROM "{table}" ORDER BY site, seq')
+        rows = cursor.fetchall()
+    pg_conn.rollback()
+    return rows
+
+
+def test_migrate_table_ranges_reassembles_all_ranges(range_migration, pg_conn):
+    mysql, table = range_migration
+    checkpoint = {}
+    loaded = migrate.migrate_table_ranges(mysql, pg_conn, table, ["site", "seq", "value"], {}, 30, checkpoint)
+
+    assert loaded == 30
+    assert _events(pg_conn, table) == [(site, seq, f"{site}{seq}") for site in "abc" for seq in range(10)]
+    assert _pg_tables(pg_conn, table) == [table]
+    assert f"{table}_ranges" not in checkpoint
+
+
+def test_migrate_table_ranges_retries_only_failed_ranges(range_migration, pg_conn, monkeypatch):
+    mysql, table = range_migration
+    encode = migrate.encode_copy_rows
+    encoded_sites, failing = [], ["c"]
+
+    def flaky_encode(rows):
+        encoded_sites.extend(row[0] for row in rows)
+        if any(row[0] in failing for row in rows):
+            raise ConnectionError("lost MySQL")
+        return encode(rows)
+
+    monkeypatch.setattr(migrate, "encode_copy_rows", flaky_encode)
+    checkpoint = {}
+    with pytest.raises(ConnectionError):
+        migrate.migrate_table_ranges(mysql, pg_conn, table, ["site", "seq", "value"], {}, 30, checkpoint)
+
+    ranges = checkpoint[f"{table}_ranges"]
+    assert [r["done"] for r in ranges] == [True, True, False]
+    assert [r["upper"] for r in ranges] == [["a", 9], ["b", 9], None]
+    # Nothing reaches the real table until every range is in
+    assert _events(pg_conn, table) == []
+
+    encoded_sites.clear()
+    failing.clear()
+    loaded = migrate.migrate_table_ranges(mysql, pg_conn, table, ["site", "seq", "value"], {}, 30, checkpoint)
+
+    assert loaded == 30
+    assert set(encoded_sites) == {"c"}
+    assert _events(pg_conn, table) == [(site, seq, f"{site}{seq}") for site in "abc" for seq in range(10)]
+    assert _pg_tables(pg_conn, table) == [table]
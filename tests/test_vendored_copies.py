@@ -0,0 +1,27 @@
+import difflib
+import re
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Frontrunner/etl runs as loose scripts without the src package, so these
+# modules are copied there. Relative imports become sibling imports, and a
+# line ending in "# copy-specific" may differ between the copies.
+VENDORED = ["progress", "metrics", "tracing", "profiling"]
+
+_RELATIVE_IMPORT_RE = re.compile(r"^(\s*)from \.(\w+) import ", re.MULTILINE)
+
+
+def _normalized(path: Path):
+    text = _RELATIVE_IMPORT_RE.sub(r"\1from \2 import ", path.read_text(encoding="utf-8"))
+    return [line for line in text.splitlines(keepends=True) if not line.rstrip().endswith("# copy-specific")]
+
+
+@pytest.mark.parametrize("module", VENDORED)
+def test_etl_copy_matches_src_core(module):
+    original = ROOT / "src" / "core" / f"{module}.py"
+    copy = ROOT / "Frontrunner" / "etl" / f"{module}.py"
+    diff = list(difflib.unified_diff(_normalized(original), _normalized(copy), str(original), str(copy)))
+    assert not diff, f"{copy} has drifted from {original}; apply the change to both:\n" + "".join(diff)